@@ -0,0 +1,143 @@
+"""
+Benchmark offline de punta a punta.
+
+Ejecuta cada competidor del registro (scrapers/registro.py), por el
+mismo camino que main_benchmark (procesar_competidor), contra los sitios falsos locales
+(benchmarks/sitios_falsos.py) y reporta rutas por minuto y percentiles
+de latencia por ruta. Sirve para medir (y vigilar) las mejoras en las
+esperas y en la orquestación sin depender de las webs reales.
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.bench_e2e --render-ms 800 --calc-ms 500 --workers 4
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scrapers.base_scraper import configurar_reescritura_urls
+from scrapers.registro import REGISTRO_SCRAPERS, requiere_navegador
+from scrapers.perfil_navegador import configurar_perfil
+from data_config import RUTAS_POR_COMPETIDOR
+from pool_drivers import PoolDrivers
+from main_benchmark import crear_driver, procesar_competidor
+from salida_resultados import SinkResultados
+from benchmarks.sitios_falsos import iniciar_servidor, mapa_reescritura, tasa_falsa
+
+# Error relativo máximo para dar una tasa por correcta
+TOLERANCIA_TASA = 0.01
+
+
+def _percentil(valores, p):
+    """Percentil por rango más cercano (suficiente para pocas muestras)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, int(round(p / 100 * len(ordenados) + 0.5)) - 1))
+    return ordenados[indice]
+
+
+def _es_correcta(ruta, tasa):
+    try:
+        esperada = tasa_falsa(ruta[:3], ruta[3:])
+    except KeyError:
+        return False
+    return tasa > 0 and abs(tasa - esperada) / esperada <= TOLERANCIA_TASA
+
+
+class SinkMemoria(SinkResultados):
+    """Sink que solo guarda las filas en memoria (el benchmark no escribe archivos)."""
+    def __init__(self):
+        super().__init__(None)
+        self.filas = []
+
+    def _escribir(self, fila):
+        self.filas.append(fila)
+
+    def leer_filas(self):
+        return iter(self.filas)
+
+
+def medir_competidor(competidor, rutas, pool):
+    """
+    Cotiza las rutas de un competidor por el mismo camino que main_benchmark
+    (procesar_competidor: triangulación, plan de rutas, modo HTTP, get_tasas,
+    bloqueo de recursos; los competidores de API no piden driver), sin cache,
+    circuito ni deadline, y devuelve sus métricas. La latencia de cada ruta
+    cotizada es su fase 'total' en los tiempos del scraper (las derivadas no cargan página).
+    """
+    sink = SinkMemoria()
+    inicio = time.perf_counter()
+    tiempos = procesar_competidor(competidor, rutas, pool, sink)
+    total = time.perf_counter() - inicio
+
+    return {
+        "clase": REGISTRO_SCRAPERS[competidor].clase,
+        "rutas": len(rutas),
+        "ok": sum(1 for fila in sink.filas if fila["Tasa_Directa"] > 0),
+        "correctas": sum(1 for fila in sink.filas if _es_correcta(fila["Ruta"], fila["Tasa_Directa"])),
+        "total_s": total,
+        "latencias": [fila["Segundos"] for fila in tiempos if fila["Fase"] == "total"],
+    }
+
+
+def imprimir_reporte(metricas, duracion_total):
+    print("\n📊 BENCHMARK OFFLINE")
+    print(f"{'Clase':<24}{'Rutas':>6}{'OK':>5}{'Bien':>6}{'Total s':>9}{'Rutas/min':>11}{'p50 s':>8}{'p95 s':>8}")
+    for m in metricas:
+        por_minuto = m["rutas"] / m["total_s"] * 60 if m["total_s"] > 0 else 0.0
+        print(f"{m['clase']:<24}{m['rutas']:>6}{m['ok']:>5}{m['correctas']:>6}{m['total_s']:>9.2f}"
+              f"{por_minuto:>11.1f}{_percentil(m['latencias'], 50):>8.2f}{_percentil(m['latencias'], 95):>8.2f}")
+
+    todas = [l for m in metricas for l in m["latencias"]]
+    rutas = sum(m["rutas"] for m in metricas)
+    print(f"\nTotal: {rutas} rutas en {duracion_total:.2f}s "
+          f"({rutas / duracion_total * 60:.1f} rutas/min) | "
+          f"p50 {_percentil(todas, 50):.2f}s | p95 {_percentil(todas, 95):.2f}s")
+
+
+def ejecutar_benchmark_offline(render_ms=300, calc_ms=300, workers=1, solo=None, con_ventana=False,
+                               sin_bloqueo=False):
+    servidor, url_servidor = iniciar_servidor(render_ms=render_ms, calc_ms=calc_ms)
+    configurar_reescritura_urls(mapa_reescritura(url_servidor))
+    # El mismo perfil de Chrome que main_benchmark (headless, carga 'eager', bloqueo)
+    configurar_perfil(headless=not con_ventana, bloquear=not sin_bloqueo)
+    print(f"--- Sitios falsos en {url_servidor} (render {render_ms} ms, cálculo {calc_ms} ms) ---")
+
+    trabajos = []
+    for competidor, entrada in sorted(REGISTRO_SCRAPERS.items(), key=lambda item: item[1].clase):
+        if solo and entrada.clase not in solo:
+            continue
+        rutas = RUTAS_POR_COMPETIDOR.get(competidor, [])
+        if not rutas:
+            print(f"  ⚠️ Sin rutas para {entrada.clase}. Saltando.")
+            continue
+        trabajos.append((competidor, rutas))
+
+    con_navegador = sum(1 for competidor, _ in trabajos if requiere_navegador(competidor))
+    pool = PoolDrivers(crear_driver, max_drivers=max(1, min(workers, con_navegador)))
+    inicio = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futuros = [executor.submit(medir_competidor, competidor, rutas, pool) for competidor, rutas in trabajos]
+            metricas = [f.result() for f in futuros]
+    finally:
+        pool.cerrar()
+        servidor.shutdown()
+        configurar_reescritura_urls({})
+
+    imprimir_reporte(metricas, time.perf_counter() - inicio)
+    return metricas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offline contra sitios falsos locales.")
+    parser.add_argument("--render-ms", type=int, default=300, help="Retardo de render de cada página.")
+    parser.add_argument("--calc-ms", type=int, default=300, help="Retardo de cálculo de las calculadoras/APIs.")
+    parser.add_argument("--workers", type=int, default=1, help="Clases en paralelo (un Chrome por worker).")
+    parser.add_argument("--solo", nargs="*", help="Limitar a estas clases (ej. XeScraper QuickexScraper).")
+    parser.add_argument("--con-ventana", action="store_true", help="Chrome visible en lugar de headless.")
+    parser.add_argument("--sin-bloqueo", action="store_true", help="No bloquear imágenes, fuentes ni terceros.")
+    args = parser.parse_args()
+
+    ejecutar_benchmark_offline(args.render_ms, args.calc_ms, args.workers, args.solo, args.con_ventana,
+                               args.sin_bloqueo)
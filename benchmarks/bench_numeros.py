@@ -0,0 +1,82 @@
+"""
+Microbenchmark del parser de números (scrapers/numeros.py).
+
+Primero verifica el corpus de textos reales de cada sitio
+(benchmarks/corpus_numeros.json): cada texto, con su locale, debe dar
+el valor esperado. Después mide el costo por número, llamada a llamada
+y por lotes, con la cache interna fría y caliente.
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.bench_numeros --repeticiones 2000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from scrapers.numeros import parsear_numero, parsear_numeros, _parsear
+
+RUTA_CORPUS = os.path.join(os.path.dirname(__file__), "corpus_numeros.json")
+
+
+def cargar_corpus(ruta=RUTA_CORPUS):
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def verificar(corpus):
+    """Devuelve la lista de casos que no dan el valor esperado."""
+    errores = []
+    for caso in corpus:
+        obtenido = parsear_numero(caso["texto"], caso["locale"])
+        if abs(obtenido - caso["esperado"]) > 1e-9 * max(1.0, abs(caso["esperado"])):
+            errores.append((caso, obtenido))
+    return errores
+
+
+def _medir(funcion, repeticiones, fria):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        if fria:
+            _parsear.cache_clear()
+        funcion()
+    return time.perf_counter() - inicio
+
+
+def medir(corpus, repeticiones):
+    por_locale = {}
+    for caso in corpus:
+        por_locale.setdefault(caso["locale"], []).append(caso["texto"])
+
+    def una_a_una():
+        for caso in corpus:
+            parsear_numero(caso["texto"], caso["locale"])
+
+    def por_lotes():
+        for locale, textos in por_locale.items():
+            parsear_numeros(textos, locale)
+
+    total = len(corpus) * repeticiones
+    print(f"{'modo':<22}{'ns/número':>12}")
+    for nombre, funcion in (("una a una", una_a_una), ("por lotes", por_lotes)):
+        for fria in (True, False):
+            segundos = _medir(funcion, repeticiones, fria)
+            etiqueta = f"{nombre} ({'fría' if fria else 'caliente'})"
+            print(f"{etiqueta:<22}{segundos / total * 1e9:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark del parser de números.")
+    parser.add_argument("--repeticiones", type=int, default=2000, help="Pasadas sobre el corpus por modo.")
+    parser.add_argument("--corpus", default=RUTA_CORPUS, help="JSON con texto, locale y valor esperado.")
+    args = parser.parse_args()
+
+    corpus = cargar_corpus(args.corpus)
+    errores = verificar(corpus)
+    for caso, obtenido in errores:
+        print(f"❌ {caso['sitio']}: {caso['texto']!r} ({caso['locale']}) -> {obtenido}, esperado {caso['esperado']}")
+    if errores:
+        sys.exit(1)
+    print(f"✅ Corpus OK: {len(corpus)} textos de {len({c['sitio'] for c in corpus})} sitios")
+    medir(corpus, args.repeticiones)
@@ -0,0 +1,456 @@
+"""
+Sitios falsos de competidores para el benchmark offline.
+
+Levanta un servidor HTTP local con páginas que imitan el DOM que buscan
+nuestros scrapers (párrafo de XE, ddSlick de Quickex, select2 de Remesas Vzla,
+calculadora de Tucambio, etc.) y las APIs JSON de Arcadi, Global66 y CurrencyBird.
+Cada página tiene un retardo de render y de cálculo configurable.
+"""
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+# Unidades de cada moneda por 1 EUR (tasas ficticias pero coherentes)
+TASAS_FALSAS = {
+    "EUR": 1.0, "USD": 1.08, "ARS": 1050.0, "COP": 4300.0, "PEN": 4.05,
+    "VES": 390.0, "CLP": 1020.0, "BRL": 5.9, "MXN": 18.5, "GBP": 0.85,
+}
+
+def tasa_falsa(origen, destino):
+    if origen == "US": origen = "USD"
+    if destino == "US": destino = "USD"
+    return TASAS_FALSAS[destino] / TASAS_FALSAS[origen]
+
+# Prefijo real -> carpeta del sitio falso (se antepone la URL del servidor)
+PREFIJOS_SITIOS = {
+    "https://www.xe.com": "/xe",
+    "https://www.intergiros.com": "/intergiros",
+    "https://curiara.com": "/curiara",
+    "https://www.quickex.net": "/quickex",
+    "https://remesasvzla.com": "/remesasvzla",
+    "https://www.tucambio.app": "/tucambio",
+    "https://mipapaya.com": "/mipapaya",
+    "https://mipapaya.app": "/mipapaya",
+    "https://paysend.com": "/paysend",
+    "https://www.riamoneytransfer.com": "/ria",
+    "https://www.xoom.com": "/xoom",
+    "https://www.remitly.com": "/remitly",
+    "https://www.arcadienvios.com": "/arcadi",
+    "https://api.global66.com": "/global66",
+    "https://services.prod.currencybird.cl": "/currencybird",
+}
+
+# Ruta de la API de cotización de cada calculadora falsa (tras la carpeta del
+# sitio): fragmentos reales, los que buscan los PATRONES_API_COTIZACION de cada scraper
+RUTAS_API_FALSAS = {
+    "paysend": "/quote",
+    "ria": "/calculator/quote",
+    "xoom": "/quote",
+    "remitly": "/calculator/estimate",
+}
+
+def mapa_reescritura(url_servidor):
+    """Mapa para configurar_reescritura_urls() apuntando a este servidor."""
+    return {prefijo: url_servidor + carpeta for prefijo, carpeta in PREFIJOS_SITIOS.items()}
+
+
+# --- JS común: retardos, tasas y formatos ---
+JS_COMUN = """
+const RENDER_MS = __RENDER_MS__, CALC_MS = __CALC_MS__, TASAS = __TASAS__, RUTAS_API = __RUTAS_API__;
+function tasa(o, d) { if (o === 'US') o = 'USD'; if (d === 'US') d = 'USD'; return TASAS[d] / TASAS[o]; }
+function fmt(n, loc, dec) { return n.toLocaleString(loc, {minimumFractionDigits: 2, maximumFractionDigits: dec || 4}); }
+function num(v) { return parseFloat(String(v).replace(/[^\\d.,]/g, '').replace(/\\./g, '').replace(',', '.')) || 0; }
+function alRender(fn) { setTimeout(fn, RENDER_MS); }
+function alCalcular(fn) { clearTimeout(window._calc); window._calc = setTimeout(fn, CALC_MS); }
+// Cotización vía XHR/fetch (como las calculadoras reales): el servidor tarda CALC_MS
+function cotizarApi(sitio, o, d, monto, fn) {
+  const n = (window._nCot = (window._nCot || 0) + 1);
+  fetch('/' + sitio + RUTAS_API[sitio] + '?from=' + o + '&to=' + d + '&amount=' + monto)
+    .then(r => r.json()).then(q => { if (n === window._nCot) fn(q); });
+}
+function banner(texto, id) {
+  const b = document.createElement('button');
+  b.textContent = texto; if (id) b.id = id;
+  b.onclick = () => b.remove();
+  document.body.prepend(b);
+}
+"""
+
+def _pagina(titulo, cuerpo, script):
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>" + titulo + "</title></head>"
+        "<body>" + cuerpo + "<script>" + JS_COMUN + script + "</script></body></html>"
+    )
+
+IMG = "<img width='16' height='16' src='data:image/gif;base64,R0lGODlhAQABAAAAACw='>"
+
+PAGINA_XE = _pagina("XE", "<main id='app'></main>", """
+const q = new URLSearchParams(location.search), o = q.get('From'), d = q.get('To');
+banner('Accept');
+alRender(() => {
+  document.getElementById('app').innerHTML =
+    "<p class='text-lg font-semibold text-xe-neutral-900 md:text-2xl'>1.00 " + o + " = " +
+    tasa(o, d).toLocaleString('en-US', {maximumFractionDigits: 8}) + " " + d + "</p>";
+});
+""")
+
+PAGINA_QUICKEX = _pagina("Quickex", "<main id='app'></main>", """
+const MONEDAS = ['CLP', 'PEN', 'VES', 'USD', 'USA_USD', 'COP'];
+function dd(id, sel) {
+  return "<div id='" + id + "' class='dd-container'><div class='dd-select'><span class='dd-selected'>" + sel +
+    "</span></div><ul class='dd-options' style='display:none'>" +
+    MONEDAS.map(m => "<li><a class='dd-option'><label class='dd-option-text'>" + m + "</label></a></li>").join('') +
+    "</ul></div>";
+}
+function moneda(id) { const m = document.querySelector('#' + id + ' .dd-selected').textContent; return m === 'USA_USD' ? 'USD' : m; }
+function calcular() {
+  alCalcular(() => {
+    const t = tasa(moneda('currency-1'), moneda('currency-2'));
+    document.getElementById('amount-to').value = (parseFloat(document.getElementById('amount').value || 0) * t).toFixed(2);
+    document.getElementById('tasa').textContent = 'Tasa actual ' + t.toFixed(6);
+  });
+}
+alRender(() => {
+  document.getElementById('app').innerHTML = dd('currency-1', 'PEN') + dd('currency-2', 'VES') +
+    "<input id='amount' value='100'><input id='amount-to' readonly><span id='tasa'></span>";
+  document.querySelectorAll('.dd-container').forEach(c => {
+    c.querySelector('.dd-select').onclick = (e) => { e.stopPropagation(); c.querySelector('.dd-options').style.display = 'block'; };
+    c.querySelectorAll('a.dd-option').forEach(a => a.onclick = (e) => {
+      e.stopPropagation();
+      c.querySelector('.dd-selected').textContent = a.textContent;
+      c.querySelector('.dd-options').style.display = 'none';
+      calcular();
+    });
+  });
+  document.body.addEventListener('click', () => document.querySelectorAll('.dd-options').forEach(u => u.style.display = 'none'));
+  const a = document.getElementById('amount');
+  a.addEventListener('input', calcular); a.addEventListener('change', calcular);
+  calcular();
+});
+""")
+
+PAGINA_REMESASVZLA = _pagina("Remesas Vzla", "<main id='app'></main>", """
+const MONEDAS = ['CLP', 'VES', 'COP', 'PEN', 'USD'];
+function caja(id, sel) {
+  return "<select id='" + id + "' style='display:none'>" + MONEDAS.map(m => "<option" + (m === sel ? " selected" : "") + ">" + m + "</option>").join('') +
+    "</select><span class='select2-container' data-for='" + id + "'>" + sel + "</span> ";
+}
+function calcular() {
+  alCalcular(() => {
+    const t = tasa(document.getElementById('fromCcy').value, document.getElementById('toCcy').value);
+    const monto = parseFloat(document.getElementById('fromAmount').value || 0);
+    document.getElementById('toAmount').value = fmt(monto * t, 'es-ES', 2);
+  });
+}
+function abrir(span) {
+  const sel = document.getElementById(span.dataset.for);
+  const drop = document.createElement('div');
+  drop.innerHTML = "<input class='select2-search__field'><ul class='select2-results'></ul>";
+  document.body.appendChild(drop);
+  const input = drop.querySelector('input'), ul = drop.querySelector('ul');
+  function filtrar() {
+    const opciones = MONEDAS.filter(m => m.indexOf(input.value.toUpperCase()) >= 0);
+    ul.innerHTML = opciones.map((m, i) => "<li class='select2-results__option" + (i === 0 ? " select2-results__option--highlighted" : "") + "'>" + m + "</li>").join('');
+  }
+  input.addEventListener('input', filtrar);
+  input.addEventListener('keydown', (e) => {
+    if (e.key !== 'Enter') return;
+    const h = ul.querySelector('.select2-results__option--highlighted');
+    if (h) { sel.value = h.textContent; span.textContent = h.textContent; }
+    drop.remove(); calcular();
+  });
+  filtrar(); input.focus();
+}
+alRender(() => {
+  document.getElementById('app').innerHTML = caja('fromCcy', 'COP') + caja('toCcy', 'VES') +
+    "<input id='fromAmount' value='1000'><input id='toAmount' readonly>";
+  document.querySelectorAll('.select2-container').forEach(s => s.onclick = () => abrir(s));
+  const a = document.getElementById('fromAmount');
+  a.addEventListener('input', calcular); a.addEventListener('change', calcular);
+  calcular();
+});
+""")
+
+PAGINA_TUCAMBIO = _pagina("TuCambio", "<main id='app'></main>", """
+const PAISES = {'Chile': 'CLP', 'Venezuela': 'VES', 'Argentina': 'ARS', 'Colombia': 'COP', 'Perú': 'PEN', 'USA': 'USD'};
+function seccion(titulo, pais, id) {
+  return "<div style='margin:30px 0'><p>" + titulo + "</p><button class='pais'>" + IMG_TAG + " " + pais +
+    "</button><br><input type='text' id='" + id + "'></div>";
+}
+function calcular() {
+  alCalcular(() => {
+    const b = document.querySelectorAll('button.pais');
+    const t = tasa(PAISES[b[0].textContent.trim()], PAISES[b[1].textContent.trim()]);
+    const monto = parseFloat(document.getElementById('monto').value || 0);
+    document.getElementById('recibe').value = (monto * t).toFixed(2);
+    document.getElementById('rate').textContent = t.toFixed(6);
+  });
+}
+alRender(() => {
+  document.getElementById('app').innerHTML = seccion('You send', 'Chile', 'monto') + seccion('You receive', 'Venezuela', 'recibe') +
+    "<div><p>Exchange rate</p><p id='rate'></p></div>";
+  document.querySelectorAll('button.pais').forEach(btn => btn.onclick = (e) => {
+    e.stopPropagation();
+    const menu = document.createElement('div');
+    menu.setAttribute('role', 'menu');
+    menu.innerHTML = Object.keys(PAISES).map(p => "<button>" + p + "</button>").join('');
+    menu.querySelectorAll('button').forEach(op => op.onclick = (ev) => {
+      ev.stopPropagation(); btn.innerHTML = IMG_TAG + " " + op.textContent; menu.remove(); calcular();
+    });
+    btn.after(menu);
+  });
+  document.body.addEventListener('click', () => document.querySelectorAll("[role='menu']").forEach(m => m.remove()));
+  document.getElementById('monto').addEventListener('input', calcular);
+  calcular();
+});
+""".replace("IMG_TAG", json.dumps(IMG)))
+
+PAGINA_MIPAPAYA = _pagina("Mi Papaya", "<main id='app'></main>", """
+const PAISES = {'Chile': 'CLP', 'Venezuela': 'VES', 'Colombia': 'COP', 'Perú': 'PEN', 'Brasil': 'BRL', 'Estados Unidos': 'USD'};
+function calcular() {
+  alCalcular(() => {
+    const s = document.querySelectorAll('.mat-select');
+    const o = PAISES[s[0].textContent], d = PAISES[s[1].textContent], t = tasa(o, d);
+    const inputs = document.querySelectorAll("input[type='number']");
+    inputs[1].value = (parseFloat(inputs[0].value || 0) * t).toFixed(2);
+    document.getElementById('tasa').textContent = 'Tasa Papaya 1 ' + o + ' = ' + t.toFixed(4) + ' ' + d;
+  });
+}
+alRender(() => {
+  document.getElementById('app').innerHTML = "<div class='mat-select'>Estados Unidos</div><div class='mat-select'>Venezuela</div>" +
+    "<input type='number' value='100'><input type='number' readonly><p id='tasa'></p>";
+  document.querySelectorAll('.mat-select').forEach(s => s.onclick = (e) => {
+    e.stopPropagation();
+    const pane = document.createElement('div');
+    pane.className = 'cdk-overlay-pane';
+    pane.innerHTML = Object.keys(PAISES).map(p => "<mat-option><span>" + p + "</span></mat-option>").join('');
+    pane.querySelectorAll('span').forEach(op => op.onclick = (ev) => { ev.stopPropagation(); s.textContent = op.textContent; pane.remove(); calcular(); });
+    document.body.appendChild(pane);
+  });
+  document.body.addEventListener('click', () => document.querySelectorAll('.cdk-overlay-pane').forEach(p => p.remove()));
+  document.querySelector("input[type='number']").addEventListener('input', calcular);
+  calcular();
+});
+""")
+
+PAGINA_PAYSEND = _pagina("Paysend", "<main id='app'></main>", """
+const ORIGENES = {'es-cl': 'CLP', 'es-co': 'COP', 'es-es': 'EUR', 'en-us': 'USD', 'en-gb': 'GBP'};
+const PAISES = {'co': 'COP', 'us': 'USD', 'ar': 'ARS', 'pe': 'PEN', 'es': 'EUR', 've': 'VES', 'mx': 'MXN', 'br': 'BRL', 'cl': 'CLP'};
+const origen = ORIGENES[location.pathname.split('/').filter(Boolean).pop()] || 'USD';
+const loc = ['USD', 'EUR', 'GBP'].indexOf(origen) >= 0 ? 'en-US' : 'es-ES';
+let destino = 'USD';
+function calcular() {
+  const monto = parseFloat(document.getElementById('__ifc__from_amount').value.replace(/[^\\d]/g, '') || 0);
+  cotizarApi('paysend', origen, destino, monto, (q) => {
+    document.getElementById('__ifc__to_amount').value = fmt(q.receiveAmount, loc, 2);
+    document.getElementById('rate').textContent = '1.00 ' + origen + ' = ' + fmt(q.exchangeRate, loc, 4) + ' ' + destino;
+  });
+}
+banner('Aceptar', 'onetrust-accept-btn-handler');
+alRender(() => {
+  document.getElementById('app').innerHTML = "<input id='__ifc__from_amount' value='100'>" +
+    "<button data-testid='amount-label-to'>Destino</button><input id='__ifc__to_amount' readonly><p id='rate'></p>";
+  document.querySelector("[data-testid='amount-label-to']").onclick = (e) => {
+    e.stopPropagation();
+    const ul = document.createElement('ul');
+    ul.innerHTML = Object.keys(PAISES).map(iso => "<li id='to-" + iso + "'>" + PAISES[iso] + "</li>").join('');
+    ul.querySelectorAll('li').forEach(li => li.onclick = (ev) => {
+      ev.stopPropagation(); ul.remove();
+      const code = PAISES[li.id.slice(3)];
+      const sub = document.createElement('div');
+      sub.innerHTML = "<a href='#'><span>" + code + "</span></a>";
+      sub.querySelector('a').onclick = (ev2) => { ev2.preventDefault(); destino = code; sub.remove(); calcular(); };
+      document.body.appendChild(sub);
+    });
+    document.body.appendChild(ul);
+  };
+  document.getElementById('__ifc__from_amount').addEventListener('input', calcular);
+  calcular();
+});
+""")
+
+PAGINA_RIA = _pagina("RIA", "<main id='app'></main>", """
+const PAISES = {'Argentina': 'ARS', 'Colombia': 'COP', 'Perú': 'PEN', 'Estados Unidos': 'USD', 'Venezuela': 'VES', 'México': 'MXN', 'Brasil': 'BRL', 'Chile': 'CLP'};
+let destino = 'USD';
+function calcular() {
+  cotizarApi('ria', 'EUR', destino, num(document.getElementById('sending-amount').value), (q) => {
+    document.getElementById('receiving-amount').value = fmt(q.receiveAmount, 'es-ES', 2);
+  });
+}
+banner('Aceptar todas', 'onetrust-accept-btn-handler');
+alRender(() => {
+  document.getElementById('app').innerHTML = "<input type='text' placeholder='Buscar país' id='buscar'><ul id='lista'></ul>" +
+    "<input id='sending-amount' value='100'><input id='receiving-amount' readonly>";
+  const buscar = document.getElementById('buscar'), lista = document.getElementById('lista');
+  function elegir(pais) { destino = PAISES[pais]; lista.innerHTML = ''; buscar.value = pais; calcular(); }
+  buscar.addEventListener('input', () => {
+    const v = buscar.value.toLowerCase();
+    lista.innerHTML = Object.keys(PAISES).filter(p => v && p.toLowerCase().indexOf(v) >= 0).map(p => '<li>' + p + '</li>').join('');
+    lista.querySelectorAll('li').forEach(li => li.onclick = () => elegir(li.textContent));
+  });
+  buscar.addEventListener('keydown', (e) => { const li = lista.querySelector('li'); if (e.key === 'Enter' && li) elegir(li.textContent); });
+  document.getElementById('sending-amount').addEventListener('input', calcular);
+  calcular();
+});
+""")
+
+PAGINA_XOOM = _pagina("Xoom", "<main id='app'></main>", """
+const SLUGS = {'argentina': 'ARS', 'colombia': 'COP', 'peru': 'PEN', 'united-states': 'USD', 'mexico': 'MXN', 'brazil': 'BRL', 'venezuela': 'VES'};
+const destino = SLUGS[location.pathname.split('/').filter(Boolean).slice(-2)[0]];
+let origen = localStorage.getItem('xoom_origen') || 'USD';
+function calcular() {
+  const monto = document.getElementById('text-input-send-input').value;
+  cotizarApi('xoom', origen, destino, parseFloat(monto) || 0, (q) => {
+    document.querySelector("[data-testid='fx-rate-comparison-string']").textContent =
+      '1 ' + origen + ' = ' + fmt(q.exchangeRate, 'en-US', 4) + ' ' + destino + ' (' + monto + ')';
+  });
+}
+banner('Accept');
+alRender(() => {
+  document.getElementById('app').innerHTML = "<button id='source-currency-picker'>" + origen + "</button>" +
+    "<input id='text-input-send-input' value='100'><p data-testid='fx-rate-comparison-string'></p>";
+  const picker = document.getElementById('source-currency-picker');
+  picker.onclick = () => {
+    const ul = document.createElement('ul');
+    ul.innerHTML = '<li>EUR</li><li>USD</li>';
+    ul.querySelectorAll('li').forEach(li => li.onclick = () => {
+      origen = li.textContent; localStorage.setItem('xoom_origen', origen);
+      picker.textContent = origen; ul.remove(); calcular();
+    });
+    picker.after(ul);
+  };
+  const i = document.getElementById('text-input-send-input');
+  i.addEventListener('input', calcular); i.addEventListener('change', calcular);
+  calcular();
+});
+""")
+
+PAGINA_REMITLY = _pagina("Remitly", "<main id='app'></main>", """
+const par = location.pathname.split('/').pop().replace('-rate', '').split('-to-');
+const o = par[0].toUpperCase(), d = par[1].toUpperCase();
+function calcular() {
+  cotizarApi('remitly', o, d, num(document.getElementById('flag-input-env').value), (q) => {
+    document.getElementById('flag-input-recibe').value = fmt(q.receiveAmount, 'es-ES', 2);
+    document.getElementById('tasa').textContent = '1 ' + o + ' = ' + fmt(q.exchangeRate, 'es-ES', 4) + ' ' + d;
+  });
+}
+banner('Aceptar cookies');
+alRender(() => {
+  document.getElementById('app').innerHTML = "<input id='flag-input-env' value='100'><input id='flag-input-recibe' readonly><div id='tasa'></div>";
+  document.getElementById('flag-input-env').addEventListener('input', calcular);
+  calcular();
+});
+""")
+
+# Páginas estáticas (sin JS): el texto de la tasa viene en el HTML
+def _pagina_intergiros(slug):
+    if slug.startswith("peru"):
+        texto = f"1 Sol = {tasa_falsa('PEN', 'VES'):.2f} Bs."
+    elif slug.startswith("brasil"):
+        texto = f"1 Real = {tasa_falsa('BRL', 'VES'):.2f} Bs."
+    else:
+        texto = f"10,000 Pesos = {10000 * tasa_falsa('COP', 'VES'):.2f} Bs"
+    return f"<!DOCTYPE html><html><body><h1>Intergiros</h1><p>Tasa del día</p><p>{texto}</p></body></html>"
+
+def _pagina_curiara(slug):
+    origen = {"europa": "EUR", "enviar-dinero-colombia-venezuela": "COP", "enviar-dinero-chile-venezuela": "CLP"}.get(slug, "EUR")
+    valor = f"{tasa_falsa(origen, 'VES'):.4f}".replace(".", ",")
+    return (
+        "<!DOCTYPE html><html><body><div class='cookie-banner'><button onclick='this.parentNode.remove()'>Aceptar</button></div>"
+        f"<h1>Curiara</h1><p>Tasa: {valor}</p></body></html>"
+    )
+
+# IDs de las APIs reales -> moneda
+IDS_ARCADI = {9: "CLP", 2: "COP", 1: "VES", 7: "USD", 6: "EUR", 8: "PEN", 5: "BRL"}
+IDS_GLOBAL66 = {134: "CLP", 227: "PEN", 137: "COP", 86: "ARS", 266: "VES", 36: "EUR", 59: "USD", 117: "BRL", 210: "MXN"}
+
+PAGINAS_JS = {
+    "xe": PAGINA_XE, "quickex": PAGINA_QUICKEX, "remesasvzla": PAGINA_REMESASVZLA, "tucambio": PAGINA_TUCAMBIO,
+    "mipapaya": PAGINA_MIPAPAYA, "paysend": PAGINA_PAYSEND, "ria": PAGINA_RIA, "xoom": PAGINA_XOOM, "remitly": PAGINA_REMITLY,
+}
+
+
+class _ManejadorSitios(BaseHTTPRequestHandler):
+    # Los fija iniciar_servidor()
+    render_ms = 0
+    calc_ms = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, cuerpo, tipo="text/html; charset=utf-8", status=200):
+        datos = cuerpo.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _json(self, data, status=200):
+        time.sleep(self.calc_ms / 1000)
+        self._responder(json.dumps(data), "application/json", status)
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        segmentos = [s for s in partes.path.split("/") if s]
+        q = {k: v[0] for k, v in parse_qs(partes.query).items()}
+        sitio = segmentos[0] if segmentos else ""
+
+        if sitio in RUTAS_API_FALSAS and partes.path == "/" + sitio + RUTAS_API_FALSAS[sitio]:
+            # API de cotización que llaman (por fetch) las calculadoras de Paysend, RIA, Xoom y Remitly
+            try:
+                t = tasa_falsa(q.get("from", ""), q.get("to", ""))
+            except KeyError:
+                return self._json({"error": "currency"}, 404)
+            monto = float(q.get("amount") or 0)
+            return self._json({"quote": {"sendCurrency": q["from"], "receiveCurrency": q["to"],
+                                         "sendAmount": monto, "receiveAmount": monto * t, "exchangeRate": t}})
+
+        if sitio in PAGINAS_JS:
+            html = (PAGINAS_JS[sitio]
+                    .replace("__RENDER_MS__", str(self.render_ms))
+                    .replace("__CALC_MS__", str(self.calc_ms))
+                    .replace("__TASAS__", json.dumps(TASAS_FALSAS))
+                    .replace("__RUTAS_API__", json.dumps(RUTAS_API_FALSAS)))
+            return self._responder(html)
+
+        if sitio == "intergiros":
+            time.sleep(self.render_ms / 1000)
+            return self._responder(_pagina_intergiros(segmentos[-1] if len(segmentos) > 1 else ""))
+
+        if sitio == "curiara":
+            time.sleep(self.render_ms / 1000)
+            return self._responder(_pagina_curiara(segmentos[-1] if len(segmentos) > 1 else ""))
+
+        if sitio == "arcadi":
+            origen = IDS_ARCADI.get(int(q.get("source_country_id", 0)))
+            if not origen:
+                return self._json({"error": "country"}, 404)
+            return self._json({m: [{"rate": str(tasa_falsa(origen, m))}] for m in IDS_ARCADI.values() if m != origen})
+
+        if sitio == "global66":
+            origen = IDS_GLOBAL66.get(int(q.get("originRoute", 0)))
+            destino = IDS_GLOBAL66.get(int(q.get("destinationRoute", 0)))
+            if not origen or not destino:
+                return self._json({"error": "route"}, 404)
+            monto = float(q.get("amount", 0))
+            return self._json({"quoteData": {"destinationAmount": monto * tasa_falsa(origen, destino)}})
+
+        if sitio == "currencybird":
+            monto = float(q.get("amount", 0))
+            return self._json({"value": monto * tasa_falsa(q.get("originCurrency"), q.get("destinationCurrency"))})
+
+        self._responder("<html><body>404</body></html>", status=404)
+
+
+def iniciar_servidor(render_ms=300, calc_ms=300, puerto=0):
+    """
+    Arranca el servidor de sitios falsos en un hilo.
+    Devuelve (servidor, url_base); detener con servidor.shutdown().
+    """
+    manejador = type("ManejadorSitios", (_ManejadorSitios,), {"render_ms": render_ms, "calc_ms": calc_ms})
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
@@ -0,0 +1,74 @@
+import sqlite3
+import threading
+import time
+from data_config import TTL_CACHE_POR_COMPETIDOR, TTL_CACHE_DEFECTO_SEGUNDOS
+
+# Motivo de las filas OK servidas desde la cache: no son una observación nueva
+# y no se agregan al histórico (historico.py)
+MOTIVO_CACHE = "CACHE"
+
+
+class CacheCotizaciones:
+    """
+    Cache en disco (SQLite) de cotizaciones exitosas.
+    Clave: (competidor, ruta, monto). Cada competidor tiene su propio TTL
+    (TTL_CACHE_POR_COMPETIDOR); las entradas vencidas cuentan como 'miss'.
+    """
+    def __init__(self, ruta_db="cache_cotizaciones.sqlite"):
+        self.ruta_db = ruta_db
+        self._lock = threading.Lock()
+        # Los workers del benchmark comparten la conexión (protegida por el lock)
+        self._conn = sqlite3.connect(ruta_db, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cotizaciones (
+                competidor TEXT NOT NULL,
+                ruta TEXT NOT NULL,
+                monto TEXT NOT NULL,
+                tasa_directa REAL NOT NULL,
+                monto_cotizado TEXT NOT NULL,
+                guardado_en REAL NOT NULL,
+                PRIMARY KEY (competidor, ruta, monto)
+            )
+            """
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_de(self, competidor):
+        return TTL_CACHE_POR_COMPETIDOR.get(competidor, TTL_CACHE_DEFECTO_SEGUNDOS)
+
+    def obtener(self, competidor, ruta, monto):
+        """Devuelve (tasa_directa, monto_cotizado) si hay una entrada vigente, si no None."""
+        limite = time.time() - self.ttl_de(competidor)
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT tasa_directa, monto_cotizado FROM cotizaciones "
+                "WHERE competidor = ? AND ruta = ? AND monto = ? AND guardado_en >= ?",
+                (competidor, ruta, str(monto), limite),
+            ).fetchone()
+            if fila is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return fila[0], fila[1]
+
+    def guardar(self, competidor, ruta, monto, tasa_directa, monto_cotizado):
+        """Guarda (o refresca) una cotización. Solo se cachean tasas válidas."""
+        if tasa_directa <= 0:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cotizaciones VALUES (?, ?, ?, ?, ?, ?)",
+                (competidor, ruta, str(monto), float(tasa_directa), str(monto_cotizado), time.time()),
+            )
+            self._conn.commit()
+
+    def resumen(self):
+        total = self.hits + self.misses
+        return f"Cache: {self.hits} hits / {self.misses} misses ({total} consultas)"
+
+    def cerrar(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,89 @@
+import datetime
+import json
+import os
+import threading
+from data_config import FALLOS_PARA_ABRIR_CIRCUITO, FALLOS_PARA_ABRIR_POR_COMPETIDOR
+
+# Estados del circuito de cada competidor
+CERRADO = "cerrado"          # normal: se scrapean todas las rutas
+ABIERTO = "abierto"          # sitio caído o cambiado: el resto de rutas falla al instante
+SEMIABIERTO = "semiabierto"  # siguiente ejecución: la primera ruta hace de sonda
+
+# Códigos de motivo para la columna 'Motivo' de los resultados
+MOTIVO_SIN_TASA = "SIN_TASA"
+MOTIVO_ERROR = "ERROR"
+MOTIVO_SIN_DRIVER = "SIN_DRIVER"
+MOTIVO_CIRCUITO_ABIERTO = "CIRCUITO_ABIERTO"
+MOTIVO_PATA_FALLIDA = "PATA_FALLIDA"
+
+
+class CircuitoCompetidores:
+    """
+    Circuit breaker por competidor, persistido en JSON entre ejecuciones.
+    Tras N fallos consecutivos (FALLOS_PARA_ABRIR_CIRCUITO) el circuito se
+    abre y las rutas restantes se marcan FALLO sin abrir el navegador.
+    Un circuito que quedó abierto arranca la siguiente ejecución semiabierto:
+    si la ruta sonda funciona se cierra; si falla se vuelve a abrir al instante.
+    """
+    def __init__(self, ruta_estado="estado_circuitos.json"):
+        self.ruta_estado = ruta_estado
+        self._lock = threading.Lock()
+        self._estados = {}
+        if os.path.exists(ruta_estado):
+            try:
+                with open(ruta_estado, encoding="utf-8") as f:
+                    self._estados = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Estado de circuitos ilegible ({e}); se parte de cero.")
+        # Lo que quedó abierto en la ejecución anterior se prueba con una sonda
+        for estado in self._estados.values():
+            if estado.get("estado") == ABIERTO:
+                estado["estado"] = SEMIABIERTO
+
+    def _estado(self, competidor):
+        return self._estados.setdefault(competidor, {"estado": CERRADO, "fallos": 0})
+
+    def umbral_de(self, competidor):
+        return FALLOS_PARA_ABRIR_POR_COMPETIDOR.get(competidor, FALLOS_PARA_ABRIR_CIRCUITO)
+
+    def abierto(self, competidor):
+        with self._lock:
+            return self._estado(competidor)["estado"] == ABIERTO
+
+    def registrar(self, competidor, exito):
+        """Anota el resultado de una ruta. Devuelve True si el circuito acaba de abrirse."""
+        with self._lock:
+            estado = self._estado(competidor)
+            if exito:
+                if estado["estado"] == SEMIABIERTO:
+                    print(f"  🟢 {competidor}: la sonda funcionó, circuito cerrado.")
+                estado.update(estado=CERRADO, fallos=0)
+                estado.pop("motivo", None)
+                return False
+
+            estado["fallos"] = estado.get("fallos", 0) + 1
+            if estado["estado"] == ABIERTO:
+                return False
+            if estado["estado"] == SEMIABIERTO:
+                motivo = "sonda fallida"
+            elif estado["fallos"] >= self.umbral_de(competidor):
+                motivo = f"{estado['fallos']} fallos consecutivos"
+            else:
+                return False
+
+            estado.update(estado=ABIERTO, motivo=motivo, desde=datetime.datetime.now().isoformat(timespec="seconds"))
+            print(f"  🔴 {competidor}: circuito abierto ({motivo}). Las rutas restantes se marcan FALLO.")
+            return True
+
+    def resumen(self):
+        with self._lock:
+            abiertos = sorted(c for c, e in self._estados.items() if e.get("estado") == ABIERTO)
+        return f"Circuitos abiertos: {', '.join(abiertos)}" if abiertos else "Circuitos: todos cerrados"
+
+    def guardar(self):
+        with self._lock:
+            carpeta = os.path.dirname(self.ruta_estado)
+            if carpeta:
+                os.makedirs(carpeta, exist_ok=True)
+            with open(self.ruta_estado, "w", encoding="utf-8") as f:
+                json.dump(self._estados, f, ensure_ascii=False, indent=2, sort_keys=True)
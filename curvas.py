@@ -0,0 +1,87 @@
+"""
+Curvas de tasa por monto (modo --escalonado de main_benchmark).
+
+Con varias cotizaciones de una misma ruta a montos distintos se ajusta,
+por mínimos cuadrados, el modelo lineal de lo que recibe el cliente:
+
+    recibido = tasa_marginal * monto - comision_fija * tasa_marginal
+
+- tasa_marginal: lo que rinde cada unidad adicional enviada (ya descontada
+  la comisión proporcional).
+- comision_fija: costo fijo implícito, en moneda de origen.
+- comision_proporcional: 1 - tasa_marginal / tasa de referencia (XE), si hay.
+
+El ajuste es vectorizado: una sola pasada de groupby con las sumas de la
+regresión para todas las rutas a la vez.
+"""
+import numpy as np
+import pandas as pd
+
+from data_config import MONTOS_ESCALONADOS_POR_MONEDA, COMPETIDOR_REFERENCIA_CURVAS
+
+COLUMNAS_CURVAS = [
+    'Competidor', 'Ruta', 'Puntos', 'Monto_Min', 'Monto_Max', 'Tasa_Efectiva_Min', 'Tasa_Efectiva_Max',
+    'Tasa_Marginal', 'Comision_Fija', 'Comision_Proporcional', 'R2',
+]
+
+
+def montos_escalonados(ruta):
+    """Montos del barrido para la ruta (None = el monto por defecto si la moneda no tiene escalones)."""
+    return MONTOS_ESCALONADOS_POR_MONEDA.get(ruta[:3]) or [None]
+
+
+def tasas_referencia(df, competidor=COMPETIDOR_REFERENCIA_CURVAS):
+    """Tasa media del competidor de referencia por ruta (Series indexada por Ruta)."""
+    ok = df[(df['Competidor'] == competidor) & (df['Status'] == 'OK')]
+    return ok.groupby('Ruta')['Tasa_Directa'].mean()
+
+
+def calcular_curvas(df, referencia=None):
+    """
+    df: filas de resultados (esquema de main_benchmark) con varios montos por ruta.
+    referencia: Series Ruta -> tasa de mercado; por defecto, la de XE en el mismo df.
+    Devuelve un DataFrame con una fila por (Competidor, Ruta) y las columnas COLUMNAS_CURVAS.
+    """
+    if referencia is None:
+        referencia = tasas_referencia(df)
+
+    ok = df[df['Status'] == 'OK']
+    x = pd.to_numeric(ok['Monto_Cotizado'], errors='coerce')
+    tasa = pd.to_numeric(ok['Tasa_Directa'], errors='coerce')
+    puntos = pd.DataFrame({
+        'Competidor': ok['Competidor'], 'Ruta': ok['Ruta'],
+        'x': x, 'tasa': tasa, 'y': x * tasa,
+    }).dropna()
+    if puntos.empty:
+        return pd.DataFrame(columns=COLUMNAS_CURVAS)
+
+    puntos = puntos.assign(xx=puntos['x'] ** 2, xy=puntos['x'] * puntos['y'], yy=puntos['y'] ** 2, n=1)
+    grupos = puntos.groupby(['Competidor', 'Ruta'], sort=False)
+    s = grupos[['n', 'x', 'y', 'xx', 'xy', 'yy']].sum()
+
+    # Mínimos cuadrados en forma cerrada, para todas las rutas a la vez
+    n = s['n'].to_numpy(dtype=float)
+    denominador = n * s['xx'] - s['x'] ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pendiente = (n * s['xy'] - s['x'] * s['y']) / denominador
+        intercepto = (s['y'] - pendiente * s['x']) / n
+        ss_res = s['yy'] - intercepto * s['y'] - pendiente * s['xy']
+        ss_tot = s['yy'] - s['y'] ** 2 / n
+        r2 = 1 - ss_res / ss_tot
+    # Con un solo monto distinto no hay curva
+    sin_curva = (n < 2) | (denominador.abs() < 1e-12)
+    pendiente = pendiente.mask(sin_curva)
+
+    curvas = pd.DataFrame({
+        'Puntos': s['n'],
+        'Monto_Min': grupos['x'].min(),
+        'Monto_Max': grupos['x'].max(),
+        'Tasa_Efectiva_Min': grupos['tasa'].min(),
+        'Tasa_Efectiva_Max': grupos['tasa'].max(),
+        'Tasa_Marginal': pendiente,
+        'Comision_Fija': (-intercepto / pendiente).mask(sin_curva),
+        'R2': r2.mask(sin_curva),
+    }).reset_index()
+    ref = curvas['Ruta'].map(referencia)
+    curvas['Comision_Proporcional'] = 1 - curvas['Tasa_Marginal'] / ref
+    return curvas[COLUMNAS_CURVAS]
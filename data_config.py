@@ -14,7 +14,7 @@ RUTAS_POR_COMPETIDOR = {
     "Western Union": ["EURVES"],
     "Mi Papaya":["CLPVES", "PENVES", "COPVES", "BRLVES"],
     "Paysend": ["CLPCOP", "CLPUS", "CLPARS", "CLPEUR", "CLPPEN", "COPARS", "COPPEN", "COPEUR", "COPUSD", "EURARS", "EURCOP", "EURPEN"],
-    "XE": ["EURARS", "EURCOP", "EURPEN", "EURUSD"],
+    "XE": ["EURARS", "EURCOP", "EURPEN", "EURUSD", "COPARS", "COPPEN"],
     "XOOM": ["EURARS", "EURCOP", "EURPEN", "EURUSD"],
     "Remitly":["EURARS", "EURCOP", "EURPEN", "EURUSD"],
     "CURRENCYBIRD": ["CLPCOP", "CLPUSD", "CLPARS", "CLPEUR", "CLPPEN"],
@@ -45,4 +45,92 @@ MONTOS_POR_MONEDA = {
     "COP": "120000", # Colombia: 120 mil COP
     "EUR": "50",     # Euro: 50 EUR
     "PEN": "150",    # Perú: 150 Soles
-}
\ No newline at end of file
+}
+
+# --- Cache de cotizaciones (segundos de vigencia por competidor) ---
+# Las APIs cambian rápido; las webs de referencia se pueden reutilizar más tiempo.
+TTL_CACHE_DEFECTO_SEGUNDOS = 3600
+TTL_CACHE_POR_COMPETIDOR = {
+    "Global66": 900,
+    "Arcadi": 900,
+    "CURRENCYBIRD": 900,
+    "XE": 1800,
+}
+
+# --- Triangulación de tasas de referencia ---
+# Competidor de tasa de mercado -> moneda pivote. Solo se scrapean las rutas
+# desde el pivote; las demás (ej. COPARS = EURARS / EURCOP) se derivan.
+PIVOTE_POR_COMPETIDOR_REFERENCIA = {
+    "XE": "EUR",
+}
+
+# --- Circuit breaker por competidor ---
+# Fallos consecutivos tras los que se dejan de intentar las rutas restantes
+FALLOS_PARA_ABRIR_CIRCUITO = 3
+FALLOS_PARA_ABRIR_POR_COMPETIDOR = {
+    "Paysend": 2,  # 12 rutas con esperas largas: conviene cortar antes
+}
+
+# --- Planificador y deadline de la corrida ---
+# Latencia supuesta de una ruta sin historial, y peso de la última medición en la media móvil
+LATENCIA_RUTA_DEFECTO_SEGUNDOS = 20
+ALFA_LATENCIA_EWMA = 0.3
+# Prioridad (mayor = más importante). Con deadline, las rutas de prioridad
+# >= PRIORIDAD_ALTA corren mientras quede tiempo; el resto solo si su latencia cabe.
+PRIORIDAD_ALTA = 2
+PRIORIDAD_POR_COMPETIDOR = {
+    "Global66": 2,
+    "Arcadi": 2,
+}
+# Corredores principales: suman +1 a la prioridad de cualquier competidor
+RUTAS_PRIORITARIAS = {"CLPVES", "EURVES"}
+
+# --- Barrido de montos (main_benchmark --escalonado) ---
+# Cada ruta se cotiza a todos los montos de su moneda de origen para ver la
+# curva tasa/monto y separar la comisión fija de la proporcional (curvas.py).
+MONTOS_ESCALONADOS_POR_MONEDA = {
+    "CLP": ["20000", "100000", "500000", "1000000"],
+    "COP": ["50000", "120000", "500000", "2000000"],
+    "EUR": ["20", "50", "200", "1000"],
+    "PEN": ["50", "150", "500", "2000"],
+}
+# Tasa de mercado contra la que se mide la comisión proporcional
+COMPETIDOR_REFERENCIA_CURVAS = "XE"
+
+# --- Perfil de navegador liviano (scrapers/perfil_navegador.py) ---
+# Chrome sin ventana; main_benchmark --con-ventana lo desactiva para depurar
+NAVEGADOR_HEADLESS = True
+# Patrones de URL que Chrome no descarga (CDP Network.setBlockedURLs, '*' comodín):
+# imágenes, video, fuentes, analítica y widgets de chat. Las calculadoras no los necesitan.
+RECURSOS_BLOQUEADOS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico",
+    "*.mp4", "*.webm", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googleadservices.com*",
+    "*connect.facebook.net*", "*hotjar.com*", "*clarity.ms*", "*segment.io*", "*segment.com/analytics*",
+    "*analytics.tiktok.com*", "*bat.bing.com*", "*snap.licdn.com*", "*mixpanel.com*", "*amplitude.com*",
+    "*intercom.io*", "*intercomcdn.com*", "*zdassets.com*", "*zendesk.com/embeddable*", "*tawk.to*",
+    "*livechatinc.com*", "*widget.trustpilot.com*", "*youtube.com/embed*",
+]
+# Excepciones por competidor: patrones de RECURSOS_BLOQUEADOS que su página sí necesita
+RECURSOS_PERMITIDOS_POR_COMPETIDOR = {
+    # "Paysend": ["*.woff2"],
+}
+
+# --- Consentimiento de cookies persistido (estado_navegador.py) ---
+# Cookies y claves de localStorage que se guardan por competidor tras una
+# corrida y se cargan en el driver antes de navegar: con ellas los banners
+# de cookies ya no aparecen. Se comparan en minúsculas, por fragmento.
+FRAGMENTOS_CONSENTIMIENTO = (
+    "optanon", "consent", "cookieyes", "cmplz", "cookielawinfo", "didomi",
+    "euconsent", "_iub_cs", "cookie_notice", "gdpr",
+)
+
+# Cookies que el banner fija solo al aceptarse (o cerrarse); las demás de
+# FRAGMENTOS_CONSENTIMIENTO (p. ej. OptanonConsent) ya existen al cargar la
+# página. Sin una de estas el consentimiento no se guarda ni se da por vigente.
+# Se comparan en minúsculas, por fragmento.
+MARCADORES_ACEPTACION = (
+    "optanonalertboxclosed", "cmplz_banner-status", "viewed_cookie_policy", "didomi_token",
+    "euconsent-v2", "_iub_cs", "cookie_notice_accepted",
+)
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from data_config import FRAGMENTOS_CONSENTIMIENTO, MARCADORES_ACEPTACION
+
+# Lee del documento actual las claves de localStorage de consentimiento
+JS_LOCAL_STORAGE_CONSENTIMIENTO = """
+const fragmentos = arguments[0];
+const datos = {};
+try {
+    for (let i = 0; i < localStorage.length; i++) {
+        const clave = localStorage.key(i);
+        if (fragmentos.some(f => clave.toLowerCase().includes(f))) datos[clave] = localStorage.getItem(clave);
+    }
+} catch (e) {}
+return [location.origin, datos];
+"""
+
+# Se inyecta antes de cada documento: repone las claves guardadas para su origen
+JS_REPONER_LOCAL_STORAGE = """
+(function () {
+    const datos = (%s)[location.origin];
+    if (!datos) return;
+    try {
+        for (const [clave, valor] of Object.entries(datos)) {
+            if (localStorage.getItem(clave) === null) localStorage.setItem(clave, valor);
+        }
+    } catch (e) {}
+})();
+"""
+
+
+def es_de_consentimiento(nombre):
+    nombre = nombre.lower()
+    return any(fragmento in nombre for fragmento in FRAGMENTOS_CONSENTIMIENTO)
+
+
+def es_de_aceptacion(nombre):
+    """True si la cookie solo existe tras aceptar (o cerrar) el banner."""
+    nombre = nombre.lower()
+    return any(marcador in nombre for marcador in MARCADORES_ACEPTACION)
+
+
+class EstadoNavegador:
+    """
+    Consentimiento de cookies por competidor (cookies y localStorage),
+    persistido en JSON entre ejecuciones. Al prestar un driver a un
+    competidor se cargan por CDP antes de navegar, así el banner de cookies
+    no aparece; al devolverlo se guarda lo que haya quedado en su sitio.
+    Solo se guardan cookies/claves de consentimiento (FRAGMENTOS_CONSENTIMIENTO),
+    nunca las de sesión, y solo si el banner se aceptó (MARCADORES_ACEPTACION):
+    algunas se fijan al cargar la página, antes de aceptar nada.
+    """
+    def __init__(self, ruta_estado="estado_navegador.json"):
+        self.ruta_estado = ruta_estado
+        self._lock = threading.Lock()
+        self._estados = {}
+        if os.path.exists(ruta_estado):
+            try:
+                with open(ruta_estado, encoding="utf-8") as f:
+                    self._estados = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Estado del navegador ilegible ({e}); los banners se cierran como siempre.")
+
+    def restaurar(self, driver, competidor):
+        """
+        Carga cookies y localStorage guardados del competidor en el driver.
+        Devuelve (nombres_de_cookies_cargadas, identificador_del_script) para
+        retirar() al terminar; (set(), None) si no había nada guardado.
+        """
+        with self._lock:
+            estado = self._estados.get(competidor, {})
+        ahora = time.time()
+        cookies = [c for c in estado.get("cookies", []) if not c.get("expires") or c["expires"] > ahora]
+        identificador = None
+        try:
+            if cookies:
+                driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            if estado.get("local_storage"):
+                script = JS_REPONER_LOCAL_STORAGE % json.dumps(estado["local_storage"])
+                identificador = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                                       {"source": script}).get("identifier")
+        except Exception as e:
+            print(f"    ⚠️ No se pudo restaurar el consentimiento de {competidor}: {e}")
+            return set(), identificador
+        if cookies or identificador:
+            print(f"    🍪 {competidor}: consentimiento restaurado ({len(cookies)} cookies)")
+        return {c["name"] for c in cookies}, identificador
+
+    def capturar(self, driver, competidor):
+        """
+        Guarda (en memoria) las cookies y claves de consentimiento del sitio
+        abierto en el driver, solo si hay un marcador de aceptación: si el
+        clic en el banner falló, no se guarda nada y la próxima corrida lo busca.
+        """
+        try:
+            cookies = [_cookie_cdp(c) for c in driver.get_cookies() if es_de_consentimiento(c["name"])]
+            origen, datos = driver.execute_script(JS_LOCAL_STORAGE_CONSENTIMIENTO, list(FRAGMENTOS_CONSENTIMIENTO))
+        except Exception as e:
+            print(f"    ⚠️ No se pudo leer el consentimiento de {competidor}: {e}")
+            return
+        if not any(es_de_aceptacion(c["name"]) for c in cookies):
+            return
+        with self._lock:
+            estado = self._estados.setdefault(competidor, {})
+            if cookies:
+                estado["cookies"] = cookies
+            if datos:
+                estado.setdefault("local_storage", {})[origen] = datos
+
+    def retirar(self, driver, identificador):
+        """Quita el script de localStorage del driver antes de devolverlo al pool."""
+        if identificador is None:
+            return
+        try:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identificador})
+        except Exception:
+            pass
+
+    def guardar(self):
+        with self._lock:
+            carpeta = os.path.dirname(self.ruta_estado)
+            if carpeta:
+                os.makedirs(carpeta, exist_ok=True)
+            with open(self.ruta_estado, "w", encoding="utf-8") as f:
+                json.dump(self._estados, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def _cookie_cdp(cookie):
+    """Cookie de Selenium (get_cookies) al formato de Network.setCookies."""
+    convertida = {clave: cookie[clave] for clave in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+                  if clave in cookie}
+    if "expiry" in cookie:
+        convertida["expires"] = cookie["expiry"]
+    return convertida
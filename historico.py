@@ -0,0 +1,167 @@
+import argparse
+import datetime
+import glob
+import os
+import sqlite3
+import threading
+from cache_cotizaciones import MOTIVO_CACHE
+
+# Columnas del histórico: las de main_benchmark + la marca de la ejecución.
+# 'Fecha' es solo el día; 'Ejecucion' (ISO con hora) distingue las corridas
+# de un mismo día cuando el benchmark se lanza cada hora.
+COLUMNAS_HISTORICO = [
+    'Ejecucion', 'Fecha', 'Competidor', 'Ruta', 'Moneda_Origen', 'Monto_Cotizado',
+    'Tasa_Directa', 'Tasa_Inversa', 'Status', 'Derivada_De', 'Motivo',
+]
+
+
+class HistoricoTasas:
+    """
+    Histórico de tasas en SQLite al que cada ejecución agrega sus filas.
+    La tabla es WITHOUT ROWID con clave (Competidor, Ruta, Ejecucion, Monto):
+    las filas de una misma serie quedan contiguas en el B-tree, así que
+    serie() es una sola búsqueda por rango aunque haya años de corridas.
+    """
+    def __init__(self, ruta_db="historico_tasas.sqlite"):
+        self.ruta_db = ruta_db
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(ruta_db, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS historico (
+                Ejecucion TEXT NOT NULL,
+                Fecha TEXT NOT NULL,
+                Competidor TEXT NOT NULL,
+                Ruta TEXT NOT NULL,
+                Moneda_Origen TEXT,
+                Monto_Cotizado TEXT NOT NULL,
+                Tasa_Directa REAL,
+                Tasa_Inversa REAL,
+                Status TEXT,
+                Derivada_De TEXT,
+                Motivo TEXT,
+                PRIMARY KEY (Competidor, Ruta, Ejecucion, Monto_Cotizado)
+            ) WITHOUT ROWID
+            """
+        )
+        # Para consultas de "todas las rutas de un día"
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_historico_fecha ON historico (Fecha)")
+        self._conn.commit()
+
+    def agregar_ejecucion(self, filas, ejecucion=None):
+        """
+        Agrega las filas de una corrida (dicts con las columnas de main_benchmark)
+        en una sola transacción. Repetir la misma ejecución reemplaza sus filas.
+        Las filas servidas desde la cache (Motivo CACHE) se omiten: son una
+        cotización de una corrida anterior, no una observación de esta.
+        Devuelve cuántas filas se escribieron.
+        """
+        ejecucion = ejecucion or datetime.datetime.now().isoformat(timespec="seconds")
+        valores = []
+        for fila in filas:
+            if fila.get('Motivo') == MOTIVO_CACHE:
+                continue
+            valores.append((
+                ejecucion,
+                str(fila.get('Fecha') or ejecucion[:10]),
+                fila['Competidor'],
+                fila['Ruta'],
+                fila.get('Moneda_Origen') or fila['Ruta'][:3],
+                str(fila.get('Monto_Cotizado', "")),
+                _a_float(fila.get('Tasa_Directa')),
+                _a_float(fila.get('Tasa_Inversa')),
+                fila.get('Status'),
+                _a_texto(fila.get('Derivada_De')),
+                _a_texto(fila.get('Motivo')),
+            ))
+        marcas = ", ".join("?" for _ in COLUMNAS_HISTORICO)
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(f"INSERT OR REPLACE INTO historico VALUES ({marcas})", valores)
+        return len(valores)
+
+    def serie(self, competidor, ruta, desde=None, hasta=None, solo_ok=False):
+        """
+        Serie temporal de un competidor/ruta, ordenada por ejecución.
+        desde/hasta: fechas u horas ISO ('2026-01-01' o '2026-01-01T10:00:00'), inclusivas.
+        Devuelve una lista de dicts con Ejecucion, Monto_Cotizado, Tasa_Directa, Tasa_Inversa y Status.
+        """
+        consulta = ("SELECT Ejecucion, Monto_Cotizado, Tasa_Directa, Tasa_Inversa, Status "
+                    "FROM historico WHERE Competidor = ? AND Ruta = ?")
+        parametros = [competidor, ruta]
+        if desde:
+            consulta += " AND Ejecucion >= ?"
+            parametros.append(desde)
+        if hasta:
+            consulta += " AND Ejecucion <= ?"
+            # Una fecha sola incluye todo ese día
+            parametros.append(hasta + "T99" if len(hasta) == 10 else hasta)
+        if solo_ok:
+            consulta += " AND Status = 'OK'"
+        consulta += " ORDER BY Ejecucion"
+
+        with self._lock:
+            filas = self._conn.execute(consulta, parametros).fetchall()
+        columnas = ('Ejecucion', 'Monto_Cotizado', 'Tasa_Directa', 'Tasa_Inversa', 'Status')
+        return [dict(zip(columnas, fila)) for fila in filas]
+
+    def serie_df(self, competidor, ruta, desde=None, hasta=None, solo_ok=False):
+        """Igual que serie() pero como DataFrame indexado por Ejecucion (requiere pandas)."""
+        import pandas as pd
+        df = pd.DataFrame(self.serie(competidor, ruta, desde, hasta, solo_ok),
+                          columns=['Ejecucion', 'Monto_Cotizado', 'Tasa_Directa', 'Tasa_Inversa', 'Status'])
+        df['Ejecucion'] = pd.to_datetime(df['Ejecucion'])
+        return df.set_index('Ejecucion')
+
+    def importar_excel(self, ruta_excel):
+        """Carga al histórico un Benchmark_Tasas_<fecha>.xlsx de ejecuciones anteriores."""
+        import pandas as pd
+        df = pd.read_excel(ruta_excel, sheet_name=0)
+        fecha = str(df['Fecha'].iloc[0])[:10] if len(df) else ""
+        return self.agregar_ejecucion(df.to_dict('records'), ejecucion=f"{fecha}T00:00:00")
+
+    def cerrar(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _a_texto(valor):
+    # Celdas vacías leídas con pandas llegan como NaN (NaN != NaN)
+    if valor in (None, "") or valor != valor:
+        return None
+    return str(valor)
+
+
+def _a_float(valor):
+    if valor in (None, ""):
+        return None
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consulta (o carga) el histórico de tasas.")
+    parser.add_argument("--db", default="historico_tasas.sqlite", help="Archivo SQLite del histórico.")
+    parser.add_argument("--importar", nargs="*", metavar="XLSX",
+                        help="Excels antiguos a cargar (ej. 'Benchmark_Tasas_*.xlsx').")
+    parser.add_argument("competidor", nargs="?")
+    parser.add_argument("ruta", nargs="?")
+    parser.add_argument("--desde")
+    parser.add_argument("--hasta")
+    args = parser.parse_args()
+
+    historico = HistoricoTasas(args.db)
+    try:
+        for patron in args.importar or []:
+            for ruta_excel in sorted(glob.glob(patron)) or [patron]:
+                if os.path.exists(ruta_excel):
+                    print(f"📥 {ruta_excel}: {historico.importar_excel(ruta_excel)} filas")
+
+        if args.competidor and args.ruta:
+            for punto in historico.serie(args.competidor, args.ruta, args.desde, args.hasta):
+                print(f"{punto['Ejecucion']}  {punto['Tasa_Directa']}  {punto['Status']}")
+    finally:
+        historico.cerrar()
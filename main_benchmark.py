@@ -1,45 +1,45 @@
-import pandas as pd
-from selenium import webdriver
 import datetime
-import re
-from data_config import RUTAS_POR_COMPETIDOR, URLS_COMPETIDORES
-# Importar la clase base y las clases específicas
-from scrapers.base_scraper import BaseScraper 
-from scrapers.global66_api import Global66ApiScraper 
-from scrapers.arcadi_api import ArcadiApiScraper
-from scrapers.intergiros_scraper import IntergirosScraper
-from scrapers.quickex_scraper import QuickexScraper
-from scrapers.tucambio_scraper import TuCambioScraper
-from scrapers.remesasvzla_scraper import RemesasVzlaScraper
-from scrapers.curiara_scrapper import CuriaraScraper
-#from scrapers.mipapaya_scraper import MiPapayaScraper
-from scrapers.paysend_scraper import PaysendScraper
-from scrapers.xe_scraper import XeScraper
-from scrapers.ria_scraper import RiaScraper
-from scrapers.xoom_scraper import XoomScraper
-from scrapers.remitly_scraper import RemitlyScraper
-from scrapers.currencybird_api import CurrencyBirdApiScraper
-# Agrega aquí las clases de otros competidores a medida que las crees
-# from scrapers.arcadi_scraper import ArcadiScraper 
-
-# --- Mapeo de Competidores a sus Clases Scraper ---
-# Esto permite al bucle principal saber qué clase usar para cada competidor.
-COMPETIDOR_MAPPER = {
-    #"Global66": Global66ApiScraper,
-    #"Arcadi": ArcadiApiScraper,
-    #"Intergiros": IntergirosScraper,
-    #"Quickex": QuickexScraper,
-    #"Tucambio CL": TuCambioScraper,
-    #"Remesas Vzla": RemesasVzlaScraper,
-    #"Curiara": CuriaraScraper,
-    #"Mi Papaya": MiPapayaScraper,
-    #"Paysend": PaysendScraper,
-    #"XE": XeScraper,
-    #"RIA": RiaScraper,
-    #"XOOM": XoomScraper,
-    #"Remitly": RemitlyScraper,
-    "CURRENCYBIRD": CurrencyBirdApiScraper
-}
+import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from data_config import RUTAS_POR_COMPETIDOR, MONTOS_POR_MONEDA, NAVEGADOR_HEADLESS
+from pool_drivers import PoolDrivers
+from cache_cotizaciones import CacheCotizaciones, MOTIVO_CACHE
+from historico import HistoricoTasas
+from triangulacion import planificar_rutas, derivar_tasas, pivote_de
+from estado_navegador import EstadoNavegador
+from circuito import (CircuitoCompetidores, MOTIVO_SIN_TASA, MOTIVO_ERROR, MOTIVO_SIN_DRIVER,
+                      MOTIVO_CIRCUITO_ABIERTO, MOTIVO_PATA_FALLIDA)
+from planificador import (LatenciasRutas, PresupuestoEjecucion, planificar_ejecucion,
+                          STATUS_SKIPPED, MOTIVO_DEADLINE)
+from plan_rutas import compilar_plan, describir_plan
+from salida_resultados import (crear_sink, SINKS, COLUMNAS_RESULTADO, FORMATOS_COLUMNARES,
+                               escribir_columnar, pyarrow_disponible)
+# Los scrapers se importan por nombre recién al ejecutarse (scrapers/registro.py)
+from scrapers.registro import esta_registrado, requiere_navegador, clase_scraper
+from scrapers.http_replay import configurar_http, finalizar_http, MODOS_HTTP
+from scrapers.captura_red import habilitar_captura_red
+from scrapers.perfil_navegador import configurar_perfil, configurar_opciones, preparar_driver, aplicar_bloqueo
+
+# --- Competidores que se ejecutan ---
+# Comentar/descomentar aquí; la clase de cada uno está en scrapers/registro.py.
+COMPETIDORES_ACTIVOS = [
+    #"Global66",
+    #"Arcadi",
+    #"Intergiros",
+    #"Quickex",
+    #"Tucambio CL",
+    #"Remesas Vzla",
+    #"Curiara",
+    #"Mi Papaya",
+    #"Paysend",
+    #"XE",
+    #"RIA",
+    #"XOOM",
+    #"Remitly",
+    "CURRENCYBIRD",
+]
 
 def calcular_tasa_inversa(tasa_directa):
     """Calcula la tasa inversa (1 / tasa_directa)."""
@@ -47,67 +47,524 @@ def calcular_tasa_inversa(tasa_directa):
         return 1 / tasa_directa
     return 0.0
 
-def ejecutar_benchmark_a_excel():
-    
+def crear_driver():
+    """Fábrica de drivers usada por el pool (un Chrome incógnito por worker, perfil liviano)."""
+    # Selenium solo se importa si algún competidor necesita navegador
+    from selenium import webdriver
     options = webdriver.ChromeOptions()
     options.add_argument("--incognito") 
+    # Sin ventana, carga 'eager' (ver scrapers/perfil_navegador.py)
+    configurar_opciones(options)
+    # Log de red (CDP) para leer la tasa del JSON que pide la propia página
+    habilitar_captura_red(options)
+    return preparar_driver(webdriver.Chrome(options=options))
+
+def construir_fila(competidor, ruta, tasa_directa, monto_usado, derivada_de="", motivo=""):
+    """
+    Arma una fila de resultados con el esquema del Excel.
+    derivada_de: patas si la tasa es triangulada. motivo: código del FALLO (circuito.py),
+    o MOTIVO_CACHE en una fila OK que salió de la cache.
+    """
+    tasa_inversa = calcular_tasa_inversa(tasa_directa)
+    moneda_origen = ruta[:3] 
+    if tasa_directa <= 0 and not motivo:
+        motivo = MOTIVO_SIN_TASA
+    if tasa_directa > 0:
+        status = 'OK'
+    elif motivo == MOTIVO_DEADLINE:
+        status = STATUS_SKIPPED
+    else:
+        status = 'FALLO'
     
+    return {
+        'Fecha': datetime.date.today().isoformat(),
+        'Competidor': competidor,
+        'Ruta': ruta,
+        'Moneda_Origen': moneda_origen,
+        'Monto_Cotizado': monto_usado, 
+        'Tasa_Directa': tasa_directa,
+        'Tasa_Inversa': tasa_inversa,
+        'Status': status,
+        'Derivada_De': derivada_de,
+        'Motivo': motivo if tasa_directa <= 0 or motivo == MOTIVO_CACHE else "",
+    }
+
+def scrapear_rutas(competidor, rutas, pool, al_cotizar, circuito=None, presupuesto=None, montos_de=None,
+                   estado_navegador=None):
+    """
+    Ejecuta las rutas de un competidor con un driver prestado del pool.
+    Cada cotización se entrega apenas se obtiene con al_cotizar(ruta, tasa, monto[, motivo]).
+    Con circuito, tras N fallos seguidos (o una sonda fallida) el resto de
+    rutas se entrega como FALLO al instante. Con presupuesto, las rutas que
+    ya no entran en el deadline se entregan como SKIPPED.
+    montos_de(ruta): montos a cotizar por ruta (barrido de montos); sin él,
+    un solo monto de MONTOS_POR_MONEDA. Con estado_navegador, el driver
+    arranca con el consentimiento de cookies guardado del competidor y al
+    terminar se guarda el vigente. Devuelve las filas de tiempos.
+    """
+    ScraperClass = clase_scraper(competidor)
+    scraper = None
+    # Scrapers con navegador: rutas agrupadas por página/origen (plan_rutas)
+    if requiere_navegador(competidor):
+        scraper = ScraperClass(None)
+        plan = compilar_plan(competidor, scraper, rutas)
+        print(describir_plan(plan))
+        rutas = plan.rutas
+    # Cada cotización es (ruta, monto); los montos de una ruta quedan seguidos
+    # para que las calculadoras con sesión solo reescriban el monto.
+    trabajos = [(ruta, monto) for ruta in rutas for monto in (montos_de(ruta) if montos_de else [None])]
+    entregadas = 0
+
+    def fallar_restantes(pendientes, motivo):
+        for ruta, monto in pendientes:
+            al_cotizar(ruta, 0.0, monto or MONTOS_POR_MONEDA.get(ruta[:3], "100"), motivo)
+
+    def fuera_de_plazo(trabajo):
+        if presupuesto and not presupuesto.admite(competidor, trabajo[0]):
+            fallar_restantes([trabajo], MOTIVO_DEADLINE)
+            return True
+        return False
+
+    # 0. Scrapers que pueden cotizar por HTTP simple: Chrome solo para las rutas que necesiten JS
+    if getattr(ScraperClass, "PUEDE_SIN_NAVEGADOR", False):
+        scraper = scraper or ScraperClass(None)
+        con_navegador = []
+        for ruta, monto in trabajos:
+            if fuera_de_plazo((ruta, monto)):
+                continue
+            try:
+                resultado = scraper.cotizar_sin_navegador(ruta, monto)
+            except Exception as e:
+                print(f"    ⚠️ Falló el modo HTTP en {competidor} {ruta}: {e}")
+                resultado = None
+            if resultado is None:
+                con_navegador.append((ruta, monto))
+            else:
+                al_cotizar(ruta, *resultado)
+                if circuito:
+                    circuito.registrar(competidor, resultado[0] > 0)
+        trabajos = con_navegador
+        if not trabajos:
+            return _tiempos_de(scraper, competidor)
+
+    # Circuito abierto (p. ej. por una sonda HTTP fallida): ni siquiera se pide un driver
+    if circuito and circuito.abierto(competidor):
+        fallar_restantes(trabajos, MOTIVO_CIRCUITO_ABIERTO)
+        return _tiempos_de(scraper, competidor)
+
+    # Sin tiempo para ninguna ruta: tampoco se pide un driver
+    if presupuesto and presupuesto.restante() <= 0:
+        for trabajo in trabajos:
+            fuera_de_plazo(trabajo)
+        return _tiempos_de(scraper, competidor)
+
+    with ExitStack() as prestamo:
+        try:
+            # Los scrapers de API no piden driver: una corrida solo de APIs nunca abre Chrome
+            driver = prestamo.enter_context(pool.driver()) if requiere_navegador(competidor) else None
+        except Exception as e:
+            print(f"ERROR: No se pudo iniciar el WebDriver para {competidor}. Asegúrate de tener ChromeDriver en tu PATH. Detalle: {e}")
+            fallar_restantes(trabajos, MOTIVO_SIN_DRIVER)
+            return _tiempos_de(scraper, competidor)
+
+        try:
+            # 1. Inicializar el Scraper con su propio driver
+            cookies_restauradas, script_consentimiento = set(), None
+            if driver is not None:
+                # Media pesada y terceros bloqueados, salvo las excepciones del competidor
+                aplicar_bloqueo(driver, competidor)
+                if estado_navegador:
+                    cookies_restauradas, script_consentimiento = estado_navegador.restaurar(driver, competidor)
+            if scraper is None:
+                scraper = ScraperClass(driver)
+            else:
+                scraper.driver = driver
+            scraper.cookies_restauradas = cookies_restauradas
+
+            try:
+                # 2. Todas las rutas como un lote: cada scraper decide cómo obtenerlas
+                # (API concurrente, una página por origen...) y entrega tasa por tasa.
+                # Las rutas se le pasan de a una, con el circuito y el deadline
+                # revisados justo antes de cada una.
+                tomados = []
+
+                def por_cotizar():
+                    nonlocal entregadas
+                    for indice in range(len(trabajos)):
+                        if circuito and circuito.abierto(competidor):
+                            fallar_restantes(trabajos[indice:], MOTIVO_CIRCUITO_ABIERTO)
+                            entregadas += len(trabajos) - indice
+                            return
+                        if fuera_de_plazo(trabajos[indice]):
+                            entregadas += 1
+                            continue
+                        tomados.append(trabajos[indice])
+                        yield trabajos[indice]
+
+                restantes = por_cotizar()
+                respondidos = 0
+                while True:
+                    try:
+                        # get_tasas() usa cotizar() de la clase y mide sus fases
+                        for ruta, tasa_directa, monto_usado in scraper.get_tasas(restantes):
+                            respondidos += 1
+                            al_cotizar(ruta, tasa_directa, monto_usado)
+                            entregadas += 1
+                            if circuito:
+                                circuito.registrar(competidor, tasa_directa > 0)
+                        break
+                    except Exception as e:
+                        # Un error no controlado no debe tumbar al resto de competidores:
+                        # las rutas que el scraper tenía en curso fallan y el lote sigue
+                        en_curso = tomados[respondidos:]
+                        reintentar = bool(en_curso)
+                        if not reintentar:
+                            # Falló sin tomar ninguna ruta: volver a llamarlo no serviría
+                            en_curso = list(restantes)
+                        print(f"    ❌ Error no controlado en {competidor} {[r for r, _ in en_curso]}: {e}")
+                        fallar_restantes(en_curso, MOTIVO_ERROR)
+                        respondidos = len(tomados)
+                        entregadas += len(en_curso)
+                        if circuito:
+                            for _ in en_curso:
+                                circuito.registrar(competidor, False)
+                        if not reintentar:
+                            break
+            finally:
+                # Consentimiento vigente del sitio para la próxima corrida
+                if driver is not None and estado_navegador:
+                    estado_navegador.capturar(driver, competidor)
+                    estado_navegador.retirar(driver, script_consentimiento)
+
+        except Exception as e:
+            # Fallo fuera del lote (inicializar el scraper, restaurar el consentimiento...)
+            print(f"    ❌ Error no controlado en {competidor}: {e}")
+            fallar_restantes(trabajos[entregadas:], MOTIVO_ERROR)
+
+    return _tiempos_de(scraper, competidor)
+
+def _tiempos_de(scraper, competidor):
+    """Filas de tiempos del scraper, con el nombre del competidor de data_config."""
+    if scraper is None:
+        return []
+    return [dict(fila, Competidor=competidor) for fila in scraper.tiempos]
+
+def procesar_competidor(competidor, rutas, pool, sink, cache=None, circuito=None, presupuesto=None, montos_de=None,
+                        estado_navegador=None):
+    """
+    Procesa un competidor en un hilo del executor: sirve desde la cache las
+    rutas vigentes y solo scrapea las faltantes o vencidas. Cada fila se
+    escribe en el sink en cuanto se produce. Devuelve las filas de tiempos.
+    Para competidores de referencia (XE) solo se cotizan las patas desde la
+    moneda pivote; las rutas cruzadas se derivan al final (triangulacion.py).
+    Con montos_de (barrido de montos) cada ruta se cotiza a varios montos;
+    las tasas de referencia no dependen del monto y se cotizan una vez.
+    """
+    if montos_de and pivote_de(competidor):
+        montos_de = None
+    # Rutas que ya tienen fila: ante un error no controlado, el resto sale como FALLO
+    escritas = set()
+
+    def escribir(fila):
+        sink.escribir(fila)
+        escritas.add(fila['Ruta'])
+
+    tiempos = []
     try:
-        # Inicialización del driver
-        driver = webdriver.Chrome(options=options)
+        a_cotizar, derivadas = planificar_rutas(competidor, rutas)
+        if derivadas:
+            print(f"  🔺 {competidor}: {len(rutas)} rutas -> {len(a_cotizar)} a cotizar, {len(derivadas)} derivadas")
+        con_fila = set(rutas)
+        tasas = {}
+        saltadas = set()
+        desde_cache = set()
+        pendientes = []
+
+        for ruta in a_cotizar:
+            monto = MONTOS_POR_MONEDA.get(ruta[:3], "100")
+            cacheada = cache.obtener(competidor, ruta, monto) if cache else None
+            if cacheada:
+                tasa_directa, monto_usado = cacheada
+                print(f"  💾 {competidor} {ruta}: desde cache ({tasa_directa:.6f})")
+                tasas[ruta] = tasa_directa
+                desde_cache.add(ruta)
+                if ruta in con_fila:
+                    escribir(construir_fila(competidor, ruta, tasa_directa, monto_usado, motivo=MOTIVO_CACHE))
+            else:
+                pendientes.append(ruta)
+
+        def al_cotizar(ruta, tasa_directa, monto_usado, motivo=""):
+            tasas[ruta] = tasa_directa
+            if motivo == MOTIVO_DEADLINE:
+                saltadas.add(ruta)
+            # Las patas que no están en data_config solo alimentan la triangulación
+            if ruta in con_fila:
+                escribir(construir_fila(competidor, ruta, tasa_directa, monto_usado, motivo=motivo))
+            if cache:
+                cache.guardar(competidor, ruta, MONTOS_POR_MONEDA.get(ruta[:3], "100"), tasa_directa, monto_usado)
+
+        tiempos = scrapear_rutas(competidor, pendientes, pool, al_cotizar, circuito, presupuesto, montos_de,
+                                 estado_navegador) if pendientes else []
+
+        for ruta, tasa_directa, patas in derivar_tasas(competidor, derivadas, tasas):
+            print(f"  🔺 {competidor} {ruta}: derivada de {patas} ({tasa_directa:.6f})")
+            # Si una pata quedó fuera del deadline, la derivada también es SKIPPED;
+            # si alguna salió de la cache, la derivada tampoco es una observación nueva
+            if saltadas.intersection(patas.split("/")):
+                motivo = MOTIVO_DEADLINE
+            elif tasa_directa > 0 and desde_cache.intersection(patas.split("/")):
+                motivo = MOTIVO_CACHE
+            else:
+                motivo = MOTIVO_PATA_FALLIDA
+            escribir(construir_fila(competidor, ruta, tasa_directa, MONTOS_POR_MONEDA.get(ruta[:3], "100"),
+                                    derivada_de=patas, motivo=motivo))
     except Exception as e:
-        print(f"ERROR: No se pudo iniciar el WebDriver. Asegúrate de tener ChromeDriver en tu PATH. Detalle: {e}")
+        # Un competidor roto (import del scraper, plan, cache, sink...) no tumba la corrida
+        print(f"    ❌ Error no controlado en {competidor}: {e}")
+        for ruta in rutas:
+            if ruta in escritas:
+                continue
+            try:
+                escribir(construir_fila(competidor, ruta, 0.0, MONTOS_POR_MONEDA.get(ruta[:3], "100"),
+                                        motivo=MOTIVO_ERROR))
+            except Exception as e_fila:
+                print(f"    ⚠️ No se pudo escribir la fila de {competidor} {ruta}: {e_fila}")
+    return tiempos
+
+def ordenar_como_config(df):
+    """Ordena las filas como en RUTAS_POR_COMPETIDOR (el sink las tiene por orden de llegada)."""
+    orden = {}
+    for competidor, rutas in RUTAS_POR_COMPETIDOR.items():
+        for ruta in rutas:
+            orden.setdefault((competidor, ruta), len(orden))
+    claves = [orden.get((c, r), len(orden)) for c, r in zip(df['Competidor'], df['Ruta'])]
+    return df.assign(_orden=claves).sort_values('_orden', kind='stable').drop(columns='_orden')
+
+def resumir_tiempos(tiempos):
+    """Imprime p50/p95 (segundos) por competidor y fase."""
+    if not tiempos:
         return
+    import pandas as pd
+    df = pd.DataFrame(tiempos)
+    resumen = df.groupby(['Competidor', 'Fase'], sort=False)['Segundos'].quantile([0.5, 0.95]).unstack()
+    resumen.columns = ['p50', 'p95']
+    print("\n⏱️ TIEMPOS POR FASE (segundos)")
+    print(resumen.round(2).to_string())
 
-    print("--- INICIANDO BOT DE BENCHMARK ---")
-    
-    resultados = []
+def imprimir_planes():
+    """Muestra el plan de rutas de cada competidor activo con navegador, sin scrapear."""
+    for competidor, rutas in RUTAS_POR_COMPETIDOR.items():
+        if competidor not in COMPETIDORES_ACTIVOS or not esta_registrado(competidor):
+            continue
+        if not requiere_navegador(competidor):
+            continue
+        a_scrapear, _ = planificar_rutas(competidor, rutas)
+        print(describir_plan(compilar_plan(competidor, clase_scraper(competidor)(None), a_scrapear)))
 
+def resumir_red(tiempos):
+    """Imprime por competidor el tráfico y la carga de página (filas 'page_load' de los scrapers con navegador)."""
+    filas = [fila for fila in tiempos if fila.get('Fase') == "page_load"]
+    if not filas:
+        return
+    import pandas as pd
+    df = pd.DataFrame(filas)
+    resumen = df.groupby('Competidor', sort=False).agg(
+        Rutas=('Ruta', 'size'), Cargas=('Segundos', 'count'), Carga_p50=('Segundos', 'median'),
+        MB=('Bytes', 'sum'), Peticiones=('Peticiones', 'sum'), Bloqueadas=('Bloqueadas', 'sum'),
+    )
+    resumen['KB_por_ruta'] = resumen['MB'] / 1024 / resumen['Rutas']
+    resumen['MB'] = resumen['MB'] / 1024 ** 2
+    print("\n🌐 RED POR COMPETIDOR (navegador)")
+    print(resumen.round(2).to_string())
+
+def ejecutar_benchmark_a_excel(max_workers=None, usar_cache=True, ruta_cache="cache_cotizaciones.sqlite", formato_sink="csv",
+                               ruta_historico="historico_tasas.sqlite", ruta_circuitos="estado_circuitos.json",
+                               deadline_segundos=None, ruta_latencias="latencias_rutas.json", escalonado=False,
+                               formato_columnar=None, ruta_estado_navegador="estado_navegador.json"):
+    
+    # Competidores a ejecutar (los inactivos o sin scraper registrado se saltan)
+    competidores = []
     for competidor, rutas in RUTAS_POR_COMPETIDOR.items():
-        
-        # 1. Seleccionar la clase Scraper correcta
-        ScraperClass = COMPETIDOR_MAPPER.get(competidor, None)
-        
-        if ScraperClass is None:
-            # Si el competidor no está en el mapper, lo saltamos
+        if competidor not in COMPETIDORES_ACTIVOS:
+            continue
+        if not esta_registrado(competidor):
             print(f"  ⚠️ Clase Scraper no definida para {competidor}. Saltando.")
             continue 
+        competidores.append((competidor, rutas))
 
-        # 2. Inicializar el Scraper (la URL ya está definida en su clase o data_config)
-        scraper = ScraperClass(driver) 
-        
-        # 3. Iterar sobre las rutas definidas para ese competidor
-        for ruta in rutas:
-            # Llama al método específico de la clase (ej. Global66Scraper.get_tasa_por_ruta)
-            tasa_directa, monto_usado = scraper.get_tasa_por_ruta(ruta) 
-            tasa_inversa = calcular_tasa_inversa(tasa_directa)
-            
-            moneda_origen = ruta[:3] 
-            
-            resultados.append({
-                'Fecha': datetime.date.today().isoformat(),
-                'Competidor': competidor,
-                'Ruta': ruta,
-                'Moneda_Origen': moneda_origen,
-                'Monto_Cotizado': monto_usado, 
-                'Tasa_Directa': tasa_directa,
-                'Tasa_Inversa': tasa_inversa,
-                'Status': 'OK' if tasa_directa > 0 else 'FALLO'
-            })
-            
-    driver.quit()
-    print("--- BENCHMARK FINALIZADO ---")
-    
-    # --- EXPORTAR A EXCEL ---
-    df = pd.DataFrame(resultados)
-    nombre_archivo = f"Benchmark_Tasas_{datetime.date.today().isoformat()}.xlsx"
+    if not competidores:
+        print("⚠️ No hay competidores activos en COMPETIDORES_ACTIVOS.")
+        return
+
+    # Número de workers: configurable, por defecto según los núcleos disponibles
+    if not max_workers:
+        max_workers = os.cpu_count() or 2
+    max_workers = max(1, min(max_workers, len(competidores)))
+
+    print(f"--- INICIANDO BOT DE BENCHMARK ({max_workers} workers) ---")
+
+    # Plan: competidores más largos primero según la latencia histórica de sus rutas
+    latencias = LatenciasRutas(ruta_latencias)
+    competidores, makespan = planificar_ejecucion(competidores, latencias, max_workers)
+    print(f"📅 Makespan estimado: {makespan:.0f}s" + (f" (deadline {deadline_segundos:.0f}s)" if deadline_segundos else ""))
+    presupuesto = PresupuestoEjecucion(deadline_segundos, latencias) if deadline_segundos else None
     
+    # Salida columnar opcional: pyarrow se verifica antes de scrapear, no al final
+    if formato_columnar and not pyarrow_disponible():
+        print(f"⚠️ pyarrow no está instalado: se omite la salida {formato_columnar} (pip install pyarrow).")
+        formato_columnar = None
+
+    # Barrido de montos: cada ruta a todos los montos de MONTOS_ESCALONADOS_POR_MONEDA
+    montos_de = None
+    if escalonado:
+        from curvas import montos_escalonados
+        montos_de = montos_escalonados
+        # La cache guarda una cotización por ruta (monto por defecto): no aplica al barrido
+        usar_cache = False
+        print("📶 Modo escalonado: cada ruta se cotiza a varios montos (sin cache).")
+
+    # Cache persistente: las rutas vigentes no se vuelven a scrapear
+    cache = CacheCotizaciones(ruta_cache) if usar_cache else None
+    # Circuit breaker por competidor (estado persistido entre ejecuciones)
+    circuito = CircuitoCompetidores(ruta_circuitos) if ruta_circuitos else None
+    # Consentimiento de cookies por competidor: sin banners desde la segunda corrida
+    estado_navegador = EstadoNavegador(ruta_estado_navegador) if ruta_estado_navegador else None
+
+    # Sink en streaming: cada ruta queda en disco apenas se cotiza
+    nombre_base = f"Benchmark_Tasas_{datetime.date.today().isoformat()}"
+    sink = crear_sink(formato_sink, nombre_base)
+    print(f"📝 Resultados en streaming a: {sink.ruta_archivo}")
+
+    # Cada competidor con navegador recibe su propio driver del pool y corre en paralelo.
+    # Los drivers se crean al primer préstamo: sin competidores de navegador no se abre Chrome.
+    con_navegador = sum(1 for competidor, _ in competidores if requiere_navegador(competidor))
+    pool = PoolDrivers(crear_driver, max_drivers=max(1, min(max_workers, con_navegador)))
+    tiempos = []
     try:
-        df.to_excel(nombre_archivo, index=False)
-        print(f"\n✅ DATOS EXPORTADOS EXITOSAMENTE a: {nombre_archivo}")
-    except Exception as e:
-        print(f"\n🛑 ERROR al exportar a Excel: {e}")
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futuros = [
+                    executor.submit(procesar_competidor, competidor, rutas, pool, sink, cache, circuito, presupuesto, montos_de,
+                                    estado_navegador)
+                    for competidor, rutas in competidores
+                ]
+                for futuro in futuros:
+                    tiempos.extend(futuro.result())
+        finally:
+            pool.cerrar()
+            if cache:
+                cache.cerrar()
+            if circuito:
+                circuito.guardar()
+            if estado_navegador:
+                estado_navegador.guardar()
+            latencias.actualizar_desde_tiempos(tiempos)
+            latencias.guardar()
+            finalizar_http()
+
+        print("--- BENCHMARK FINALIZADO ---")
+        if cache:
+            print(f"💾 {cache.resumen()}")
+        if circuito:
+            print(f"🔌 {circuito.resumen()}")
+        if presupuesto:
+            print(f"⏳ {presupuesto.resumen()}")
+        resumir_tiempos(tiempos)
+        resumir_red(tiempos)
+        
+        # --- EXPORTAR A EXCEL (construido desde el sink) ---
+        # Hoja 1: tasas (mismo esquema de siempre). Hoja 2: tiempos por fase (y red por ruta: page_load).
+        import pandas as pd
+        df = ordenar_como_config(pd.DataFrame(list(sink.leer_filas()), columns=COLUMNAS_RESULTADO))
+
+        # --- HISTÓRICO: cada corrida se agrega a la misma base ---
+        if ruta_historico:
+            historico = HistoricoTasas(ruta_historico)
+            try:
+                agregadas = historico.agregar_ejecucion(df.to_dict('records'))
+                print(f"🗄️ {agregadas} filas agregadas al histórico ({ruta_historico})")
+            finally:
+                historico.cerrar()
+
+        # --- SALIDA COLUMNAR (Parquet/Arrow) para los análisis ---
+        if formato_columnar:
+            try:
+                ruta_columnar = escribir_columnar(df.to_dict('records'), nombre_base, formato_columnar)
+                print(f"🧱 Salida columnar: {ruta_columnar}")
+            except Exception as e:
+                print(f"🛑 ERROR al escribir la salida {formato_columnar}: {e}")
+
+        nombre_archivo = f"{nombre_base}.xlsx"
+        
+        try:
+            with pd.ExcelWriter(nombre_archivo) as writer:
+                df.to_excel(writer, sheet_name="Tasas", index=False)
+                pd.DataFrame(tiempos).to_excel(writer, sheet_name="Tiempos_Fases", index=False)
+                if escalonado:
+                    # Hoja 3: curva tasa/monto por ruta (comisión fija vs proporcional)
+                    from curvas import calcular_curvas
+                    calcular_curvas(df).to_excel(writer, sheet_name="Curvas", index=False)
+            print(f"\n✅ DATOS EXPORTADOS EXITOSAMENTE a: {nombre_archivo}")
+        except Exception as e:
+            print(f"\n🛑 ERROR al exportar a Excel: {e} (los datos siguen en {sink.ruta_archivo})")
+    finally:
+        sink.cerrar()
 
 
 if __name__ == "__main__":
-    ejecutar_benchmark_a_excel()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Benchmark de tasas de competidores.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Competidores en paralelo (un Chrome por worker). Por defecto: núcleos disponibles.")
+    parser.add_argument("--sin-cache", action="store_true",
+                        help="Ignora la cache de cotizaciones y scrapea todas las rutas.")
+    parser.add_argument("--cache-db", default="cache_cotizaciones.sqlite",
+                        help="Archivo SQLite de la cache de cotizaciones.")
+    parser.add_argument("--http-modo", choices=MODOS_HTTP, default="live",
+                        help="APIs: live (red real), record (graba respuestas) o replay (sin red, desde fixtures).")
+    parser.add_argument("--http-fixtures", default="fixtures/http_fixtures.json.gz",
+                        help="Archivo de fixtures HTTP para record/replay.")
+    parser.add_argument("--http-latencia", type=float, default=0.0,
+                        help="Replay: latencia fija inyectada por petición (segundos).")
+    parser.add_argument("--http-jitter", type=float, default=0.0,
+                        help="Replay: latencia extra (0..jitter) determinista por petición.")
+    parser.add_argument("--sink", choices=sorted(SINKS), default="csv",
+                        help="Formato del archivo que se escribe fila a fila durante la ejecución.")
+    parser.add_argument("--historico", default="historico_tasas.sqlite",
+                        help="Base SQLite del histórico al que se agrega cada ejecución.")
+    parser.add_argument("--sin-historico", action="store_true", help="No agregar esta ejecución al histórico.")
+    parser.add_argument("--estado-circuitos", default="estado_circuitos.json",
+                        help="JSON con el estado del circuit breaker de cada competidor.")
+    parser.add_argument("--sin-circuito", action="store_true",
+                        help="Desactiva el circuit breaker (se intentan todas las rutas).")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="Tiempo total de la corrida (segundos). Las rutas que no entran se reportan SKIPPED.")
+    parser.add_argument("--latencias", default="latencias_rutas.json",
+                        help="JSON con la latencia histórica por ruta (usada para planificar).")
+    parser.add_argument("--escalonado", action="store_true",
+                        help="Cotiza cada ruta a varios montos (MONTOS_ESCALONADOS_POR_MONEDA) y agrega la hoja 'Curvas'.")
+    parser.add_argument("--columnar", choices=sorted(FORMATOS_COLUMNARES), default=None,
+                        help="Escribe además las filas en Parquet o Arrow IPC (requiere pyarrow).")
+    parser.add_argument("--estado-navegador", default="estado_navegador.json",
+                        help="JSON con las cookies/localStorage de consentimiento por competidor.")
+    parser.add_argument("--sin-estado-navegador", action="store_true",
+                        help="No cargar ni guardar el consentimiento (los banners se cierran en cada ruta).")
+    parser.add_argument("--con-ventana", action="store_true",
+                        help="Chrome con ventana (por defecto headless, ver NAVEGADOR_HEADLESS).")
+    parser.add_argument("--sin-bloqueo", action="store_true",
+                        help="No bloquear imágenes, fuentes ni terceros (para comparar tráfico y tiempos).")
+    parser.add_argument("--plan", action="store_true",
+                        help="Solo mostrar el plan de rutas (navegaciones esperadas) de cada competidor y salir.")
+    args = parser.parse_args()
+
+    if args.plan:
+        imprimir_planes()
+    else:
+        configurar_http(args.http_modo, args.http_fixtures, args.http_latencia, args.http_jitter)
+        configurar_perfil(headless=NAVEGADOR_HEADLESS and not args.con_ventana, bloquear=not args.sin_bloqueo)
+        ejecutar_benchmark_a_excel(max_workers=args.workers, usar_cache=not args.sin_cache, ruta_cache=args.cache_db,
+                                   formato_sink=args.sink,
+                                   ruta_historico=None if args.sin_historico else args.historico,
+                                   ruta_circuitos=None if args.sin_circuito else args.estado_circuitos,
+                                   deadline_segundos=args.deadline, ruta_latencias=args.latencias,
+                                   escalonado=args.escalonado, formato_columnar=args.columnar,
+                                   ruta_estado_navegador=None if args.sin_estado_navegador else args.estado_navegador)
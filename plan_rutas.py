@@ -0,0 +1,61 @@
+from collections import namedtuple
+
+# Plan de ejecución de un competidor: rutas reordenadas para que cada cambio
+# de página u origen ocurra una sola vez y las rutas siguientes solo cambien
+# el destino. El costo se mide en navegaciones (cargas de página) y cambios de
+# origen esperados, antes (orden de data_config) y después del plan.
+PlanRutas = namedtuple("PlanRutas", [
+    "competidor", "rutas", "grupos",
+    "navegaciones", "cambios_origen", "navegaciones_config", "cambios_origen_config",
+])
+
+
+def costo_navegacion(claves, reutiliza_pagina):
+    """
+    (navegaciones, cambios_de_origen) esperados al recorrer las claves
+    (página, origen) en orden. Sin reutilización, cada ruta carga su página.
+    """
+    navegaciones = cambios_origen = 0
+    anterior = (None, None)
+    for pagina, origen in claves:
+        if not reutiliza_pagina or pagina != anterior[0]:
+            navegaciones += 1
+        if origen != anterior[1]:
+            cambios_origen += 1
+        anterior = (pagina, origen)
+    return navegaciones, cambios_origen
+
+
+def compilar_plan(competidor, scraper, rutas):
+    """
+    Agrupa las rutas por clave de navegación (scraper.clave_navegacion): los
+    grupos quedan en el orden en que aparece su primera ruta y, dentro de cada
+    grupo, las rutas conservan su orden (p. ej. el de prioridad del planificador).
+    Si el scraper no reutiliza la página, solo se agrupa por origen.
+    """
+    reutiliza = getattr(scraper, "REUTILIZA_PAGINA", False)
+    claves = {ruta: scraper.clave_navegacion(ruta) for ruta in rutas}
+
+    grupos = {}
+    for ruta in rutas:
+        pagina, origen = claves[ruta]
+        grupos.setdefault((pagina if reutiliza else None, origen), []).append(ruta)
+    ordenadas = [ruta for grupo in grupos.values() for ruta in grupo]
+
+    navegaciones, cambios_origen = costo_navegacion([claves[r] for r in ordenadas], reutiliza)
+    navegaciones_config, cambios_origen_config = costo_navegacion([claves[r] for r in rutas], reutiliza)
+    return PlanRutas(competidor, ordenadas, [(clave, grupo) for clave, grupo in grupos.items()],
+                     navegaciones, cambios_origen, navegaciones_config, cambios_origen_config)
+
+
+def describir_plan(plan):
+    """Texto imprimible del plan: un renglón por grupo y el costo esperado."""
+    lineas = [
+        f"📋 Plan {plan.competidor}: {len(plan.rutas)} rutas | "
+        f"navegaciones {plan.navegaciones_config} -> {plan.navegaciones} | "
+        f"cambios de origen {plan.cambios_origen_config} -> {plan.cambios_origen}"
+    ]
+    for (pagina, origen), grupo in plan.grupos:
+        lugar = f"{origen} @ {pagina}" if pagina else origen
+        lineas.append(f"    {lugar}: {', '.join(grupo)}")
+    return "\n".join(lineas)
@@ -0,0 +1,120 @@
+import heapq
+import json
+import os
+import threading
+import time
+from data_config import (LATENCIA_RUTA_DEFECTO_SEGUNDOS, ALFA_LATENCIA_EWMA, PRIORIDAD_POR_COMPETIDOR,
+                         RUTAS_PRIORITARIAS, PRIORIDAD_ALTA)
+
+# Rutas que no alcanzan a correr antes del deadline: Status 'SKIPPED' (no 'FALLO')
+STATUS_SKIPPED = "SKIPPED"
+MOTIVO_DEADLINE = "DEADLINE"
+
+
+def prioridad_de(competidor, ruta):
+    """Prioridad de una ruta (mayor = más importante). Ver PRIORIDAD_POR_COMPETIDOR en data_config."""
+    return PRIORIDAD_POR_COMPETIDOR.get(competidor, 1) + (1 if ruta in RUTAS_PRIORITARIAS else 0)
+
+
+class LatenciasRutas:
+    """
+    Latencia histórica por competidor/ruta (media móvil exponencial),
+    persistida en JSON entre ejecuciones. Alimenta el plan y el presupuesto.
+    """
+    def __init__(self, ruta_estado="latencias_rutas.json"):
+        self.ruta_estado = ruta_estado
+        self._lock = threading.Lock()
+        self._latencias = {}
+        if os.path.exists(ruta_estado):
+            try:
+                with open(ruta_estado, encoding="utf-8") as f:
+                    self._latencias = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Latencias ilegibles ({e}); se usan las de por defecto.")
+
+    def estimar(self, competidor, ruta):
+        with self._lock:
+            por_ruta = self._latencias.get(competidor, {})
+            if ruta in por_ruta:
+                return por_ruta[ruta]
+            # Ruta nueva: la media de las demás rutas del competidor, si hay
+            if por_ruta:
+                return sum(por_ruta.values()) / len(por_ruta)
+        return LATENCIA_RUTA_DEFECTO_SEGUNDOS
+
+    def registrar(self, competidor, ruta, segundos):
+        with self._lock:
+            por_ruta = self._latencias.setdefault(competidor, {})
+            previa = por_ruta.get(ruta)
+            nueva = segundos if previa is None else ALFA_LATENCIA_EWMA * segundos + (1 - ALFA_LATENCIA_EWMA) * previa
+            por_ruta[ruta] = round(nueva, 3)
+
+    def actualizar_desde_tiempos(self, tiempos):
+        """Toma las filas de la fase 'total' (una por ruta cotizada) del reporte de tiempos."""
+        for fila in tiempos:
+            if fila.get('Fase') == "total":
+                self.registrar(fila['Competidor'], fila['Ruta'], fila['Segundos'])
+
+    def guardar(self):
+        with self._lock:
+            carpeta = os.path.dirname(self.ruta_estado)
+            if carpeta:
+                os.makedirs(carpeta, exist_ok=True)
+            with open(self.ruta_estado, "w", encoding="utf-8") as f:
+                json.dump(self._latencias, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def planificar_ejecucion(competidores, latencias, max_workers):
+    """
+    Ordena la corrida para minimizar el makespan (regla LPT):
+    - rutas de cada competidor: las de mayor prioridad primero (si el tiempo
+      se acaba, lo que queda al final es lo prescindible);
+    - competidores: el más largo primero. El executor reparte en orden FIFO,
+      así que cada worker libre toma el competidor más largo pendiente.
+    Devuelve (competidores_ordenados, makespan_estimado_segundos).
+    """
+    plan = []
+    for competidor, rutas in competidores:
+        rutas = sorted(rutas, key=lambda r: -prioridad_de(competidor, r))
+        duracion = sum(latencias.estimar(competidor, r) for r in rutas)
+        plan.append((duracion, competidor, rutas))
+    plan.sort(key=lambda p: -p[0])
+
+    # Simulación de la asignación greedy: siempre al worker que se libera antes
+    cargas = [0.0] * max(1, max_workers)
+    for duracion, _, _ in plan:
+        heapq.heappush(cargas, heapq.heappop(cargas) + duracion)
+    return [(competidor, rutas) for _, competidor, rutas in plan], max(cargas)
+
+
+class PresupuestoEjecucion:
+    """
+    Deadline global de la corrida. Antes de cada ruta se pregunta si cabe:
+    las de prioridad baja se cortan si su latencia estimada ya no entra en
+    el tiempo restante; las de prioridad alta corren mientras quede tiempo.
+    """
+    def __init__(self, deadline_segundos, latencias):
+        self.deadline_segundos = deadline_segundos
+        self.latencias = latencias
+        self._inicio = time.perf_counter()
+        self._lock = threading.Lock()
+        self.saltadas = 0
+
+    def restante(self):
+        return self.deadline_segundos - (time.perf_counter() - self._inicio)
+
+    def admite(self, competidor, ruta):
+        restante = self.restante()
+        if prioridad_de(competidor, ruta) >= PRIORIDAD_ALTA:
+            cabe = restante > 0
+        else:
+            cabe = restante >= self.latencias.estimar(competidor, ruta)
+        if not cabe:
+            with self._lock:
+                self.saltadas += 1
+            print(f"  ⏭️ {competidor} {ruta}: no entra en el deadline ({restante:.0f}s restantes). SKIPPED.")
+        return cabe
+
+    def resumen(self):
+        return (f"Deadline {self.deadline_segundos:.0f}s: sobraron {max(0.0, self.restante()):.0f}s, "
+                f"{self.saltadas} rutas SKIPPED")
@@ -0,0 +1,104 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+# Marca en la cola de libres: se descartó un driver y hay cupo para crear otro
+_CUPO_LIBRE = object()
+
+
+class PoolDrivers:
+    """
+    Pool acotado de WebDrivers reutilizables entre hilos.
+    Los drivers se crean bajo demanda (hasta max_drivers) y se devuelven
+    al pool al terminar cada competidor, en lugar de abrir uno por tarea.
+    """
+    def __init__(self, fabrica_driver, max_drivers):
+        self.fabrica_driver = fabrica_driver
+        self.max_drivers = max(1, int(max_drivers))
+        self._libres = queue.Queue()
+        self._creados = []
+        self._reservados = 0
+        self._lock = threading.Lock()
+
+    def _obtener(self):
+        while True:
+            # 1. Reutilizar un driver libre si lo hay
+            try:
+                driver = self._libres.get_nowait()
+            except queue.Empty:
+                driver = _CUPO_LIBRE
+            if driver is not _CUPO_LIBRE:
+                return driver
+
+            # 2. Crear uno nuevo si aún no llegamos al tope
+            with self._lock:
+                puede_crear = self._reservados < self.max_drivers
+                if puede_crear:
+                    # Reservamos el cupo antes de crear (la creación es lenta)
+                    self._reservados += 1
+
+            if puede_crear:
+                try:
+                    driver = self.fabrica_driver()
+                except Exception:
+                    self._liberar_cupo()
+                    raise
+                with self._lock:
+                    self._creados.append(driver)
+                return driver
+
+            # 3. Pool lleno: esperar a que otro hilo libere un driver (o un cupo)
+            driver = self._libres.get()
+            if driver is not _CUPO_LIBRE:
+                return driver
+
+    def _liberar_cupo(self):
+        """Devuelve un cupo de creación y despierta a un hilo que esté esperando driver."""
+        with self._lock:
+            self._reservados -= 1
+        self._libres.put(_CUPO_LIBRE)
+
+    @staticmethod
+    def _sano(driver):
+        """Chrome sigue respondiendo (no se cayó ni quedó colgado a mitad de un competidor)."""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _liberar(self, driver):
+        if self._sano(driver):
+            self._libres.put(driver)
+            return
+        # Un driver roto no vuelve al pool: se cierra y su cupo queda para uno nuevo
+        print("⚠️ Driver sin respuesta: se descarta y se creará otro al próximo préstamo.")
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            if driver in self._creados:
+                self._creados.remove(driver)
+        self._liberar_cupo()
+
+    @contextmanager
+    def driver(self):
+        """Presta un driver del pool durante el bloque 'with'."""
+        driver = self._obtener()
+        try:
+            yield driver
+        finally:
+            self._liberar(driver)
+
+    def cerrar(self):
+        """Cierra todos los drivers creados por el pool."""
+        with self._lock:
+            drivers = self._creados
+            self._creados = []
+            self._reservados = 0
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
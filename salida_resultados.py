@@ -0,0 +1,220 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+
+# Esquema de las filas de resultados (mismo orden que el Excel)
+COLUMNAS_RESULTADO = [
+    'Fecha', 'Competidor', 'Ruta', 'Moneda_Origen', 'Monto_Cotizado',
+    'Tasa_Directa', 'Tasa_Inversa', 'Status', 'Derivada_De', 'Motivo',
+]
+COLUMNAS_NUMERICAS = ('Tasa_Directa', 'Tasa_Inversa')
+
+
+class SinkResultados:
+    """
+    Destino de resultados en streaming: cada fila se escribe (y se vuelca a
+    disco) apenas se produce, así un fallo a mitad de ejecución no pierde lo
+    ya cotizado. Es seguro usarlo desde varios hilos.
+    """
+    extension = ""
+
+    def __init__(self, ruta_archivo):
+        self.ruta_archivo = ruta_archivo
+        self._lock = threading.Lock()
+        self.filas_escritas = 0
+
+    def escribir(self, fila):
+        with self._lock:
+            self._escribir(fila)
+            self.filas_escritas += 1
+
+    def _escribir(self, fila):
+        raise NotImplementedError
+
+    def leer_filas(self):
+        """Itera las filas escritas (dicts con las COLUMNAS_RESULTADO)."""
+        raise NotImplementedError
+
+    def cerrar(self):
+        pass
+
+
+def _tipar(fila):
+    """Los formatos de texto devuelven strings: recuperamos las tasas como float."""
+    for columna in COLUMNAS_NUMERICAS:
+        if fila.get(columna) not in (None, ""):
+            fila[columna] = float(fila[columna])
+    return fila
+
+
+class SinkCSV(SinkResultados):
+    extension = "csv"
+
+    def __init__(self, ruta_archivo):
+        super().__init__(ruta_archivo)
+        self._archivo = open(ruta_archivo, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._archivo, fieldnames=COLUMNAS_RESULTADO, extrasaction="ignore")
+        self._writer.writeheader()
+        self._archivo.flush()
+
+    def _escribir(self, fila):
+        self._writer.writerow(fila)
+        self._archivo.flush()
+
+    def leer_filas(self):
+        with open(self.ruta_archivo, newline="", encoding="utf-8") as f:
+            for fila in csv.DictReader(f):
+                yield _tipar(fila)
+
+    def cerrar(self):
+        with self._lock:
+            if not self._archivo.closed:
+                self._archivo.close()
+
+
+class SinkNDJSON(SinkResultados):
+    extension = "ndjson"
+
+    def __init__(self, ruta_archivo):
+        super().__init__(ruta_archivo)
+        self._archivo = open(ruta_archivo, "w", encoding="utf-8")
+
+    def _escribir(self, fila):
+        self._archivo.write(json.dumps(fila, ensure_ascii=False) + "\n")
+        self._archivo.flush()
+
+    def leer_filas(self):
+        with open(self.ruta_archivo, encoding="utf-8") as f:
+            for linea in f:
+                if linea.strip():
+                    yield json.loads(linea)
+
+    def cerrar(self):
+        with self._lock:
+            if not self._archivo.closed:
+                self._archivo.close()
+
+
+class SinkSQLite(SinkResultados):
+    extension = "sqlite"
+
+    def __init__(self, ruta_archivo):
+        super().__init__(ruta_archivo)
+        self._conn = sqlite3.connect(ruta_archivo, check_same_thread=False)
+        columnas = ", ".join(f"{c} {'REAL' if c in COLUMNAS_NUMERICAS else 'TEXT'}" for c in COLUMNAS_RESULTADO)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS resultados ({columnas})")
+        self._conn.execute("DELETE FROM resultados")
+        self._conn.commit()
+
+    def _escribir(self, fila):
+        marcas = ", ".join("?" for _ in COLUMNAS_RESULTADO)
+        self._conn.execute(
+            f"INSERT INTO resultados VALUES ({marcas})",
+            [fila.get(c) if c in COLUMNAS_NUMERICAS else str(fila.get(c, "")) for c in COLUMNAS_RESULTADO],
+        )
+        self._conn.commit()
+
+    def leer_filas(self):
+        with self._lock:
+            cursor = self._conn.execute(f"SELECT {', '.join(COLUMNAS_RESULTADO)} FROM resultados")
+            filas = cursor.fetchall()
+        for valores in filas:
+            yield dict(zip(COLUMNAS_RESULTADO, valores))
+
+    def cerrar(self):
+        with self._lock:
+            self._conn.close()
+
+
+SINKS = {"csv": SinkCSV, "ndjson": SinkNDJSON, "sqlite": SinkSQLite}
+
+
+def crear_sink(formato, nombre_base):
+    """Crea el sink del formato pedido en '<nombre_base>.<extension>'."""
+    if formato not in SINKS:
+        raise ValueError(f"Formato de sink desconocido: {formato}. Opciones: {', '.join(SINKS)}")
+    clase = SINKS[formato]
+    ruta = f"{nombre_base}.{clase.extension}"
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    return clase(ruta)
+
+
+# --- Salida columnar (Parquet / Arrow IPC) para análisis ---
+# Mismo esquema que el Excel; las columnas de texto repetitivas van
+# codificadas como diccionario y las tasas como float64.
+FORMATOS_COLUMNARES = {"parquet": "parquet", "arrow": "arrow"}
+COLUMNAS_DICCIONARIO = ('Competidor', 'Ruta', 'Moneda_Origen', 'Monto_Cotizado', 'Status', 'Derivada_De', 'Motivo')
+
+
+def pyarrow_disponible():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def esquema_arrow():
+    """Esquema Arrow de COLUMNAS_RESULTADO (pyarrow se importa solo si se usa la salida columnar)."""
+    import pyarrow as pa
+    campos = []
+    for columna in COLUMNAS_RESULTADO:
+        if columna == 'Fecha':
+            tipo = pa.date32()
+        elif columna in COLUMNAS_NUMERICAS:
+            tipo = pa.float64()
+        elif columna in COLUMNAS_DICCIONARIO:
+            tipo = pa.dictionary(pa.int32(), pa.string())
+        else:
+            tipo = pa.string()
+        campos.append(pa.field(columna, tipo))
+    return pa.schema(campos)
+
+
+def _valor_columnar(columna, valor):
+    # Celdas vacías (o NaN de pandas) -> null
+    if valor is None or valor == "" or valor != valor:
+        return None
+    if columna == 'Fecha':
+        import datetime
+        return valor if isinstance(valor, datetime.date) else datetime.date.fromisoformat(str(valor)[:10])
+    if columna in COLUMNAS_NUMERICAS:
+        return float(valor)
+    return str(valor)
+
+
+def tabla_arrow(filas):
+    """Convierte filas (dicts con COLUMNAS_RESULTADO) en una pa.Table con esquema_arrow()."""
+    import pyarrow as pa
+    filas = list(filas)
+    esquema = esquema_arrow()
+    columnas = []
+    for campo in esquema:
+        valores = [_valor_columnar(campo.name, fila.get(campo.name)) for fila in filas]
+        if pa.types.is_dictionary(campo.type):
+            columnas.append(pa.array(valores, type=pa.string()).dictionary_encode())
+        else:
+            columnas.append(pa.array(valores, type=campo.type))
+    return pa.Table.from_arrays(columnas, schema=esquema)
+
+
+def escribir_columnar(filas, nombre_base, formato="parquet"):
+    """
+    Escribe las filas en '<nombre_base>.parquet' (o '.arrow', Arrow IPC/Feather v2).
+    Devuelve la ruta del archivo.
+    """
+    if formato not in FORMATOS_COLUMNARES:
+        raise ValueError(f"Formato columnar desconocido: {formato}. Opciones: {', '.join(FORMATOS_COLUMNARES)}")
+    tabla = tabla_arrow(filas)
+    ruta = f"{nombre_base}.{FORMATOS_COLUMNARES[formato]}"
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(tabla, ruta, compression="zstd", use_dictionary=list(COLUMNAS_DICCIONARIO))
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(tabla, ruta, compression="zstd")
+    return ruta
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from .base_scraper import BaseScraper, como_trabajo
+from .http_async import obtener_json, obtener_varios
+
+
+class ApiBaseScraper(BaseScraper):
+    """
+    Base para los scrapers que consultan una API JSON (no usan el driver).
+    Cada clase define cómo armar la petición y cómo leer la respuesta;
+    la base se encarga del transporte, bloqueante o concurrente (asyncio).
+    Peticiones idénticas (misma URL y params) se hacen una sola vez por ejecución.
+    """
+    def __init__(self, driver, competidor_nombre, url_base):
+        super().__init__(driver, competidor_nombre, url_base)
+        # Respuestas ya obtenidas en esta ejecución: clave de petición -> resultado
+        self._respuestas = {}
+
+    @staticmethod
+    def _clave_peticion(peticion):
+        params = peticion.get("params") or {}
+        return peticion["url"], tuple(sorted((k, str(v)) for k, v in params.items()))
+
+    def _preparar_peticion(self, ruta):
+        """
+        Debe devolver un dict con 'url', 'params', 'headers' y 'monto'.
+        Si la ruta no se puede cotizar, devolver solo {'monto': ...} (sin 'url').
+        """
+        raise NotImplementedError(
+            f"El método _preparar_peticion debe ser implementado en {self.nombre}Scraper."
+        )
+
+    def _interpretar_respuesta(self, ruta, peticion, status, data, texto):
+        """Debe devolver (tasa_directa: float, monto_cotizado: str)."""
+        raise NotImplementedError(
+            f"El método _interpretar_respuesta debe ser implementado en {self.nombre}Scraper."
+        )
+
+    def _peticion(self, ruta):
+        peticion = self._preparar_peticion(ruta)
+        if peticion.get("url"):
+            peticion["url"] = self._url(peticion["url"])
+        return peticion
+
+    def _procesar_resultado(self, ruta, peticion, resultado):
+        if isinstance(resultado, Exception):
+            print(f"    ❌ Excepción conectando a API ({ruta}): {resultado}")
+            return 0.0, peticion["monto"]
+        status, data, texto = resultado
+        try:
+            return self._interpretar_respuesta(ruta, peticion, status, data, texto)
+        except Exception as e:
+            print(f"    ❌ Excepción interpretando respuesta ({ruta}): {e}")
+            return 0.0, peticion["monto"]
+
+    def get_tasa_por_ruta(self, ruta):
+        print(f"  > Procesando {self.nombre} (API) para ruta {ruta}")
+
+        peticion = self._peticion(ruta)
+        if not peticion.get("url"):
+            return 0.0, peticion["monto"]
+
+        self._iniciar_fase("request")
+        clave = self._clave_peticion(peticion)
+        if clave not in self._respuestas:
+            try:
+                self._respuestas[clave] = obtener_json(peticion["url"], peticion.get("params"), peticion.get("headers"))
+            except Exception as e:
+                self._respuestas[clave] = e
+        self._iniciar_fase("extract")
+        return self._procesar_resultado(ruta, peticion, self._respuestas[clave])
+
+    def get_tasas(self, rutas):
+        """
+        Todo el lote en una pasada concurrente (cotizar_rutas_concurrente).
+        La latencia del lote se reparte por igual entre las rutas ('total').
+        """
+        trabajos = [como_trabajo(item) for item in rutas]
+        if not trabajos:
+            return
+        inicio = time.perf_counter()
+        resultados = self.cotizar_rutas_concurrente([ruta for ruta, _ in trabajos], [monto for _, monto in trabajos])
+        por_ruta = (time.perf_counter() - inicio) / len(trabajos)
+        for (ruta, _), (tasa_directa, monto_usado) in zip(trabajos, resultados):
+            self._registrar_tiempo(ruta, "total", por_ruta)
+            yield ruta, tasa_directa, monto_usado
+
+    def cotizar_rutas_concurrente(self, rutas, montos=None):
+        """
+        Cotiza todas las rutas a la vez sobre conexiones keep-alive.
+        montos: lista paralela a 'rutas' (None = monto por defecto); una ruta
+        puede repetirse con varios montos (barrido de montos).
+        Devuelve una lista de (tasa_directa, monto_cotizado) en el orden de 'rutas'.
+        """
+        print(f"  > Procesando {self.nombre} (API concurrente) para {len(rutas)} rutas")
+
+        peticiones = []
+        for ruta, monto in zip(rutas, montos or [None] * len(rutas)):
+            self._monto_forzado = monto
+            try:
+                peticiones.append(self._peticion(ruta))
+            finally:
+                self._monto_forzado = None
+
+        # Una sola petición por clave distinta que aún no tengamos
+        pendientes = {}
+        for peticion in peticiones:
+            if peticion.get("url"):
+                clave = self._clave_peticion(peticion)
+                if clave not in self._respuestas:
+                    pendientes.setdefault(clave, peticion)
+
+        if pendientes:
+            inicio = time.perf_counter()
+            respuestas = asyncio.run(obtener_varios(list(pendientes.values())))
+            self._respuestas.update(zip(pendientes.keys(), respuestas))
+            # El lote no es una ruta: su duración va al log, no a los tiempos por ruta
+            # (get_tasas la reparte entre las rutas en su fase 'total')
+            print(f"    -> {len(pendientes)} peticiones HTTP para {len(rutas)} rutas "
+                  f"({time.perf_counter() - inicio:.2f}s)")
+
+        resultados = []
+        for ruta, peticion in zip(rutas, peticiones):
+            if not peticion.get("url"):
+                resultados.append((0.0, peticion["monto"]))
+                continue
+            inicio = time.perf_counter()
+            resultado = self._respuestas[self._clave_peticion(peticion)]
+            resultados.append(self._procesar_resultado(ruta, peticion, resultado))
+            self._registrar_tiempo(ruta, "extract", time.perf_counter() - inicio)
+        return resultados
@@ -1,8 +1,7 @@
-import requests
-from .base_scraper import BaseScraper
+from .api_base import ApiBaseScraper
 from data_config import URLS_COMPETIDORES, MONTOS_POR_MONEDA
 
-class ArcadiApiScraper(BaseScraper):
+class ArcadiApiScraper(ApiBaseScraper):
     def __init__(self, driver):
         super().__init__(driver, "Arcadi", URLS_COMPETIDORES.get("Arcadi", ""))
         self.api_url = "https://www.arcadienvios.com/api/v2/exchange_rates"
@@ -20,9 +19,7 @@ class ArcadiApiScraper(BaseScraper):
             "EC": 3,   # Ecuador
         }
 
-    def get_tasa_por_ruta(self, ruta):
-        print(f"  > Procesando Arcadi (API) para ruta {ruta}")
-        
+    def _preparar_peticion(self, ruta):
         moneda_origen = ruta[:3]
         moneda_destino = ruta[3:]
         
@@ -32,14 +29,16 @@ class ArcadiApiScraper(BaseScraper):
         
         if not source_id or not dest_id:
             print(f"    ❌ Error: No hay ID de país para {moneda_origen} o {moneda_destino}")
-            return 0.0, "100"
+            return {"monto": "100"}
 
         monto_str = self._get_monto_a_cotizar(moneda_origen)
         
         # Parámetros de la URL
+        # Solo el país de origen: la respuesta trae todas las monedas destino
+        # ({'VES': [...], 'COP': [...], ...}), así que las rutas con el mismo
+        # origen comparten una única petición por ejecución.
         params = {
             "source_country_id": source_id,
-            "destination_country_id": dest_id
         }
         
         headers = {
@@ -47,38 +46,35 @@ class ArcadiApiScraper(BaseScraper):
             "Accept": "application/json"
         }
         
-        try:
-            response = requests.get(self.api_url, params=params, headers=headers, timeout=10)
-            
-            if response.status_code != 200:
-                print(f"    ❌ Error API {response.status_code}: {response.text}")
-                return 0.0, monto_str
-                
-            data = response.json()
-            
-            # Corrección basada en tus logs:
-            # La estructura es {'VES': [{'rate': '0.3545', ...}]}
-            
-            # Ajuste para moneda destino (ej: US -> USD)
-            target_key = moneda_destino
-            if target_key == "US":
-                target_key = "USD"
-            
-            tasa = 0.0
-            
-            # Buscamos la lista usando la clave de la moneda destino
-            if target_key in data and isinstance(data[target_key], list) and len(data[target_key]) > 0:
-                item = data[target_key][0] # Tomamos el primer elemento de la lista
-                if 'rate' in item:
-                    tasa = float(item['rate'])
-            
-            if tasa > 0:
-                print(f"    ✅ Tasa encontrada: {tasa}")
-                return tasa, monto_str
-            
-            print(f"    ⚠️ Estructura inesperada para {target_key}: {str(data)[:100]}...")
-            return 0.0, monto_str
+        return {"url": self.api_url, "params": params, "headers": headers, "monto": monto_str}
 
-        except Exception as e:
-            print(f"    ❌ Excepción: {e}")
-            return 0.0, monto_str
\ No newline at end of file
+    def _interpretar_respuesta(self, ruta, peticion, status, data, texto):
+        moneda_destino = ruta[3:]
+        monto_str = peticion["monto"]
+        
+        if status != 200:
+            print(f"    ❌ Error API {status}: {texto}")
+            return 0.0, monto_str
+            
+        # Corrección basada en tus logs:
+        # La estructura es {'VES': [{'rate': '0.3545', ...}]}
+        
+        # Ajuste para moneda destino (ej: US -> USD)
+        target_key = moneda_destino
+        if target_key == "US":
+            target_key = "USD"
+        
+        tasa = 0.0
+        
+        # Buscamos la lista usando la clave de la moneda destino
+        if isinstance(data, dict) and target_key in data and isinstance(data[target_key], list) and len(data[target_key]) > 0:
+            item = data[target_key][0] # Tomamos el primer elemento de la lista
+            if 'rate' in item:
+                tasa = float(item['rate'])
+        
+        if tasa > 0:
+            print(f"    ✅ Tasa encontrada ({ruta}): {tasa}")
+            return tasa, monto_str
+        
+        print(f"    ⚠️ Estructura inesperada para {target_key}: {str(data)[:100]}...")
+        return 0.0, monto_str
@@ -1,13 +1,66 @@
-from selenium import webdriver
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+import time
+import datetime
+from itertools import groupby
 from data_config import MONTOS_POR_MONEDA
+from estado_navegador import es_de_aceptacion
+from .captura_red import CapturaRed, buscar_tasa, es_del_destino
+
+# Reescritura de URLs (prefijo real -> prefijo alternativo). Vacío en producción;
+# el benchmark offline la usa para apuntar los scrapers a sitios falsos locales.
+REESCRITURA_URLS = {}
+
+def configurar_reescritura_urls(mapa):
+    """Reemplaza el mapa de reescritura de URLs (prefijo -> prefijo)."""
+    REESCRITURA_URLS.clear()
+    REESCRITURA_URLS.update(mapa)
+
+def como_trabajo(item):
+    """'EURARS' -> ('EURARS', None); un par (ruta, monto) queda igual."""
+    return (item, None) if isinstance(item, str) else tuple(item)
+
+# Script que cuenta los recursos de red cargados hasta ahora (Resource Timing API)
+JS_RECURSOS_CARGADOS = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+# Documento actual y su tiempo de carga (ms): domContentLoaded si 'load' aún no terminó (carga eager)
+JS_CARGA_PAGINA = (
+    "const n = performance.getEntriesByType('navigation')[0];"
+    "return [performance.timeOrigin, n ? (n.loadEventEnd || n.domContentLoadedEventEnd) : 0];"
+)
+
+# Selenium se importa dentro de los métodos que lo usan: los scrapers de API
+# heredan de BaseScraper y no deben pagar su importación.
 
 # Esta clase solo define la estructura y el manejo básico.
 class BaseScraper:
+    # Fragmentos de URL de la API de cotización que llama la página (captura CDP).
+    # Vacío = el scraper solo lee la tasa del DOM.
+    PATRONES_API_COTIZACION = ()
+
+    # True si el scraper puede cotizar (algunas rutas) con una petición HTTP simple, sin Chrome
+    PUEDE_SIN_NAVEGADOR = False
+    # True si rutas seguidas con la misma página la reutilizan (sin volver a navegar)
+    REUTILIZA_PAGINA = False
+
     def __init__(self, driver, competidor_nombre, url_base):
         self.driver = driver
         self.nombre = competidor_nombre
         self.url_base = url_base
+        # Tiempos por fase de cada ruta (filas para el reporte de tiempos)
+        self.tiempos = []
+        self._ruta_actual = None
+        self._fase_abierta = None
+        # Monto fijado por el orquestador (barrido de montos); None = MONTOS_POR_MONEDA
+        self._monto_forzado = None
+        self._captura = None
+        # Rutas cuya página resultó necesitar JS (no se reintenta por HTTP)
+        self._necesita_navegador = set()
+        # Sesión con estado: calculadora abierta y lo ya seleccionado en ella
+        self._sesion_url = None
+        self._sesion = {}
+        # Documento medido en la ruta anterior (si no cambió, la ruta no cargó página)
+        self._documento_medido = None
+        # Cookies de consentimiento cargadas en el driver (estado_navegador.py)
+        self.cookies_restauradas = set()
 
     # Este método debe ser implementado OBLIGATORIAMENTE en cada clase específica.
     def get_tasa_por_ruta(self, ruta):
@@ -19,6 +72,305 @@ class BaseScraper:
             f"El método get_tasa_por_ruta debe ser implementado en {self.nombre}Scraper."
         )
 
+    def cotizar(self, ruta, monto=None):
+        """
+        Envoltura de get_tasa_por_ruta que usa el orquestador: fija la ruta
+        actual para el registro de fases y mide el tiempo total de la ruta.
+        monto: cotiza ese monto en lugar del de MONTOS_POR_MONEDA (barrido de montos).
+        """
+        self._ruta_actual = ruta
+        self._fase_abierta = None
+        self._monto_forzado = monto
+        inicio = time.perf_counter()
+        try:
+            return self.get_tasa_por_ruta(ruta)
+        finally:
+            self._monto_forzado = None
+            self._cerrar_fase()
+            self._registrar_tiempo(ruta, "total", time.perf_counter() - inicio)
+            if self.driver is not None:
+                self._registrar_red(ruta)
+
+    def get_tasas(self, rutas):
+        """
+        Cotiza un lote y entrega (ruta, tasa_directa, monto_cotizado) a medida
+        que obtiene cada tasa, en el orden recibido. rutas: iterable de rutas
+        o de pares (ruta, monto). Se consume de a una ruta, así el orquestador
+        puede cortar (deadline, circuito) entre una y otra.
+        Por defecto, ruta tras ruta; con REUTILIZA_PAGINA, un lote por origen
+        (cotizar_destinos). Las subclases pueden redefinirlo (ver ApiBaseScraper).
+        """
+        trabajos = map(como_trabajo, rutas)
+        if self.REUTILIZA_PAGINA:
+            for _, grupo in groupby(trabajos, key=lambda trabajo: trabajo[0][:3]):
+                yield from self.cotizar_destinos(grupo)
+        else:
+            for ruta, monto in trabajos:
+                yield (ruta, *self.cotizar(ruta, monto))
+
+    def cotizar_destinos(self, rutas, monto=None):
+        """
+        Lote de rutas de un mismo origen sobre una sola página (scrapers con
+        REUTILIZA_PAGINA): la página se carga y el monto se escribe una vez;
+        cada ruta siguiente solo cambia el destino.
+        rutas: rutas o pares (ruta, monto); monto aplica a las que no traen uno.
+        Entrega (ruta, tasa_directa, monto_cotizado) apenas se lee cada tasa.
+        """
+        origen = None
+        for ruta, monto_ruta in map(como_trabajo, rutas):
+            origen = origen or ruta[:3]
+            if ruta[:3] != origen:
+                raise ValueError(f"cotizar_destinos espera un solo origen en {self.nombre}: {origen} y {ruta[:3]}")
+            yield (ruta, *self.cotizar(ruta, monto_ruta or monto))
+
+    def get_tasa_sin_navegador(self, ruta):
+        """
+        Intento sin navegador (solo scrapers con PUEDE_SIN_NAVEGADOR).
+        Devuelve (tasa_directa, monto_cotizado) o None si la ruta necesita Chrome.
+        """
+        return None
+
+    def cotizar_sin_navegador(self, ruta, monto=None):
+        """Como cotizar(), pero solo por HTTP. Devuelve None si la ruta necesita Chrome."""
+        if not self.PUEDE_SIN_NAVEGADOR or ruta in self._necesita_navegador:
+            return None
+        self._ruta_actual = ruta
+        self._fase_abierta = None
+        self._monto_forzado = monto
+        inicio = time.perf_counter()
+        try:
+            resultado = self.get_tasa_sin_navegador(ruta)
+        finally:
+            self._monto_forzado = None
+            self._cerrar_fase()
+        if resultado is None:
+            self._necesita_navegador.add(ruta)
+        else:
+            self._registrar_tiempo(ruta, "total", time.perf_counter() - inicio)
+        return resultado
+
+    # --- SESIÓN CON ESTADO (calculadoras de una sola página) ---
+
+    def _abrir_sesion(self, url, locator_clave):
+        """
+        Carga la calculadora solo si no está abierta o luce rota (falta el
+        elemento clave). Devuelve True si hubo que (re)cargarla; en ese caso
+        se olvida lo seleccionado antes (self._sesion).
+        """
+        from selenium.common.exceptions import WebDriverException
+        if self._sesion_url == url:
+            try:
+                if self.driver.find_elements(*locator_clave):
+                    return False
+            except WebDriverException:
+                pass
+            print("    🔄 La calculadora no está como se esperaba. Recargando...")
+        self.driver.get(self._url(url))
+        self._sesion_url = url
+        self._sesion = {}
+        return True
+
+    def _consentimiento_vigente(self):
+        """
+        True si el consentimiento de cookies se restauró del estado persistido
+        y su marcador de aceptación (p. ej. OptanonAlertBoxClosed) sigue en el
+        navegador: el banner no aparece y no hace falta buscarlo.
+        """
+        if not any(es_de_aceptacion(nombre) for nombre in self.cookies_restauradas):
+            return False
+        try:
+            return any(c["name"] in self.cookies_restauradas and es_de_aceptacion(c["name"])
+                       for c in self.driver.get_cookies())
+        except Exception:
+            return False
+
+    def _invalidar_sesion(self):
+        """Fuerza la recarga en la próxima ruta (tras un fallo la página puede haber quedado a medias)."""
+        self._sesion_url = None
+        self._sesion = {}
+
+    def clave_navegacion(self, ruta):
+        """
+        (página, origen) en la que se cotiza la ruta, para plan_rutas: las rutas
+        con la misma clave se ejecutan seguidas y solo cambian el destino.
+        """
+        return self.url_base, ruta[:3]
+
+    # --- TIEMPOS POR FASE ---
+
+    def _registrar_tiempo(self, ruta, fase, segundos):
+        self.tiempos.append({
+            'Fecha': datetime.date.today().isoformat(),
+            'Competidor': self.nombre,
+            'Ruta': ruta,
+            'Fase': fase,
+            'Segundos': round(segundos, 4),
+        })
+
+    def _registrar_red(self, ruta):
+        """
+        Fila 'page_load' de la ruta: segundos de carga del documento (vacío si
+        la ruta reutilizó la página anterior), bytes recibidos y peticiones
+        terminadas o bloqueadas según el log de red.
+        """
+        from selenium.common.exceptions import WebDriverException
+        bytes_recibidos, peticiones, bloqueadas = self._captura_red().tomar_contadores()
+        try:
+            documento, carga_ms = self.driver.execute_script(JS_CARGA_PAGINA)
+        except WebDriverException:
+            documento, carga_ms = None, 0
+        nueva = documento is not None and documento != self._documento_medido
+        self._documento_medido = documento
+        self.tiempos.append({
+            'Fecha': datetime.date.today().isoformat(),
+            'Competidor': self.nombre,
+            'Ruta': ruta,
+            'Fase': "page_load",
+            'Segundos': round(carga_ms / 1000, 4) if nueva and carga_ms else None,
+            'Bytes': bytes_recibidos,
+            'Peticiones': peticiones,
+            'Bloqueadas': bloqueadas,
+        })
+
+    def _iniciar_fase(self, fase):
+        """
+        Marca el inicio de una fase (navigate, consent, select_origin,
+        select_destination, input_amount, calculate, extract...).
+        La fase anterior queda cerrada en este instante.
+        """
+        self._cerrar_fase()
+        self._fase_abierta = (fase, time.perf_counter())
+
+    def _cerrar_fase(self):
+        if self._fase_abierta is None:
+            return
+        fase, inicio = self._fase_abierta
+        self._fase_abierta = None
+        self._registrar_tiempo(self._ruta_actual, fase, time.perf_counter() - inicio)
+
+    def _url(self, url):
+        """Aplica REESCRITURA_URLS a una URL antes de navegar o pedirla."""
+        for prefijo, reemplazo in REESCRITURA_URLS.items():
+            if url.startswith(prefijo):
+                return reemplazo + url[len(prefijo):]
+        return url
+
     def _get_monto_a_cotizar(self, moneda_origen):
-        """Función auxiliar para obtener el monto basado en la moneda."""
-        return MONTOS_POR_MONEDA.get(moneda_origen, "100")
\ No newline at end of file
+        """Función auxiliar para obtener el monto basado en la moneda (o el fijado por cotizar())."""
+        if self._monto_forzado is not None:
+            return str(self._monto_forzado)
+        return MONTOS_POR_MONEDA.get(moneda_origen, "100")
+
+    # --- ESPERAS POR EVENTO (reemplazan los time.sleep fijos) ---
+
+    def _esperar_presencia(self, locator, timeout=10, visible=False):
+        """
+        Espera a que el elemento exista (o sea visible) y lo devuelve.
+        Devuelve None si se alcanza el tope 'timeout' sin encontrarlo.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        condicion = EC.visibility_of_element_located if visible else EC.presence_of_element_located
+        try:
+            return WebDriverWait(self.driver, timeout).until(condicion(locator))
+        except TimeoutException:
+            return None
+
+    def _esperar_cambio_valor(self, locator, valor_previo, timeout=10, atributo="value"):
+        """
+        Espera a que el 'value' (o el texto, con atributo=None) del elemento
+        sea no vacío y distinto de 'valor_previo'. Devuelve el valor nuevo o None.
+        'locator' puede ser una tupla (By, selector) o un WebElement ya encontrado.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
+        def _valor_nuevo(driver):
+            return self._leer_valor_nuevo(locator, valor_previo, atributo) or False
+
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(_valor_nuevo)
+        except TimeoutException:
+            return None
+
+    def _leer_valor_nuevo(self, locator, valor_previo, atributo="value"):
+        from selenium.common.exceptions import NoSuchElementException, WebDriverException
+        try:
+            el = self.driver.find_element(*locator) if isinstance(locator, tuple) else locator
+            valor = el.text if atributo is None else el.get_attribute(atributo)
+        except (NoSuchElementException, WebDriverException):
+            return None
+        if valor and valor.strip() and valor != valor_previo:
+            return valor
+        return None
+
+    # --- CAPTURA DE LA API DE COTIZACIÓN (CDP) ---
+
+    def _captura_red(self):
+        if self._captura is None:
+            self._captura = CapturaRed(self.driver, self.PATRONES_API_COTIZACION)
+        return self._captura
+
+    def _preparar_captura(self):
+        """Llamar justo antes de la acción que dispara la cotización (escribir el monto)."""
+        self._captura_red().descartar()
+
+    def _tasa_de_respuestas(self, moneda_destino):
+        for url, data in self._captura_red().respuestas_nuevas():
+            # La respuesta debe ser de este destino (evita leer otra cotización de la página)
+            if not es_del_destino(url, data, moneda_destino):
+                continue
+            tasa = buscar_tasa(data)
+            if tasa > 0:
+                print(f"    📡 Tasa leída de la API de la página: {tasa}")
+                return tasa
+        return 0.0
+
+    def _esperar_cotizacion(self, moneda_destino, locator, valor_previo, timeout=10, atributo="value"):
+        """
+        Espera lo primero que llegue: la respuesta JSON de la API de cotización
+        (capturada del log de red) o el cambio de valor en el DOM.
+        Devuelve (tasa, cambio): tasa del JSON, o 0.0 si no hubo JSON útil (el
+        scraper extrae entonces la tasa de la página); cambio es False si se
+        agotó el timeout sin cotización nueva: el DOM sigue mostrando el valor
+        previo (de otra ruta o monto) y no debe leerse.
+        """
+        captura = self._captura_red()
+        limite = time.monotonic() + timeout
+        while time.monotonic() < limite:
+            if captura.activa:
+                tasa = self._tasa_de_respuestas(moneda_destino)
+                if tasa > 0:
+                    return tasa, True
+            if self._leer_valor_nuevo(locator, valor_previo, atributo):
+                # El DOM ya cambió: última mirada al log por si la respuesta llegó a la vez
+                return (self._tasa_de_respuestas(moneda_destino) if captura.activa else 0.0), True
+            time.sleep(0.1)
+        return 0.0, False
+
+    def _esperar_red_inactiva(self, timeout=10, silencio=0.5):
+        """
+        Espera a que el documento esté cargado y no aparezcan recursos de red
+        nuevos durante 'silencio' segundos. Devuelve True si se logró antes del tope.
+        """
+        from selenium.common.exceptions import WebDriverException
+        limite = time.monotonic() + timeout
+        ultimo_total = -1
+        ultimo_cambio = time.monotonic()
+
+        while time.monotonic() < limite:
+            try:
+                estado, total = self.driver.execute_script(JS_RECURSOS_CARGADOS)
+            except WebDriverException:
+                estado, total = "loading", ultimo_total
+
+            ahora = time.monotonic()
+            if total != ultimo_total or estado != "complete":
+                ultimo_total = total
+                ultimo_cambio = ahora
+            elif ahora - ultimo_cambio >= silencio:
+                return True
+            time.sleep(0.1)
+
+        return False
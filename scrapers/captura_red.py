@@ -0,0 +1,189 @@
+import base64
+import json
+from collections import deque
+from urllib.parse import parse_qsl, urlsplit
+
+# Claves con las que las APIs de cotización suelen devolver la tasa, por prioridad
+CLAVES_TASA = ("exchangeRate", "exchange_rate", "fxRate", "fx_rate", "conversionRate", "rate", "tasa")
+
+# Campos (o parámetros de la URL) que dicen a qué destino corresponde la cotización
+CLAVES_DESTINO = (
+    "receiveCurrency", "receive_currency", "destinationCurrency", "destination_currency",
+    "toCurrency", "to_currency", "currencyTo", "targetCurrency", "payoutCurrency", "to",
+    "receiveCountry", "receive_country", "destinationCountry", "destination_country",
+    "toCountry", "to_country", "countryTo",
+)
+
+# Códigos de país (ISO 2 y 3) que identifican a cada moneda de destino
+PAISES_POR_MONEDA = {
+    "USD": ("US", "USA"), "COP": ("CO", "COL"), "ARS": ("AR", "ARG"), "PEN": ("PE", "PER"),
+    "CLP": ("CL", "CHL"), "MXN": ("MX", "MEX"), "BRL": ("BR", "BRA"), "VES": ("VE", "VEN"),
+    "BOB": ("BO", "BOL"), "UYU": ("UY", "URY"), "PYG": ("PY", "PRY"), "DOP": ("DO", "DOM"),
+}
+
+
+def habilitar_captura_red(options):
+    """
+    Activa el log de rendimiento de Chrome (eventos Network.* del CDP) en las
+    opciones del driver. Sin esto CapturaRed queda inactiva y los scrapers
+    siguen leyendo la tasa del DOM.
+    """
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def buscar_tasa(data, claves=CLAVES_TASA):
+    """
+    Busca la tasa en un JSON de cotización (recorrido en anchura: gana el
+    nivel más cercano a la raíz). Prueba las claves en orden de prioridad.
+    Devuelve 0.0 si no encuentra un número positivo.
+    """
+    for clave in claves:
+        valor = _buscar_clave(data, clave.lower())
+        if valor > 0:
+            return valor
+    return 0.0
+
+
+def _buscar_clave(data, clave):
+    pendientes = deque([data])
+    while pendientes:
+        nodo = pendientes.popleft()
+        if isinstance(nodo, dict):
+            for k, v in nodo.items():
+                if str(k).lower() == clave and not isinstance(v, (dict, list, bool)):
+                    try:
+                        numero = float(v)
+                    except (TypeError, ValueError):
+                        continue
+                    if numero > 0:
+                        return numero
+            pendientes.extend(v for v in nodo.values() if isinstance(v, (dict, list)))
+        elif isinstance(nodo, list):
+            pendientes.extend(v for v in nodo if isinstance(v, (dict, list)))
+    return 0.0
+
+
+def es_del_destino(url, data, moneda_destino):
+    """
+    True si la respuesta es la cotización de moneda_destino: lo dicen sus
+    campos de destino (moneda o país, CLAVES_DESTINO) o, si el JSON no trae
+    ninguno, los parámetros de destino de la URL. Todos los valores hallados
+    deben coincidir; sin ningún campo de destino la respuesta no se usa.
+    """
+    moneda = "USD" if moneda_destino == "US" else moneda_destino.upper()
+    aceptados = {moneda, *PAISES_POR_MONEDA.get(moneda, ())}
+    claves = {clave.lower() for clave in CLAVES_DESTINO}
+    valores = _valores_de_claves(data, claves)
+    if not valores:
+        valores = {v.strip().upper() for k, v in parse_qsl(urlsplit(url).query) if k.lower() in claves and v.strip()}
+    return bool(valores) and valores <= aceptados
+
+
+def _valores_de_claves(data, claves):
+    """Valores de texto (en mayúsculas) de las claves dadas, en cualquier nivel del JSON."""
+    valores = set()
+    pendientes = deque([data])
+    while pendientes:
+        nodo = pendientes.popleft()
+        if isinstance(nodo, dict):
+            for k, v in nodo.items():
+                if str(k).lower() in claves and isinstance(v, str) and v.strip():
+                    valores.add(v.strip().upper())
+            pendientes.extend(v for v in nodo.values() if isinstance(v, (dict, list)))
+        elif isinstance(nodo, list):
+            pendientes.extend(v for v in nodo if isinstance(v, (dict, list)))
+    return valores
+
+
+class CapturaRed:
+    """
+    Lee del log de rendimiento del driver las respuestas JSON de la API de
+    cotización que llama la propia página (XHR/fetch) y devuelve su cuerpo
+    vía Network.getResponseBody. 'patrones' son fragmentos de la URL de esa API.
+    """
+    def __init__(self, driver, patrones):
+        self.driver = driver
+        self.patrones = tuple(patrones)
+        # requestId -> url de respuestas que coinciden y aún no terminan de cargar
+        self._pendientes = {}
+        self.activa = bool(self.patrones)
+        # Tráfico visto en el log desde la última llamada a tomar_contadores()
+        self.log_disponible = True
+        self.bytes_recibidos = 0
+        self.peticiones = 0
+        self.bloqueadas = 0
+
+    def _leer_log(self):
+        """Mensajes CDP nuevos del log; de paso suma bytes y peticiones terminadas o bloqueadas."""
+        if not self.log_disponible:
+            return []
+        try:
+            entradas = self.driver.get_log("performance")
+        except Exception:
+            # Driver sin log de rendimiento (o no Chrome): la captura queda apagada
+            self.activa = False
+            self.log_disponible = False
+            return []
+        mensajes = []
+        for entrada in entradas:
+            try:
+                mensaje = json.loads(entrada["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            metodo = mensaje.get("method")
+            params = mensaje.get("params", {})
+            if metodo == "Network.loadingFinished":
+                self.peticiones += 1
+                self.bytes_recibidos += int(params.get("encodedDataLength") or 0)
+            elif metodo == "Network.loadingFailed" and params.get("blockedReason"):
+                self.bloqueadas += 1
+            mensajes.append(mensaje)
+        return mensajes
+
+    def descartar(self):
+        """Vacía el log acumulado: lo anterior (otra ruta, otro monto) no es la cotización que esperamos."""
+        self._leer_log()
+        self._pendientes.clear()
+
+    def tomar_contadores(self):
+        """(bytes_recibidos, peticiones, bloqueadas) desde la última llamada; los contadores vuelven a cero."""
+        self._leer_log()
+        contadores = (self.bytes_recibidos, self.peticiones, self.bloqueadas)
+        self.bytes_recibidos = self.peticiones = self.bloqueadas = 0
+        return contadores
+
+    def respuestas_nuevas(self):
+        """Lista de (url, json) de las respuestas de la API completadas desde la última lectura."""
+        if not self.activa:
+            return []
+        respuestas = []
+        for mensaje in self._leer_log():
+            metodo = mensaje.get("method")
+            params = mensaje.get("params", {})
+
+            if metodo == "Network.responseReceived":
+                response = params.get("response", {})
+                url = response.get("url", "")
+                if "json" in response.get("mimeType", "") and any(p in url for p in self.patrones):
+                    self._pendientes[params.get("requestId")] = url
+            elif metodo == "Network.loadingFinished" and params.get("requestId") in self._pendientes:
+                url = self._pendientes.pop(params["requestId"])
+                data = self._cuerpo_json(params["requestId"])
+                if data is not None:
+                    respuestas.append((url, data))
+        return respuestas
+
+    def _cuerpo_json(self, request_id):
+        from selenium.common.exceptions import WebDriverException
+        try:
+            resultado = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except WebDriverException:
+            return None
+        cuerpo = resultado.get("body", "")
+        if resultado.get("base64Encoded"):
+            cuerpo = base64.b64decode(cuerpo).decode("utf-8", "replace")
+        try:
+            return json.loads(cuerpo)
+        except ValueError:
+            return None
@@ -1,13 +1,21 @@
 from .base_scraper import BaseScraper
+from .html_texto import obtener_texto_pagina
+from .numeros import parsear_numero, buscar_numero, PATRON_PRIMER_NUMERO
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import re
-import time
 from data_config import URLS_COMPETIDORES
 
+# "Tasa: 366,01" (compilado una vez)
+PATRON_TASA = re.compile(r'Tasa\s*:?\s*([\d\.,]+)', re.IGNORECASE)
+
 class CuriaraScraper(BaseScraper):
+    PUEDE_SIN_NAVEGADOR = True
+    # Web en español: 1.234,56
+    LOCALE_NUMEROS = "es-ES"
+
     def __init__(self, driver):
         super().__init__(driver, "Curiara", URLS_COMPETIDORES.get("Curiara", "https://curiara.com/"))
         
@@ -19,6 +27,8 @@ class CuriaraScraper(BaseScraper):
 
     def _cerrar_cookies(self):
         """Busca y cierra el banner de consentimiento de cookies."""
+        if self._consentimiento_vigente():
+            return
         print("    -> Buscando banner de cookies...")
         try:
             # Lista de posibles XPaths para el botón de Aceptar
@@ -45,12 +55,36 @@ class CuriaraScraper(BaseScraper):
                                     el.click()
                                 except:
                                     self.driver.execute_script("arguments[0].click();", el)
-                                time.sleep(1.5) # Esperar a que desaparezca el modal
+                                # Esperar a que desaparezca el modal
+                                try: WebDriverWait(self.driver, 1.5).until(EC.invisibility_of_element(el))
+                                except: pass
                                 return
                 except: pass
         except Exception as e:
             print(f"      ⚠️ Error intentando cerrar cookies: {e}")
 
+    def _extraer_tasa_texto(self, body_text):
+        """Patrones comunes en Curiara: "Tasa: 366.01", "1 EUR = 366.01 VES". Devuelve 0.0 si no hay tasa."""
+        return buscar_numero(body_text, self.LOCALE_NUMEROS, PATRON_TASA)
+
+    def get_tasa_sin_navegador(self, ruta):
+        """Si la tasa viene en el HTML estático, un GET basta (sin Chrome ni cookies)."""
+        url = self.rutas_urls.get(ruta)
+        if not url:
+            return None
+        self._iniciar_fase("http")
+        body_text = obtener_texto_pagina(self._url(url))
+        self._iniciar_fase("extract")
+        try:
+            tasa_final = self._extraer_tasa_texto(body_text) if body_text else 0.0
+        except ValueError:
+            tasa_final = 0.0
+        if tasa_final > 0:
+            print(f"    ✅ Tasa encontrada por HTTP: {tasa_final}")
+            return tasa_final, self._get_monto_a_cotizar(ruta[:3])
+        print(f"    -> {ruta}: la tasa no está en el HTML, se usará el navegador.")
+        return None
+
     def get_tasa_por_ruta(self, ruta):
         print(f"  > Procesando {self.nombre} para ruta {ruta}")
         
@@ -60,14 +94,21 @@ class CuriaraScraper(BaseScraper):
             return 0.0, "100"
             
         monto_a_cotizar = self._get_monto_a_cotizar(ruta[:3])
+
+        # El intento por HTTP ya lo hizo el orquestador (cotizar_sin_navegador): aquí solo Chrome
+        if self.driver is None:
+            return 0.0, monto_a_cotizar
         
         try:
-            self.driver.get(url)
-            time.sleep(5) # Espera carga inicial
+            self._iniciar_fase("navigate")
+            self.driver.get(self._url(url))
+            self._esperar_red_inactiva(timeout=5) # Espera carga inicial
 
+            self._iniciar_fase("consent")
             # 1. INTENTO DE CIERRE DE COOKIES
             self._cerrar_cookies()
 
+            self._iniciar_fase("extract")
             # 2. EXTRACCIÓN DE TASA
             tasa_final = 0.0
             
@@ -76,19 +117,8 @@ class CuriaraScraper(BaseScraper):
             try:
                 # Obtenemos todo el texto de la página y buscamos el patrón
                 body_text = self.driver.find_element(By.TAG_NAME, "body").text
-                
-                # Patrones comunes en Curiara: "Tasa: 366.01", "1 EUR = 366.01 VES"
-                match = re.search(r'Tasa\s*:?\s*([\d\.,]+)', body_text, re.IGNORECASE)
-                
-                if match:
-                    val_str = match.group(1)
-                    # Normalización (si hay punto y coma, quitar punto de miles)
-                    if ',' in val_str and '.' in val_str:
-                        val_str = val_str.replace('.', '').replace(',', '.')
-                    elif ',' in val_str:
-                        val_str = val_str.replace(',', '.')
-                    
-                    tasa_final = float(val_str)
+                tasa_final = self._extraer_tasa_texto(body_text)
+                if tasa_final > 0:
                     print(f"    ✅ Tasa encontrada en texto: {tasa_final}")
 
             except Exception as e:
@@ -102,13 +132,11 @@ class CuriaraScraper(BaseScraper):
                     for el in elementos:
                         if el.is_displayed():
                             txt = el.text
-                            m = re.search(r'([\d\.,]+)', txt)
-                            if m:
-                                val = float(m.group(1).replace(',', '.'))
-                                if val > 0:
-                                    tasa_final = val
-                                    print(f"    ✅ Tasa encontrada por elemento: {tasa_final}")
-                                    break
+                            val = buscar_numero(txt, self.LOCALE_NUMEROS, PATRON_PRIMER_NUMERO)
+                            if val > 0:
+                                tasa_final = val
+                                print(f"    ✅ Tasa encontrada por elemento: {tasa_final}")
+                                break
                 except: pass
 
             if tasa_final > 0:
@@ -127,15 +155,15 @@ class CuriaraScraper(BaseScraper):
                 if len(visibles) >= 2:
                     # Asumimos 1ro: Envío, 2do: Recepción
                     input_envio = visibles[0]
+                    previo = visibles[1].get_attribute("value")
                     input_envio.clear()
                     input_envio.send_keys(monto_a_cotizar)
                     input_envio.send_keys(Keys.TAB)
-                    time.sleep(2)
                     
-                    val_recibo = visibles[1].get_attribute("value")
+                    # Esperar a que la calculadora actualice el monto recibido
+                    val_recibo = self._esperar_cambio_valor(visibles[1], previo, timeout=2) or visibles[1].get_attribute("value")
                     if val_recibo:
-                        clean_val = re.sub(r'[^\d\.,]', '', val_recibo).replace('.','').replace(',','.')
-                        num_recibo = float(clean_val)
+                        num_recibo = parsear_numero(val_recibo, self.LOCALE_NUMEROS)
                         num_envio = float(monto_a_cotizar)
                         if num_recibo > 0:
                             tasa_final = num_recibo / num_envio
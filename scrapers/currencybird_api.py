@@ -1,8 +1,7 @@
-import requests
-from .base_scraper import BaseScraper
+from .api_base import ApiBaseScraper
 from data_config import URLS_COMPETIDORES
 
-class CurrencyBirdApiScraper(BaseScraper):
+class CurrencyBirdApiScraper(ApiBaseScraper):
     def __init__(self, driver):
         # El driver no se usa en API, pero se mantiene por compatibilidad
         super().__init__(driver, "CurrencyBird", "https://www.currencybird.cl/")
@@ -23,16 +22,14 @@ class CurrencyBirdApiScraper(BaseScraper):
             "MXN": "MX"
         }
 
-    def get_tasa_por_ruta(self, ruta):
-        print(f"  > Procesando {self.nombre} (API) para ruta {ruta}")
-        
+    def _preparar_peticion(self, ruta):
         moneda_origen = ruta[:3]
         moneda_destino = ruta[3:]
         
         # CurrencyBird solo opera desde Chile (CLP)
         if moneda_origen != "CLP":
             print("    ⛔ CurrencyBird solo permite origen CLP.")
-            return 0.0, "0"
+            return {"monto": "0"}
 
         # Obtener códigos de país
         pais_origen = self.country_codes.get(moneda_origen)
@@ -40,7 +37,7 @@ class CurrencyBirdApiScraper(BaseScraper):
         
         if not pais_origen or not pais_destino:
             print(f"    ⚠️ No hay código de país mapeado para {moneda_origen} o {moneda_destino}")
-            return 0.0, "0"
+            return {"monto": "0"}
 
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
         
@@ -59,34 +56,30 @@ class CurrencyBirdApiScraper(BaseScraper):
             "Accept": "application/json"
         }
         
-        try:
-            response = requests.get(self.api_url, params=params, headers=headers, timeout=10)
-            
-            if response.status_code != 200:
-                print(f"    ❌ API Error {response.status_code}: {response.text}")
-                return 0.0, monto_a_cotizar
-            
-            data = response.json()
-            
-            # La API devuelve "value" (lo que recibe) y "originValue" (lo que envías)
-            # Ejemplo: {"value": 154575.13, "originValue": 100000, ...}
+        return {"url": self.api_url, "params": params, "headers": headers, "monto": monto_a_cotizar}
+
+    def _interpretar_respuesta(self, ruta, peticion, status, data, texto):
+        monto_a_cotizar = peticion["monto"]
+        
+        if status != 200:
+            print(f"    ❌ API Error {status}: {texto}")
+            return 0.0, monto_a_cotizar
+        
+        # La API devuelve "value" (lo que recibe) y "originValue" (lo que envías)
+        # Ejemplo: {"value": 154575.13, "originValue": 100000, ...}
+        
+        if isinstance(data, dict) and "value" in data and data["value"] is not None:
+            valor_recibido = float(data["value"])
+            monto_enviado = float(monto_a_cotizar)
             
-            if "value" in data and data["value"] is not None:
-                valor_recibido = float(data["value"])
-                monto_enviado = float(monto_a_cotizar)
+            if valor_recibido > 0:
+                # Calculamos la tasa implícita real
+                tasa_directa = valor_recibido / monto_enviado
                 
-                if valor_recibido > 0:
-                    # Calculamos la tasa implícita real
-                    tasa_directa = valor_recibido / monto_enviado
-                    
-                    # También podríamos usar data['inverseExchangeRate'] si preferimos la oficial,
-                    # pero calcularla asegura que incluimos cualquier comisión oculta en el monto final.
-                    print(f"    ✅ Tasa API encontrada: {tasa_directa:.6f} (Recibe: {valor_recibido})")
-                    return tasa_directa, monto_a_cotizar
-            
-            print(f"    ⚠️ Respuesta inesperada: {data}")
-            return 0.0, monto_a_cotizar
-
-        except Exception as e:
-            print(f"    ❌ Excepción conectando a API: {e}")
-            return 0.0, monto_a_cotizar
\ No newline at end of file
+                # También podríamos usar data['inverseExchangeRate'] si preferimos la oficial,
+                # pero calcularla asegura que incluimos cualquier comisión oculta en el monto final.
+                print(f"    ✅ Tasa API encontrada ({ruta}): {tasa_directa:.6f} (Recibe: {valor_recibido})")
+                return tasa_directa, monto_a_cotizar
+        
+        print(f"    ⚠️ Respuesta inesperada: {data}")
+        return 0.0, monto_a_cotizar
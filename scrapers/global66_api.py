@@ -1,8 +1,8 @@
-import requests
-from .base_scraper import BaseScraper
+from .api_base import ApiBaseScraper
+from .numeros import parsear_numero
 from data_config import URLS_COMPETIDORES, MONTOS_POR_MONEDA
 
-class Global66ApiScraper(BaseScraper):
+class Global66ApiScraper(ApiBaseScraper):
     def __init__(self, driver):
         super().__init__(driver, "Global66", URLS_COMPETIDORES.get("Global66", ""))
         self.api_url = "https://api.global66.com/quote/public"
@@ -21,9 +21,7 @@ class Global66ApiScraper(BaseScraper):
             "MXN": 210  # México
         }
 
-    def get_tasa_por_ruta(self, ruta):
-        print(f"  > Procesando Global66 (API) para ruta {ruta}")
-        
+    def _preparar_peticion(self, ruta):
         moneda_origen = ruta[:3]
         moneda_destino = ruta[3:]
         
@@ -32,13 +30,10 @@ class Global66ApiScraper(BaseScraper):
         
         if not origin_id or not dest_id:
             print(f"    ❌ Error ID: No hay ID para {moneda_origen} o {moneda_destino}")
-            return 0.0, "100"
+            return {"monto": "100"}
 
         monto_str = self._get_monto_a_cotizar(moneda_origen)
-        try:
-            monto_clean = float(monto_str.replace('.', '').replace(',', '.'))
-        except:
-            monto_clean = 1000.0
+        monto_clean = parsear_numero(monto_str, "es-CL") or 1000.0
 
         params = {
             "originRoute": origin_id,
@@ -55,38 +50,39 @@ class Global66ApiScraper(BaseScraper):
             "Referer": "https://www.global66.com/"
         }
         
-        try:
-            response = requests.get(self.api_url, params=params, headers=headers, timeout=10)
+        return {"url": self.api_url, "params": params, "headers": headers,
+                "monto": str(monto_clean), "monto_num": monto_clean}
+
+    def _interpretar_respuesta(self, ruta, peticion, status, data, texto):
+        moneda_origen = ruta[:3]
+        moneda_destino = ruta[3:]
+        monto_clean = peticion["monto_num"]
+        
+        if status != 200:
+            # Si falla (como en los 404 de EUR), reportamos pero no rompemos el flujo
+            print(f"    ❌ API Status {status} ({ruta}): Ruta no disponible o error.")
+            return 0.0, str(monto_clean)
             
-            if response.status_code != 200:
-                # Si falla (como en los 404 de EUR), reportamos pero no rompemos el flujo
-                print(f"    ❌ API Status {response.status_code}: Ruta no disponible o error.")
-                return 0.0, str(monto_clean)
-                
-            data = response.json()
+        data = data if isinstance(data, dict) else {}
+        
+        # 1. Verificar si existe el objeto contenedor 'quoteData'
+        if 'quoteData' in data:
+            # La estructura es: data['quoteData']['destinationAmount']
+            quote_data = data['quoteData']
+            valor_recibido = float(quote_data.get('destinationAmount', 0))
             
-            # 1. Verificar si existe el objeto contenedor 'quoteData'
-            if 'quoteData' in data:
-                # La estructura es: data['quoteData']['destinationAmount']
-                quote_data = data['quoteData']
-                valor_recibido = float(quote_data.get('destinationAmount', 0))
+            if valor_recibido > 0:
+                tasa = valor_recibido / monto_clean
+                print(f"    ✅ Éxito: {monto_clean} {moneda_origen} -> {valor_recibido} {moneda_destino} (Tasa: {tasa:.6f})")
+                return tasa, str(monto_clean)
+        
+        # 2. Intentos de fallback por si la API cambia de formato (estructuras antiguas)
+        elif 'amountDestiny' in data:
+            valor_recibido = float(data['amountDestiny'])
+            if valor_recibido > 0:
+                tasa = valor_recibido / monto_clean
+                print(f"    ✅ Éxito (Legacy) {ruta}: {tasa:.6f}")
+                return tasa, str(monto_clean)
                 
-                if valor_recibido > 0:
-                    tasa = valor_recibido / monto_clean
-                    print(f"    ✅ Éxito: {monto_clean} {moneda_origen} -> {valor_recibido} {moneda_destino} (Tasa: {tasa:.6f})")
-                    return tasa, str(monto_clean)
-            
-            # 2. Intentos de fallback por si la API cambia de formato (estructuras antiguas)
-            elif 'amountDestiny' in data:
-                valor_recibido = float(data['amountDestiny'])
-                if valor_recibido > 0:
-                    tasa = valor_recibido / monto_clean
-                    print(f"    ✅ Éxito (Legacy): {tasa:.6f}")
-                    return tasa, str(monto_clean)
-                    
-            print(f"    ⚠️ JSON recibido pero estructura desconocida: {str(data)[:100]}...")
-            return 0.0, str(monto_clean)
-
-        except Exception as e:
-            print(f"    ❌ Excepción de conexión: {e}")
-            return 0.0, str(monto_clean)
\ No newline at end of file
+        print(f"    ⚠️ JSON recibido pero estructura desconocida: {str(data)[:100]}...")
+        return 0.0, str(monto_clean)
@@ -0,0 +1,72 @@
+from html.parser import HTMLParser
+
+from .http_async import obtener_json
+
+# Parser rápido si está instalado; si no, el de la librería estándar
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Algunas webs devuelven otra página (o 403) a clientes que no parecen navegador
+CABECERAS_NAVEGADOR = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+}
+
+ETIQUETAS_INVISIBLES = {"script", "style", "noscript", "template", "head"}
+TIMEOUT_HTML_SEGUNDOS = 5
+
+
+class _ExtractorTexto(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.partes = []
+        self._ocultas = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ETIQUETAS_INVISIBLES:
+            self._ocultas += 1
+
+    def handle_endtag(self, tag):
+        if tag in ETIQUETAS_INVISIBLES and self._ocultas:
+            self._ocultas -= 1
+
+    def handle_data(self, data):
+        if not self._ocultas and data.strip():
+            self.partes.append(data.strip())
+
+
+def texto_visible(html):
+    """
+    Texto de la página sin scripts ni estilos, un bloque por línea
+    (parecido a body.text de Selenium, suficiente para las regex de tasas).
+    """
+    if not html:
+        return ""
+    if lxml is not None:
+        doc = lxml.html.fromstring(html)
+        for el in doc.xpath("//script|//style|//noscript|//template|//head"):
+            el.drop_tree()
+        return "\n".join(t.strip() for t in doc.itertext() if t.strip())
+
+    extractor = _ExtractorTexto()
+    extractor.feed(html)
+    return "\n".join(extractor.partes)
+
+
+def obtener_texto_pagina(url, timeout=TIMEOUT_HTML_SEGUNDOS):
+    """
+    Descarga la página con la sesión HTTP compartida (keep-alive; respeta
+    los modos record/replay) y devuelve su texto visible, o "" si falla.
+    """
+    try:
+        status, _, html = obtener_json(url, headers=CABECERAS_NAVEGADOR, timeout=timeout)
+    except Exception as e:
+        print(f"    ⚠️ Falló la descarga HTTP de {url}: {e}")
+        return ""
+    if status != 200:
+        return ""
+    return texto_visible(html)
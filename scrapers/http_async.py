@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from .http_replay import modo_http, almacen_actual, latencia_simulada, respuesta_grabada
+
+# Conexiones simultáneas máximas por host (evita que una API nos bloquee)
+MAX_CONEXIONES_POR_HOST = 6
+TIMEOUT_SEGUNDOS = 10
+
+# Sesión compartida (keep-alive) para el modo sin aiohttp
+_sesion_local = threading.local()
+
+
+def _sesion_requests():
+    """Sesión requests por hilo: reutiliza conexiones TCP/TLS entre peticiones."""
+    sesion = getattr(_sesion_local, "sesion", None)
+    if sesion is None:
+        sesion = requests.Session()
+        adaptador = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONEXIONES_POR_HOST)
+        sesion.mount("https://", adaptador)
+        sesion.mount("http://", adaptador)
+        _sesion_local.sesion = sesion
+    return sesion
+
+
+def obtener_json(url, params=None, headers=None, timeout=TIMEOUT_SEGUNDOS):
+    """
+    GET bloqueante sobre la sesión keep-alive.
+    Devuelve (status, data_json_o_None, texto).
+    """
+    if modo_http() == "replay":
+        time.sleep(latencia_simulada(url, params))
+        return respuesta_grabada(url, params)
+
+    response = _sesion_requests().get(url, params=params, headers=headers, timeout=timeout)
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    resultado = (response.status_code, data, response.text)
+
+    if modo_http() == "record":
+        almacen_actual().guardar(url, params, resultado)
+    return resultado
+
+
+async def _obtener_replay(peticion):
+    await asyncio.sleep(latencia_simulada(peticion["url"], peticion.get("params")))
+    return respuesta_grabada(peticion["url"], peticion.get("params"))
+
+
+def _grabar(peticiones, resultados):
+    for peticion, resultado in zip(peticiones, resultados):
+        if not isinstance(resultado, Exception):
+            almacen_actual().guardar(peticion["url"], peticion.get("params"), resultado)
+
+
+async def _obtener_aiohttp(sesion, semaforos, peticion):
+    host = urlsplit(peticion["url"]).netloc
+    async with semaforos.setdefault(host, asyncio.Semaphore(MAX_CONEXIONES_POR_HOST)):
+        async with sesion.get(peticion["url"], params=peticion.get("params"), headers=peticion.get("headers")) as response:
+            texto = await response.text()
+            try:
+                data = await response.json(content_type=None)
+            except ValueError:
+                data = None
+            return response.status, data, texto
+
+
+async def _obtener_en_hilos(semaforos, peticion):
+    host = urlsplit(peticion["url"]).netloc
+    async with semaforos.setdefault(host, asyncio.Semaphore(MAX_CONEXIONES_POR_HOST)):
+        return await asyncio.to_thread(
+            obtener_json, peticion["url"], peticion.get("params"), peticion.get("headers")
+        )
+
+
+async def obtener_varios(peticiones):
+    """
+    Lanza todas las peticiones a la vez (con tope por host) y devuelve
+    una lista en el mismo orden con (status, data, texto) o la excepción.
+    Usa aiohttp si está instalado; si no, requests en hilos con keep-alive.
+    """
+    if modo_http() == "replay":
+        tareas = [_obtener_replay(p) for p in peticiones]
+        return await asyncio.gather(*tareas, return_exceptions=True)
+
+    semaforos = {}
+    try:
+        import aiohttp
+    except ImportError:
+        aiohttp = None
+
+    if aiohttp is None:
+        # obtener_json ya graba cada respuesta en modo record
+        tareas = [_obtener_en_hilos(semaforos, p) for p in peticiones]
+        return await asyncio.gather(*tareas, return_exceptions=True)
+
+    # Pasamos los params como str: aiohttp no acepta floats en la query
+    for p in peticiones:
+        if p.get("params"):
+            p["params"] = {k: str(v) for k, v in p["params"].items()}
+
+    conector = aiohttp.TCPConnector(limit_per_host=MAX_CONEXIONES_POR_HOST, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_SEGUNDOS)
+    async with aiohttp.ClientSession(connector=conector, timeout=timeout) as sesion:
+        tareas = [_obtener_aiohttp(sesion, semaforos, p) for p in peticiones]
+        resultados = await asyncio.gather(*tareas, return_exceptions=True)
+
+    if modo_http() == "record":
+        _grabar(peticiones, resultados)
+    return resultados
@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+
+# Modos del transporte HTTP de los scrapers de API:
+#   live   -> peticiones reales (por defecto)
+#   record -> peticiones reales + se guardan las respuestas en el almacén
+#   replay -> no hay red: se sirven las respuestas guardadas con latencia simulada
+MODOS_HTTP = ("live", "record", "replay")
+
+
+class AlmacenFixtures:
+    """
+    Almacén compacto de pares petición/respuesta en un único JSON gzip.
+    La clave es un hash de la URL y los params ordenados; si la respuesta
+    es JSON se guarda solo 'data' (no el texto crudo) para ocupar menos.
+    """
+    def __init__(self, ruta_archivo):
+        self.ruta_archivo = ruta_archivo
+        self._lock = threading.Lock()
+        self._entradas = {}
+        self._modificado = False
+        if os.path.exists(ruta_archivo):
+            with gzip.open(ruta_archivo, "rt", encoding="utf-8") as f:
+                self._entradas = json.load(f)
+
+    @staticmethod
+    def clave(url, params=None):
+        params = params or {}
+        firma = url + "?" + "&".join(f"{k}={v}" for k, v in sorted((k, str(v)) for k, v in params.items()))
+        return hashlib.sha1(firma.encode("utf-8")).hexdigest()[:16]
+
+    def obtener(self, url, params=None):
+        """Devuelve (status, data, texto) o None si la petición no fue grabada."""
+        with self._lock:
+            entrada = self._entradas.get(self.clave(url, params))
+        if entrada is None:
+            return None
+        data = entrada.get("data")
+        texto = entrada.get("texto")
+        if texto is None:
+            texto = json.dumps(data, ensure_ascii=False)
+        return entrada["status"], data, texto
+
+    def guardar(self, url, params, resultado):
+        status, data, texto = resultado
+        entrada = {"url": url, "status": status}
+        if data is not None:
+            entrada["data"] = data
+        else:
+            entrada["texto"] = texto
+        with self._lock:
+            self._entradas[self.clave(url, params)] = entrada
+            self._modificado = True
+
+    def volcar(self):
+        """Escribe el almacén a disco si hubo grabaciones nuevas."""
+        with self._lock:
+            if not self._modificado:
+                return
+            carpeta = os.path.dirname(self.ruta_archivo)
+            if carpeta:
+                os.makedirs(carpeta, exist_ok=True)
+            with gzip.open(self.ruta_archivo, "wt", encoding="utf-8") as f:
+                json.dump(self._entradas, f, ensure_ascii=False, separators=(",", ":"))
+            self._modificado = False
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+# Configuración global del transporte (la fija main_benchmark al arrancar)
+_config = {"modo": "live", "almacen": None, "latencia": 0.0, "jitter": 0.0}
+
+
+def configurar_http(modo="live", ruta_fixtures="fixtures/http_fixtures.json.gz", latencia=0.0, jitter=0.0):
+    """Fija el modo del transporte HTTP (live / record / replay)."""
+    if modo not in MODOS_HTTP:
+        raise ValueError(f"Modo HTTP desconocido: {modo}. Opciones: {', '.join(MODOS_HTTP)}")
+    _config["modo"] = modo
+    _config["almacen"] = AlmacenFixtures(ruta_fixtures) if modo != "live" else None
+    _config["latencia"] = float(latencia)
+    _config["jitter"] = float(jitter)
+    return _config["almacen"]
+
+
+def modo_http():
+    return _config["modo"]
+
+
+def almacen_actual():
+    return _config["almacen"]
+
+
+def latencia_simulada(url, params=None):
+    """
+    Latencia a inyectar en modo replay. El jitter es determinista por petición
+    (semilla = clave), así dos ejecuciones de replay duran lo mismo.
+    """
+    base = _config["latencia"]
+    jitter = _config["jitter"]
+    if jitter <= 0:
+        return base
+    return base + random.Random(AlmacenFixtures.clave(url, params)).uniform(0, jitter)
+
+
+def respuesta_grabada(url, params=None):
+    """Respuesta guardada para la petición; lanza LookupError si no existe."""
+    resultado = _config["almacen"].obtener(url, params)
+    if resultado is None:
+        raise LookupError(f"Sin fixture grabado para {url} {params}")
+    return resultado
+
+
+def finalizar_http():
+    """Persiste las grabaciones pendientes (modo record)."""
+    if _config["almacen"] is not None:
+        _config["almacen"].volcar()
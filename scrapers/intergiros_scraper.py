@@ -1,13 +1,23 @@
 from .base_scraper import BaseScraper
+from .html_texto import obtener_texto_pagina
+from .numeros import parsear_numero, parsear_numeros, buscar_numero
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
-import time
 from data_config import URLS_COMPETIDORES
 
+# Textos de tasa de Intergiros (compilados una vez)
+PATRON_SOL = re.compile(r'1\s*Sol\s*=\s*([\d\.]+)\s*Bs', re.IGNORECASE)
+PATRON_REAL = re.compile(r'1\s*Real\s*=\s*([\d\.]+)\s*Bs', re.IGNORECASE)
+PATRON_TASA = re.compile(r'Tasa\s*=\s*([\d\.]+)', re.IGNORECASE)
+PATRON_EJEMPLO_PESOS = re.compile(r'([\d,]+)\s*Pesos\s*=\s*([\d\.]+)\s*Bs', re.IGNORECASE)
+
 class IntergirosScraper(BaseScraper):
+    PUEDE_SIN_NAVEGADOR = True
+    # "1 Sol = 96.33 Bs.", "10,000 Pesos = 666.66 Bs"
+    LOCALE_NUMEROS = "en-US"
+
     def __init__(self, driver):
         # La URL base aquí es genérica, pero usaremos URLs específicas por ruta
         super().__init__(driver, "Intergiros", URLS_COMPETIDORES.get("Intergiros", ""))
@@ -36,12 +46,68 @@ class IntergirosScraper(BaseScraper):
                     if el.is_displayed():
                         print("    -> Cerrando pop-up detectado...")
                         el.click()
-                        time.sleep(1)
+                        WebDriverWait(self.driver, 1).until(EC.invisibility_of_element(el))
                         return
         except Exception:
             # No es crítico si falla, seguimos intentando leer el texto
             pass
 
+    def _extraer_tasa(self, ruta, body_text):
+        """Aplica las regex de Intergiros al texto de la página. Devuelve 0.0 si no hay tasa."""
+        tasa_encontrada = 0.0
+        
+        # Lógica específica por moneda
+        if ruta == "PENVES":
+            # Patrón típico: "1 Sol = 96.33 Bs."
+            tasa_encontrada = buscar_numero(body_text, self.LOCALE_NUMEROS, PATRON_SOL)
+                
+        elif ruta == "BRLVES":
+            # Patrón típico: "1 Real = 6.50 Bs."
+            tasa_encontrada = buscar_numero(body_text, self.LOCALE_NUMEROS, PATRON_REAL)
+        
+        elif ruta == "COPVES":
+            # Colombia suele mostrar la tasa inversa (ej: Tasa = 15 pesos por bolivar)
+            # Buscamos: "Tasa = 15" o "10,000 Pesos = 666.66 Bs"
+            
+            # Intento 1: Tasa directa mostrada como factor de conversión
+            match_tasa = PATRON_TASA.search(body_text)
+            
+            # Intento 2: Cálculo basado en ejemplo (10,000 Pesos = X Bs)
+            match_ejemplo = PATRON_EJEMPLO_PESOS.search(body_text)
+            
+            if match_ejemplo:
+                pesos, bolivares = parsear_numeros(match_ejemplo.groups(), self.LOCALE_NUMEROS)
+                if pesos > 0:
+                    tasa_encontrada = bolivares / pesos
+            elif match_tasa:
+                val = parsear_numero(match_tasa.group(1), self.LOCALE_NUMEROS)
+                # A veces ponen la tasa inversa (COP/VES), a veces directa. 
+                # Si el valor es > 1 (ej: 15), es Pesos por Bolivar -> Tasa directa = 1/15
+                if val > 1:
+                    tasa_encontrada = 1 / val
+                else:
+                    tasa_encontrada = val
+
+        return tasa_encontrada
+
+    def get_tasa_sin_navegador(self, ruta):
+        """Las páginas de Intergiros traen la tasa en el HTML: basta un GET."""
+        url = self.rutas_urls.get(ruta)
+        if not url:
+            return None
+        self._iniciar_fase("http")
+        body_text = obtener_texto_pagina(self._url(url))
+        self._iniciar_fase("extract")
+        try:
+            tasa_encontrada = self._extraer_tasa(ruta, body_text) if body_text else 0.0
+        except ValueError:
+            tasa_encontrada = 0.0
+        if tasa_encontrada > 0:
+            print(f"    ✅ Tasa encontrada por HTTP: {tasa_encontrada:.6f}")
+            return tasa_encontrada, self._get_monto_a_cotizar(ruta[:3])
+        print(f"    -> {ruta}: la tasa no está en el HTML, se usará el navegador.")
+        return None
+
     def get_tasa_por_ruta(self, ruta):
         print(f"  > Procesando {self.nombre} para ruta {ruta}")
         
@@ -51,57 +117,27 @@ class IntergirosScraper(BaseScraper):
             return 0.0, "100"
             
         monto_a_cotizar = self._get_monto_a_cotizar(ruta[:3])
+
+        # El intento por HTTP ya lo hizo el orquestador (cotizar_sin_navegador): aquí solo Chrome
+        if self.driver is None:
+            return 0.0, monto_a_cotizar
         
         try:
-            self.driver.get(url)
-            # Espera corta para carga inicial
-            time.sleep(3)
+            self._iniciar_fase("navigate")
+            self.driver.get(self._url(url))
+            # Espera a que la página deje de cargar recursos (tope 3s)
+            self._esperar_red_inactiva(timeout=3)
             
+            self._iniciar_fase("consent")
             # Intentar cerrar pop-ups que puedan tapar el contenido
             self._handle_popup()
             
+            self._iniciar_fase("extract")
             # Obtener todo el texto del cuerpo de la página
             # Es más fiable buscar en todo el texto que adivinar el selector exacto que cambia a veces
             body_text = self.driver.find_element(By.TAG_NAME, "body").text
             
-            tasa_encontrada = 0.0
-            
-            # Lógica específica por moneda
-            if ruta == "PENVES":
-                # Patrón típico: "1 Sol = 96.33 Bs."
-                match = re.search(r'1\s*Sol\s*=\s*([\d\.]+)\s*Bs', body_text, re.IGNORECASE)
-                if match:
-                    tasa_encontrada = float(match.group(1))
-                    
-            elif ruta == "BRLVES":
-                # Patrón típico: "1 Real = 6.50 Bs."
-                match = re.search(r'1\s*Real\s*=\s*([\d\.]+)\s*Bs', body_text, re.IGNORECASE)
-                if match:
-                    tasa_encontrada = float(match.group(1))
-            
-            elif ruta == "COPVES":
-                # Colombia suele mostrar la tasa inversa (ej: Tasa = 15 pesos por bolivar)
-                # Buscamos: "Tasa = 15" o "10,000 Pesos = 666.66 Bs"
-                
-                # Intento 1: Tasa directa mostrada como factor de conversión
-                match_tasa = re.search(r'Tasa\s*=\s*([\d\.]+)', body_text, re.IGNORECASE)
-                
-                # Intento 2: Cálculo basado en ejemplo (10,000 Pesos = X Bs)
-                match_ejemplo = re.search(r'([\d,]+)\s*Pesos\s*=\s*([\d\.]+)\s*Bs', body_text, re.IGNORECASE)
-                
-                if match_ejemplo:
-                    pesos = float(match_ejemplo.group(1).replace(',', ''))
-                    bolivares = float(match_ejemplo.group(2).replace(',', '.'))
-                    if pesos > 0:
-                        tasa_encontrada = bolivares / pesos
-                elif match_tasa:
-                    val = float(match_tasa.group(1))
-                    # A veces ponen la tasa inversa (COP/VES), a veces directa. 
-                    # Si el valor es > 1 (ej: 15), es Pesos por Bolivar -> Tasa directa = 1/15
-                    if val > 1:
-                        tasa_encontrada = 1 / val
-                    else:
-                        tasa_encontrada = val
+            tasa_encontrada = self._extraer_tasa(ruta, body_text)
 
             if tasa_encontrada > 0:
                 print(f"    ✅ Tasa encontrada en texto: {tasa_encontrada:.6f}")
@@ -1,13 +1,15 @@
 from .base_scraper import BaseScraper
+from .numeros import parsear_numeros, buscar_numero
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-import re
-import time
 from data_config import URLS_COMPETIDORES
 
 class MiPapayaScraper(BaseScraper):
+    # "Tasa Papaya 1 USD = 276.14 VES"
+    LOCALE_NUMEROS = "en-US"
+
     def __init__(self, driver):
         super().__init__(driver, "Mi Papaya", URLS_COMPETIDORES.get("Mi Papaya", "https://mipapaya.app/"))
         
@@ -61,14 +63,11 @@ class MiPapayaScraper(BaseScraper):
 
             # 2. Clic para abrir
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", target)
-            time.sleep(0.5)
             
             # Intentar click normal y JS
             try: target.click()
             except: self.driver.execute_script("arguments[0].click();", target)
             
-            time.sleep(1) # Esperar animación de lista
-            
             # 3. Buscar opción en la lista desplegada
             # En Angular Material, las opciones suelen estar en un 'div.cdk-overlay-container' al final del body
             xpath_option = f"//span[contains(text(), '{pais_nombre}')] | //mat-option//span[contains(., '{pais_nombre}')] | //li[contains(., '{pais_nombre}')]"
@@ -76,9 +75,10 @@ class MiPapayaScraper(BaseScraper):
             opcion = wait.until(EC.element_to_be_clickable((By.XPATH, xpath_option)))
             opcion.click()
             
-            # Cerrar por si acaso (clic en body)
+            # Cerrar por si acaso (clic en body) y esperar a que se cierre el overlay
             self.driver.find_element(By.TAG_NAME, "body").click()
-            time.sleep(1)
+            try: WebDriverWait(self.driver, 1).until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".cdk-overlay-pane")))
+            except: pass
             print(f"      ✅ Selección realizada: {pais_nombre}")
             return True
 
@@ -97,16 +97,21 @@ class MiPapayaScraper(BaseScraper):
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
         
         try:
-            self.driver.get(self.url_base)
-            time.sleep(5) # Espera carga
+            self._iniciar_fase("navigate")
+            self.driver.get(self._url(self.url_base))
+            self._esperar_red_inactiva(timeout=5) # Espera carga
 
+            self._iniciar_fase("select_origin")
             # 1. Seleccionar Origen (Primer selector)
             self._seleccionar_pais(0, moneda_origen)
             
+            self._iniciar_fase("select_destination")
             # 2. Seleccionar Destino (Segundo selector)
             self._seleccionar_pais(1, moneda_destino)
 
+            self._iniciar_fase("input_amount")
             # 3. Ingresar Monto
+            input_recibo = None
             try:
                 # Buscar input numérico visible
                 inputs = self.driver.find_elements(By.XPATH, "//input[@type='number' or @type='tel']")
@@ -118,6 +123,10 @@ class MiPapayaScraper(BaseScraper):
                         break
                 
                 if input_envio:
+                    # Guardamos el valor recibido actual para detectar el recálculo
+                    visibles = [x for x in inputs if x.is_displayed()]
+                    input_recibo = visibles[1] if len(visibles) >= 2 else None
+                    previo = input_recibo.get_attribute("value") if input_recibo else None
                     input_envio.clear()
                     input_envio.send_keys(monto_a_cotizar)
                     # Forzar evento de actualización
@@ -128,9 +137,12 @@ class MiPapayaScraper(BaseScraper):
             except Exception as e:
                 print(f"    ⚠️ Error ingresando monto: {e}")
 
+            self._iniciar_fase("calculate")
             print("    -> Esperando cálculo...")
-            time.sleep(5)
+            if input_recibo is None or self._esperar_cambio_valor(input_recibo, previo, timeout=5) is None:
+                self._esperar_red_inactiva(timeout=2)
 
+            self._iniciar_fase("extract")
             # 4. Extraer Tasa ("Tasa Papaya 1 USD = 276.14 VES")
             tasa_final = 0.0
             try:
@@ -142,14 +154,8 @@ class MiPapayaScraper(BaseScraper):
                     # Regex para buscar "1 MONEDA = VALOR" o "Tasa ... VALOR"
                     # Ej: "Tasa Papaya 1 USD = 276.14 VES"
                     # Buscamos el número que está después del "="
-                    match = re.search(r'=\s*([\d\.,]+)', texto)
-                    
-                    if match:
-                        val_str = match.group(1).replace(',', '.')
-                        # Si tiene multiples puntos, limpiar
-                        if val_str.count('.') > 1: val_str = val_str.replace('.', '', val_str.count('.')-1)
-                        
-                        tasa_final = float(val_str)
+                    tasa_final = buscar_numero(texto, self.LOCALE_NUMEROS)
+                    if tasa_final > 0:
                         print(f"    ✅ Tasa encontrada en texto: {tasa_final}")
                         return tasa_final, monto_a_cotizar
 
@@ -160,8 +166,8 @@ class MiPapayaScraper(BaseScraper):
                      inputs = self.driver.find_elements(By.XPATH, "//input[@type='number' or @type='tel']")
                      visibles = [x for x in inputs if x.is_displayed()]
                      if len(visibles) >= 2:
-                         val_in = float(visibles[0].get_attribute("value"))
-                         val_out = float(visibles[1].get_attribute("value"))
+                         val_in, val_out = parsear_numeros(
+                             [visibles[0].get_attribute("value"), visibles[1].get_attribute("value")], self.LOCALE_NUMEROS)
                          if val_in > 0:
                              tasa_final = val_out / val_in
                              print(f"    🧮 Tasa calculada: {tasa_final:.6f}")
@@ -0,0 +1,92 @@
+"""
+Parser único de montos y tasas para todos los scrapers.
+
+Las webs muestran los números en formatos distintos ("1.234,56" en España
+y Chile, "1,234.56" en EE. UU.). La regla es la misma en todos lados:
+  1. Si aparecen los dos separadores, el último es el decimal.
+  2. Un separador repetido ("1.234.567") es de miles.
+  3. Un separador único es decimal salvo que lleve exactamente 3 dígitos
+     detrás ("1.000", "82,300"): ese caso es ambiguo y lo decide el locale
+     (sin locale se toma como miles). "0,123" siempre es decimal.
+Devuelve 0.0 cuando no hay número, como el resto de los scrapers.
+"""
+import re
+from functools import lru_cache
+
+# Separador decimal de cada locale soportado
+SEPARADOR_DECIMAL = {
+    "es-ES": ",",
+    "es-CL": ",",
+    "en-US": ".",
+}
+
+_NO_NUMERICO = re.compile(r"[^\d.,]")
+# "= 1,1386 USD", "1.00 EUR = 1.15942393 USD"
+PATRON_TRAS_IGUAL = re.compile(r"=\s*([\d.,]+)")
+# Primer número del texto ("Tasa actual 0.3823", "Exchange rate 1020.5")
+PATRON_PRIMER_NUMERO = re.compile(r"(\d[\d.,]*)")
+
+
+@lru_cache(maxsize=4096)
+def _parsear(texto, locale):
+    limpio = _NO_NUMERICO.sub("", texto).strip(".,")
+    if not limpio:
+        return 0.0
+
+    coma = limpio.rfind(",")
+    punto = limpio.rfind(".")
+    if coma >= 0 and punto >= 0:
+        decimal = "," if coma > punto else "."
+    elif coma < 0 and punto < 0:
+        decimal = None
+    else:
+        separador = "," if coma >= 0 else "."
+        entero, _, fraccion = limpio.partition(separador)
+        if separador in fraccion:
+            decimal = None
+        elif len(fraccion) != 3 or entero == "0":
+            decimal = separador
+        else:
+            decimal = separador if SEPARADOR_DECIMAL.get(locale) == separador else None
+
+    if decimal is None:
+        limpio = limpio.replace(",", "").replace(".", "")
+    else:
+        miles = "." if decimal == "," else ","
+        limpio = limpio.replace(miles, "").replace(decimal, ".")
+    try:
+        return float(limpio)
+    except ValueError:
+        # Ej. "1.234.56": separador decimal repetido
+        return 0.0
+
+
+def _validar_locale(locale):
+    if locale is not None and locale not in SEPARADOR_DECIMAL:
+        raise ValueError(f"Locale no soportado: {locale} (opciones: {', '.join(SEPARADOR_DECIMAL)})")
+
+
+def parsear_numero(texto, locale=None):
+    """Convierte '1.234,56', '1,234.56 USD', '$ 82.300' ... a float (0.0 si no hay número)."""
+    if not texto:
+        return 0.0
+    _validar_locale(locale)
+    return _parsear(str(texto), locale)
+
+
+def parsear_numeros(textos, locale=None):
+    """Versión por lotes de parsear_numero: una lista de floats en el mismo orden."""
+    _validar_locale(locale)
+    parsear = _parsear
+    return [parsear(str(t), locale) if t else 0.0 for t in textos]
+
+
+def buscar_numero(texto, locale=None, patron=PATRON_TRAS_IGUAL):
+    """
+    Busca 'patron' (compilado, con el número en el grupo 1) en el texto y
+    parsea lo capturado. Por defecto, el número tras un "=".
+    """
+    if not texto:
+        return 0.0
+    match = patron.search(texto)
+    return parsear_numero(match.group(1), locale) if match else 0.0
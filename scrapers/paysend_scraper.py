@@ -1,4 +1,5 @@
 from .base_scraper import BaseScraper
+from .numeros import parsear_numeros, buscar_numero
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -9,6 +10,9 @@ import time
 from data_config import URLS_COMPETIDORES
 
 class PaysendScraper(BaseScraper):
+    PATRONES_API_COTIZACION = ("/quote", "/commission", "/calculat")
+    REUTILIZA_PAGINA = True
+
     def __init__(self, driver):
         super().__init__(driver, "Paysend", URLS_COMPETIDORES.get("Paysend", "https://paysend.com/"))
         
@@ -34,25 +38,17 @@ class PaysendScraper(BaseScraper):
             "USD": "US Dollar"
         }
 
-    def _clean_amount(self, value_str):
-        if not value_str: return 0.0
-        clean = re.sub(r'[^\d\.,]', '', str(value_str))
-        if not clean: return 0.0
-
-        # Lógica de decimales
-        if ',' in clean and '.' in clean:
-            if clean.rindex(',') > clean.rindex('.'): 
-                clean = clean.replace('.', '').replace(',', '.')
-            else:
-                clean = clean.replace(',', '')
-        elif ',' in clean:
-            if len(clean.split(',')[-1]) == 2: 
-                clean = clean.replace(',', '.')
-            else:
-                clean = clean.replace(',', '')
-        
-        try: return float(clean)
-        except: return 0.0
+    def _url_origen(self, moneda_origen):
+        """Página de Paysend para la moneda de origen (una por país emisor)."""
+        if moneda_origen in ("US", "USA"): moneda_origen = "USD"
+        return self.url_map.get(moneda_origen, self.url_map["USD"])
+
+    def clave_navegacion(self, ruta):
+        return self._url_origen(ruta[:3]), ruta[:3]
+
+    def _locale_de(self, moneda_origen):
+        """Las páginas de USD/EUR/GBP usan punto decimal (1,234.56); las de Latam, coma (1.234,56)."""
+        return "en-US" if moneda_origen in ("USD", "USA", "EUR", "GBP") else "es-CL"
 
     def _ingresar_monto_humano(self, monto):
         """Escribe el monto de forma humana para evitar errores de máscara"""
@@ -74,7 +70,12 @@ class PaysendScraper(BaseScraper):
             # Escribir
             monto_entero = str(int(float(monto))) # Paysend prefiere enteros al escribir
             input_el.send_keys(monto_entero)
-            time.sleep(1)
+            # Esperar a que la máscara refleje los dígitos escritos
+            try:
+                WebDriverWait(self.driver, 1, poll_frequency=0.1).until(
+                    lambda d: monto_entero in input_el.get_attribute("value").replace('.', '').replace(',', '').replace(' ', '')
+                )
+            except: pass
             
             # Clic fuera para que calcule
             self.driver.find_element(By.TAG_NAME, "body").click()
@@ -100,9 +101,9 @@ class PaysendScraper(BaseScraper):
             # Usamos un selector genérico para el botón si el testid falla
             trigger = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='amount-label-to']")))
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", trigger)
-            time.sleep(0.5)
             trigger.click()
-            time.sleep(1.5) # Esperar animación de lista
+            # Esperar a que la lista muestre el país (tope 1.5s)
+            self._esperar_presencia((By.ID, target_id), timeout=1.5, visible=True)
 
             # 2. Buscar el elemento del país en la lista
             # Buscamos por ID exacto
@@ -124,10 +125,11 @@ class PaysendScraper(BaseScraper):
                 if target_opcion:
                     # Scroll y Click JS (Infalible)
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", target_opcion)
-                    time.sleep(0.5)
                     self.driver.execute_script("arguments[0].click();", target_opcion)
                     print(f"      ✅ Clic JS enviado a #{target_id}")
-                    time.sleep(2) # Esperar cierre de menú
+                    # Esperar cierre de menú
+                    try: WebDriverWait(self.driver, 2).until(EC.invisibility_of_element(target_opcion))
+                    except: pass
                 else:
                     print(f"      ❌ No se encontró el elemento #{target_id} en el DOM.")
                     return False
@@ -159,10 +161,10 @@ class PaysendScraper(BaseScraper):
                     "arguments[0].scrollIntoView({block: 'center'});",
                     opcion_moneda,
                 )
-                time.sleep(0.3)
                 self.driver.execute_script("arguments[0].click();", opcion_moneda)
                 print(f"      -> Seleccionando sub-moneda por código: {codigo_moneda}")
-                time.sleep(1)
+                try: WebDriverWait(self.driver, 1).until(EC.invisibility_of_element(opcion_moneda))
+                except: pass
 
             except Exception as e:
                 # Si no hay submenú o no aparece la moneda, seguimos sin romper el flujo
@@ -190,59 +192,81 @@ class PaysendScraper(BaseScraper):
         if moneda_origen == "USD": moneda_origen = "USA" # Paysend a veces usa USA en URL
 
         # Obtener URL correcta
-        url_key = moneda_origen if moneda_origen in self.url_map else "USD"
-        url = self.url_map.get(url_key, "https://paysend.com/")
+        url = self._url_origen(moneda_origen)
         
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
         
         try:
-            self.driver.get(url)
-            time.sleep(4) # Carga inicial
+            self._iniciar_fase("navigate")
+            # Las rutas con el mismo origen comparten página (plan_rutas las deja seguidas):
+            # solo se navega al cambiar de origen
+            if self._abrir_sesion(url, (By.ID, "__ifc__from_amount")):
+                self._esperar_red_inactiva(timeout=4) # Carga inicial
 
-            # Cookies (cerrar rápido)
-            try: self.driver.find_element(By.ID, "onetrust-accept-btn-handler").click()
-            except: pass
+                self._iniciar_fase("consent")
+                # Cookies (cerrar rápido; con el consentimiento restaurado no hay banner)
+                if not self._consentimiento_vigente():
+                    try: self.driver.find_element(By.ID, "onetrust-accept-btn-handler").click()
+                    except: pass
 
+            # El valor previo se lee antes de cambiar el destino: con la página
+            # reutilizada, el cambio de destino ya dispara el recálculo
+            try: previo = self.driver.find_element(By.ID, "__ifc__to_amount").get_attribute("value")
+            except: previo = None
+            self._preparar_captura()
+
+            self._iniciar_fase("select_destination")
+            # Si cambia el destino o el monto, el valor previo ya no sirve: hay que esperar el nuevo
+            recalcula = (self._sesion.get("destino") != moneda_destino
+                         or self._sesion.get("monto") != monto_a_cotizar)
             # 1. SELECCIONAR DESTINO
-            self._seleccionar_destino_robusto(moneda_destino)
+            if self._sesion.get("destino") != moneda_destino:
+                # Sin destino seleccionado la página sigue mostrando el anterior: no se extrae nada
+                if self._seleccionar_destino_robusto(moneda_destino) is False:
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
+                self._sesion["destino"] = moneda_destino
 
-            # 2. INGRESAR MONTO
-            self._ingresar_monto_humano(monto_a_cotizar)
+            self._iniciar_fase("input_amount")
+            # 2. INGRESAR MONTO (una vez por página: los destinos siguientes lo conservan)
+            if self._sesion.get("monto") != monto_a_cotizar:
+                self._ingresar_monto_humano(monto_a_cotizar)
+                self._sesion["monto"] = monto_a_cotizar
 
+            self._iniciar_fase("calculate")
             print("    -> Esperando cálculo...")
-            time.sleep(5)
+            tasa_red, cambio = self._esperar_cotizacion(moneda_destino, (By.ID, "__ifc__to_amount"), previo, timeout=5)
+            if recalcula and not cambio:
+                # El recálculo no llegó: la página sigue mostrando la ruta anterior
+                print(f"    ⛔ {self.nombre} no recalculó {ruta} a tiempo. Saltando ruta.")
+                self._invalidar_sesion()
+                return 0.0, monto_a_cotizar
 
+            self._iniciar_fase("extract")
             # 3. EXTRAER TASA
-            tasa_final = 0.0
-            
-            # A) Texto "Today's rate" / "Cambio de hoy"
-            try:
-                body_text = self.driver.find_element(By.TAG_NAME, "body").text
-                # Busca "1.00 [ORIGEN] = [NUMERO]"
-                # Paysend muestra ej: "1.00 USD = 950.50 CLP"
-                patron = r'=\s*([\d\.,]+)\s*' + (moneda_destino if moneda_destino != "US" else "USD")
-                match = re.search(patron, body_text)
-                
-                if match:
-                    val_str = match.group(1)
+            # A) JSON de la API de la página (si se capturó)
+            tasa_final = tasa_red
+
+            # B) Texto "Today's rate" / "Cambio de hoy"
+            if tasa_final == 0:
+                try:
+                    body_text = self.driver.find_element(By.TAG_NAME, "body").text
+                    # Busca "1.00 [ORIGEN] = [NUMERO]"
+                    # Paysend muestra ej: "1.00 USD = 950.50 CLP"
+                    patron = re.compile(r'=\s*([\d\.,]+)\s*' + (moneda_destino if moneda_destino != "US" else "USD"))
                     # Ajuste para USD/EUR (punto decimal) vs Latam (coma decimal)
-                    if "USD" in moneda_origen or "EUR" in moneda_origen or "GBP" in moneda_origen:
-                         val_str = val_str.replace(',', '') # 1,234.56 -> 1234.56
-                    else:
-                         val_str = val_str.replace('.', '').replace(',', '.') # 1.234,56 -> 1234.56
-                    
-                    tasa_final = float(val_str)
-                    print(f"    ✅ Tasa encontrada (Texto): {tasa_final}")
-            except: pass
+                    tasa_final = buscar_numero(body_text, self._locale_de(moneda_origen), patron)
+                    if tasa_final > 0:
+                        print(f"    ✅ Tasa encontrada (Texto): {tasa_final}")
+                except: pass
 
-            # B) Cálculo por Inputs (Plan B)
+            # C) Cálculo por Inputs (Plan C)
             if tasa_final == 0:
                 try:
                     val_in = self.driver.find_element(By.ID, "__ifc__from_amount").get_attribute("value")
                     val_out = self.driver.find_element(By.ID, "__ifc__to_amount").get_attribute("value")
                     
-                    n_in = self._clean_amount(val_in)
-                    n_out = self._clean_amount(val_out)
+                    n_in, n_out = parsear_numeros([val_in, val_out], self._locale_de(moneda_origen))
                     
                     # Filtro de coherencia (evitar trillones)
                     if n_in > 0 and n_out > 0 and n_in < 100000000:
@@ -254,8 +278,11 @@ class PaysendScraper(BaseScraper):
                 except Exception as e:
                     print(f"    ⚠️ Falló cálculo inputs: {e}")
 
+            if tasa_final == 0:
+                self._invalidar_sesion()
             return tasa_final, monto_a_cotizar
 
         except Exception as e:
             print(f"    ❌ Error crítico en Paysend: {e}")
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Perfil de Chrome liviano para los scrapers: sin ventana, estrategia de
+carga 'eager' (driver.get vuelve en DOMContentLoaded) y sin descargar
+media pesada ni terceros (analítica, chats), bloqueados por CDP con
+patrones de URL. Cada competidor puede exceptuar patrones que su página
+necesite (RECURSOS_PERMITIDOS_POR_COMPETIDOR en data_config).
+"""
+from data_config import NAVEGADOR_HEADLESS, RECURSOS_BLOQUEADOS, RECURSOS_PERMITIDOS_POR_COMPETIDOR
+
+# Configuración global del perfil (la fija main_benchmark al arrancar)
+_config = {"headless": NAVEGADOR_HEADLESS, "bloquear": True}
+
+
+def configurar_perfil(headless=NAVEGADOR_HEADLESS, bloquear=True):
+    """headless: Chrome sin ventana. bloquear: aplicar RECURSOS_BLOQUEADOS en cada competidor."""
+    _config["headless"] = bool(headless)
+    _config["bloquear"] = bool(bloquear)
+
+
+def configurar_opciones(options):
+    """Ajusta las ChromeOptions del pool al perfil liviano."""
+    options.page_load_strategy = "eager"
+    if _config["headless"]:
+        options.add_argument("--headless=new")
+        # Sin ventana el viewport por defecto es chico y algunas webs pasan a la versión móvil
+        options.add_argument("--window-size=1920,1080")
+    for argumento in ("--disable-extensions", "--disable-notifications", "--mute-audio",
+                      "--disable-background-networking", "--disable-dev-shm-usage"):
+        options.add_argument(argumento)
+    return options
+
+
+def preparar_driver(driver):
+    """
+    Tras crear el driver: sin ventana, Chrome se anuncia como 'HeadlessChrome'
+    y algunas webs lo rechazan; se reemplaza por el user agent normal.
+    """
+    if not _config["headless"]:
+        return driver
+    try:
+        agente = driver.execute_script("return navigator.userAgent")
+        driver.execute_cdp_cmd("Network.setUserAgentOverride",
+                               {"userAgent": agente.replace("HeadlessChrome", "Chrome")})
+    except Exception as e:
+        print(f"    ⚠️ No se pudo ajustar el user agent: {e}")
+    return driver
+
+
+def patrones_bloqueados(competidor):
+    """RECURSOS_BLOQUEADOS menos las excepciones del competidor."""
+    permitidos = set(RECURSOS_PERMITIDOS_POR_COMPETIDOR.get(competidor, ()))
+    return [patron for patron in RECURSOS_BLOQUEADOS if patron not in permitidos]
+
+
+def aplicar_bloqueo(driver, competidor):
+    """
+    Fija en el driver (prestado por el pool a este competidor) los patrones
+    bloqueados. Se llama con cada préstamo: el driver pudo venir de otro
+    competidor con otras excepciones.
+    """
+    patrones = patrones_bloqueados(competidor) if _config["bloquear"] else []
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patrones})
+    except Exception as e:
+        # Driver sin CDP (no Chrome): se navega sin bloqueo
+        print(f"    ⚠️ No se pudo aplicar el bloqueo de recursos en {competidor}: {e}")
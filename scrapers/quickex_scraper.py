@@ -1,12 +1,15 @@
 from .base_scraper import BaseScraper
+from .numeros import parsear_numeros, buscar_numero, PATRON_PRIMER_NUMERO
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import re
-import time
+from selenium.common.exceptions import NoSuchElementException
 from data_config import URLS_COMPETIDORES
 
 class QuickexScraper(BaseScraper):
+    # Calculadora con sesión: rutas seguidas solo cambian lo necesario
+    REUTILIZA_PAGINA = True
+
     def __init__(self, driver):
         super().__init__(driver, "Quickex", URLS_COMPETIDORES.get("Quickex", "https://www.quickex.net/"))
 
@@ -25,9 +28,7 @@ class QuickexScraper(BaseScraper):
             # Usamos JS para evitar errores de "elemento interceptado"
             select_trigger = container.find_element(By.CLASS_NAME, "dd-select")
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", container)
-            time.sleep(0.5)
             self.driver.execute_script("arguments[0].click();", select_trigger)
-            time.sleep(1) # Esperar a que la lista se despliegue visualmente
             
             # 3. Buscar la opción específica
             # En tus capturas, el texto está dentro de <label class="dd-option-text">CLP</label>
@@ -35,8 +36,10 @@ class QuickexScraper(BaseScraper):
             
             xpath_target = f".//*[@id='{container_id}']//label[contains(text(), '{moneda_texto}')]/ancestor::a[contains(@class, 'dd-option')]"
             
-            # Verificar si existe
-            opcion = self.driver.find_element(By.XPATH, xpath_target)
+            # Esperar a que la lista se despliegue y la opción exista
+            opcion = self._esperar_presencia((By.XPATH, xpath_target), timeout=2)
+            if opcion is None:
+                raise NoSuchElementException(f"Opción {moneda_texto} no encontrada en {container_id}")
             
             # 4. Hacer clic en la opción
             self.driver.execute_script("arguments[0].click();", opcion)
@@ -44,7 +47,8 @@ class QuickexScraper(BaseScraper):
             
             # 5. Cerrar forzosamente cualquier menú abierto haciendo clic en el body
             self.driver.find_element(By.TAG_NAME, "body").click()
-            time.sleep(1)
+            try: wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, f"#{container_id} .dd-options")))
+            except: pass
             return True
 
         except Exception as e:
@@ -74,38 +78,69 @@ class QuickexScraper(BaseScraper):
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
         
         try:
-            self.driver.get(self.url_base)
-            self.driver.refresh()
-            time.sleep(5) # Espera inicial importante
+            self._iniciar_fase("navigate")
+            # Sesión con estado: la calculadora se carga una vez y se reutiliza entre rutas
+            if self._abrir_sesion(self.url_base, (By.CSS_SELECTOR, "#currency-1 .dd-select")):
+                self.driver.refresh()
+                # Espera inicial importante: el ddSlick se monta por JS
+                self._esperar_presencia((By.CSS_SELECTOR, "#currency-1 .dd-select"), timeout=5)
+                self._esperar_red_inactiva(timeout=3)
+
+            # Valor recibido antes de tocar nada (para detectar el recálculo)
+            previo = None
+            try: previo = self.driver.find_element(By.ID, "amount-to").get_attribute("value")
+            except: pass
+            cambio = False
             
-            # 1. SELECCIONAR ORIGEN (ID: currency-1)
-            if not self._seleccionar_ddslick("currency-1", moneda_origen):
-                print("    ⛔ Falló selección de origen. Saltando ruta.")
-                return 0.0, monto_a_cotizar
+            self._iniciar_fase("select_origin")
+            # 1. SELECCIONAR ORIGEN (ID: currency-1), solo si difiere de la ruta anterior
+            if self._sesion.get("origen") != moneda_origen:
+                if not self._seleccionar_ddslick("currency-1", moneda_origen):
+                    print("    ⛔ Falló selección de origen. Saltando ruta.")
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
+                self._sesion["origen"] = moneda_origen
+                cambio = True
 
+            self._iniciar_fase("select_destination")
             # 2. SELECCIONAR DESTINO (ID: currency-2)
-            if not self._seleccionar_ddslick("currency-2", moneda_destino):
-                print("    ⛔ Falló selección de destino. Saltando ruta.")
-                return 0.0, monto_a_cotizar
+            if self._sesion.get("destino") != moneda_destino:
+                if not self._seleccionar_ddslick("currency-2", moneda_destino):
+                    print("    ⛔ Falló selección de destino. Saltando ruta.")
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
+                self._sesion["destino"] = moneda_destino
+                cambio = True
             
-            # 3. INGRESAR MONTO
-            try:
-                input_monto = self.driver.find_element(By.ID, "amount")
-                self.driver.execute_script("arguments[0].value = '';", input_monto)
-                input_monto.send_keys(monto_a_cotizar)
-                
-                # Disparar eventos para que la web sepa que cambió
-                self.driver.execute_script("arguments[0].dispatchEvent(new Event('input'));", input_monto)
-                self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", input_monto)
-                
-                # Clic fuera para activar cálculo
-                self.driver.find_element(By.TAG_NAME, "body").click()
-            except Exception as e:
-                print(f"    ⚠️ Error ingresando monto: {e}")
+            self._iniciar_fase("input_amount")
+            # 3. INGRESAR MONTO (solo si cambió)
+            if self._sesion.get("monto") != monto_a_cotizar:
+                try:
+                    input_monto = self.driver.find_element(By.ID, "amount")
+                    self.driver.execute_script("arguments[0].value = '';", input_monto)
+                    input_monto.send_keys(monto_a_cotizar)
+                    
+                    # Disparar eventos para que la web sepa que cambió
+                    self.driver.execute_script("arguments[0].dispatchEvent(new Event('input'));", input_monto)
+                    self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", input_monto)
+                    
+                    # Clic fuera para activar cálculo
+                    self.driver.find_element(By.TAG_NAME, "body").click()
+                    self._sesion["monto"] = monto_a_cotizar
+                    cambio = True
+                except Exception as e:
+                    print(f"    ⚠️ Error ingresando monto: {e}")
 
-            print("    -> Esperando cálculo...")
-            time.sleep(5) 
+            self._iniciar_fase("calculate")
+            if cambio:
+                print("    -> Esperando cálculo...")
+                if self._esperar_cambio_valor((By.ID, "amount-to"), previo, timeout=5) is None:
+                    # Sin recálculo la página sigue mostrando la ruta anterior
+                    print("    ⛔ La calculadora no recalculó a tiempo. Saltando ruta.")
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
             
+            self._iniciar_fase("extract")
             # 4. OBTENER RESULTADO (TASA)
             tasa_final = 0.0
             
@@ -115,9 +150,9 @@ class QuickexScraper(BaseScraper):
                 for el in elements:
                     if el.is_displayed():
                         text = el.text
-                        match = re.search(r'([\d\.]+)', text.replace('Tasa actual', '').strip())
-                        if match:
-                            tasa_final = float(match.group(1))
+                        # La tasa se muestra con punto decimal ("Tasa actual 0.382353")
+                        tasa_final = buscar_numero(text.replace('Tasa actual', ''), "en-US", PATRON_PRIMER_NUMERO)
+                        if tasa_final > 0:
                             print(f"    ✅ Tasa leída (Texto): {tasa_final}")
                             break
             except: pass
@@ -128,8 +163,9 @@ class QuickexScraper(BaseScraper):
                     input_origen = self.driver.find_element(By.ID, "amount")
                     input_destino = self.driver.find_element(By.ID, "amount-to")
                     
-                    val_orig = float(re.sub(r'[^\d\.]', '', input_origen.get_attribute("value")))
-                    val_dest = float(re.sub(r'[^\d\.]', '', input_destino.get_attribute("value")))
+                    # Los montos en pesos chilenos usan punto de miles (100.000)
+                    val_orig, val_dest = parsear_numeros(
+                        [input_origen.get_attribute("value"), input_destino.get_attribute("value")], "es-CL")
                     
                     if val_orig > 0 and val_dest > 0:
                         tasa_final = val_dest / val_orig
@@ -139,8 +175,11 @@ class QuickexScraper(BaseScraper):
             if tasa_final > 0:
                 return tasa_final, monto_a_cotizar
 
+            # Sin tasa: la próxima ruta parte de una página recién cargada
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
 
         except Exception as e:
             print(f"    ❌ Error crítico en Quickex: {e}")
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
\ No newline at end of file
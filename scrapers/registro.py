@@ -0,0 +1,48 @@
+import importlib
+import threading
+from collections import namedtuple
+
+# Cada competidor declara dónde está su scraper y si necesita Chrome.
+# Los módulos se importan recién cuando el competidor se ejecuta: una corrida
+# solo de APIs no importa Selenium ni levanta ningún navegador.
+EntradaScraper = namedtuple("EntradaScraper", ["modulo", "clase", "requiere_navegador"])
+
+REGISTRO_SCRAPERS = {
+    "Global66": EntradaScraper("scrapers.global66_api", "Global66ApiScraper", False),
+    "Arcadi": EntradaScraper("scrapers.arcadi_api", "ArcadiApiScraper", False),
+    "CURRENCYBIRD": EntradaScraper("scrapers.currencybird_api", "CurrencyBirdApiScraper", False),
+    # Intentan primero por HTTP simple; Chrome solo para las rutas que lo necesiten
+    "Intergiros": EntradaScraper("scrapers.intergiros_scraper", "IntergirosScraper", True),
+    "Curiara": EntradaScraper("scrapers.curiara_scrapper", "CuriaraScraper", True),
+    "Quickex": EntradaScraper("scrapers.quickex_scraper", "QuickexScraper", True),
+    "Tucambio CL": EntradaScraper("scrapers.tucambio_scraper", "TuCambioScraper", True),
+    "Remesas Vzla": EntradaScraper("scrapers.remesasvzla_scraper", "RemesasVzlaScraper", True),
+    "Mi Papaya": EntradaScraper("scrapers.mipapaya_scraper", "MiPapayaScraper", True),
+    "Paysend": EntradaScraper("scrapers.paysend_scraper", "PaysendScraper", True),
+    "XE": EntradaScraper("scrapers.xe_scraper", "XeScraper", True),
+    "RIA": EntradaScraper("scrapers.ria_scraper", "RiaScraper", True),
+    "XOOM": EntradaScraper("scrapers.xoom_scraper", "XoomScraper", True),
+    "Remitly": EntradaScraper("scrapers.remitly_scraper", "RemitlyScraper", True),
+}
+
+_clases = {}
+_lock = threading.Lock()
+
+
+def esta_registrado(competidor):
+    return competidor in REGISTRO_SCRAPERS
+
+
+def requiere_navegador(competidor):
+    """True si el competidor necesita un WebDriver (se consulta sin importar su módulo)."""
+    return REGISTRO_SCRAPERS[competidor].requiere_navegador
+
+
+def clase_scraper(competidor):
+    """Importa (una sola vez) el módulo del competidor y devuelve su clase scraper."""
+    with _lock:
+        if competidor not in _clases:
+            entrada = REGISTRO_SCRAPERS[competidor]
+            modulo = importlib.import_module(entrada.modulo)
+            _clases[competidor] = getattr(modulo, entrada.clase)
+        return _clases[competidor]
@@ -1,13 +1,15 @@
 from .base_scraper import BaseScraper
+from .numeros import parsear_numero
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-import re
-import time
 from data_config import URLS_COMPETIDORES
 
 class RemesasVzlaScraper(BaseScraper):
+    # Calculadora con sesión: rutas seguidas solo cambian lo necesario
+    REUTILIZA_PAGINA = True
+
     def __init__(self, driver):
         super().__init__(driver, "Remesas Vzla", URLS_COMPETIDORES.get("Remesas Vzla", "https://remesasvzla.com/"))
         
@@ -42,9 +44,15 @@ class RemesasVzlaScraper(BaseScraper):
             # 3. Escribir y seleccionar
             search_box.clear()
             search_box.send_keys(termino_busqueda)
-            time.sleep(0.5) # Esperar filtrado
+            # Esperar filtrado: que la primera opción resaltada contenga el término
+            try:
+                wait.until(EC.text_to_be_present_in_element(
+                    (By.CSS_SELECTOR, ".select2-results__option--highlighted"), termino_busqueda))
+            except: pass
             search_box.send_keys(Keys.ENTER)
-            time.sleep(0.5)
+            # Esperar a que el dropdown se cierre
+            try: wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, "select2-search__field")))
+            except: pass
             
             print(f"      ✅ Selección realizada.")
             return True
@@ -68,34 +76,66 @@ class RemesasVzlaScraper(BaseScraper):
         
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
         
+        xpath_select_origen = "//select[@id='fromCcy']/following-sibling::span[contains(@class, 'select2-container')]"
+        
         try:
-            self.driver.get(self.url_base)
-            time.sleep(4) # Espera de carga inicial
+            self._iniciar_fase("navigate")
+            # Sesión con estado: la calculadora se carga una vez y se reutiliza entre rutas
+            if self._abrir_sesion(self.url_base, (By.XPATH, xpath_select_origen)):
+                # Espera de carga inicial (hasta que exista el select2 de origen)
+                self._esperar_presencia((By.XPATH, xpath_select_origen), timeout=4)
 
-            # 1. SELECCIONAR ORIGEN (ID nativo: fromCcy)
-            if not self._seleccionar_select2("fromCcy", term_origen):
-                print("    ⛔ Falló selección de origen.")
-                return 0.0, monto_a_cotizar
+            # Valor recibido antes de tocar nada (para detectar el recálculo)
+            previo = None
+            try: previo = self.driver.find_element(By.ID, "toAmount").get_attribute("value")
+            except: pass
+            cambio = False
+
+            self._iniciar_fase("select_origin")
+            # 1. SELECCIONAR ORIGEN (ID nativo: fromCcy), solo si difiere de la ruta anterior
+            if self._sesion.get("origen") != term_origen:
+                if not self._seleccionar_select2("fromCcy", term_origen):
+                    print("    ⛔ Falló selección de origen.")
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
+                self._sesion["origen"] = term_origen
+                cambio = True
 
+            self._iniciar_fase("select_destination")
             # 2. SELECCIONAR DESTINO (ID nativo: toCcy)
-            if not self._seleccionar_select2("toCcy", term_destino):
-                print("    ⛔ Falló selección de destino.")
-                # A veces el destino se pone automático, intentamos continuar
+            if self._sesion.get("destino") != term_destino:
+                if not self._seleccionar_select2("toCcy", term_destino):
+                    # Con la sesión reutilizada el destino anterior seguiría en pantalla
+                    print("    ⛔ Falló selección de destino. Saltando ruta.")
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
+                self._sesion["destino"] = term_destino
+                cambio = True
             
-            # 3. INGRESAR MONTO (ID: fromAmount)
-            try:
-                input_envio = self.driver.find_element(By.ID, "fromAmount")
-                input_envio.clear()
-                input_envio.send_keys(monto_a_cotizar)
-                # Disparar eventos para forzar recálculo
-                input_envio.send_keys(Keys.TAB) 
-                time.sleep(0.5)
-            except Exception as e:
-                print(f"    ⚠️ Error ingresando monto: {e}")
+            self._iniciar_fase("input_amount")
+            # 3. INGRESAR MONTO (ID: fromAmount), solo si cambió
+            if self._sesion.get("monto") != monto_a_cotizar:
+                try:
+                    input_envio = self.driver.find_element(By.ID, "fromAmount")
+                    input_envio.clear()
+                    input_envio.send_keys(monto_a_cotizar)
+                    # Disparar eventos para forzar recálculo
+                    input_envio.send_keys(Keys.TAB) 
+                    self._sesion["monto"] = monto_a_cotizar
+                    cambio = True
+                except Exception as e:
+                    print(f"    ⚠️ Error ingresando monto: {e}")
 
-            print("    -> Esperando cálculo...")
-            time.sleep(3) 
+            self._iniciar_fase("calculate")
+            if cambio:
+                print("    -> Esperando cálculo...")
+                if self._esperar_cambio_valor((By.ID, "toAmount"), previo, timeout=3.5) is None:
+                    # Sin recálculo la página sigue mostrando la ruta anterior
+                    print("    ⛔ La calculadora no recalculó a tiempo. Saltando ruta.")
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
 
+            self._iniciar_fase("extract")
             # 4. EXTRAER RESULTADO (ID: toAmount)
             tasa_final = 0.0
             try:
@@ -104,11 +144,8 @@ class RemesasVzlaScraper(BaseScraper):
                 val_recibo = input_recibo.get_attribute("value") # Ej: "1.234,56"
                 
                 if val_recibo:
-                    # Limpieza de formato (quitar puntos de miles, cambiar coma decimal a punto)
-                    # Asumimos formato latino (1.000,00) común en webs de Vzla/Chile
-                    clean_val = val_recibo.replace('.', '').replace(',', '.')
-                    
-                    monto_recibido = float(re.sub(r'[^\d\.]', '', clean_val))
+                    # Formato latino (1.000,00) común en webs de Vzla/Chile
+                    monto_recibido = parsear_numero(val_recibo, "es-ES")
                     monto_enviado = float(monto_a_cotizar)
 
                     if monto_recibido > 0:
@@ -121,8 +158,11 @@ class RemesasVzlaScraper(BaseScraper):
             if tasa_final > 0:
                 return tasa_final, monto_a_cotizar
             
+            # Sin tasa: la próxima ruta parte de una página recién cargada
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
 
         except Exception as e:
             print(f"    ❌ Error crítico en Remesas Vzla: {e}")
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
\ No newline at end of file
@@ -1,34 +1,20 @@
 from .base_scraper import BaseScraper
+from .numeros import parsear_numero, buscar_numero
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-import re
-import time
 from data_config import URLS_COMPETIDORES
 
 class RemitlyScraper(BaseScraper):
+    PATRONES_API_COTIZACION = ("/calculator", "/estimate", "/pricing")
+    # Remitly España: coma decimal ("1 EUR = 1,1386 USD")
+    LOCALE_NUMEROS = "es-ES"
+
     def __init__(self, driver):
         super().__init__(driver, "Remitly", URLS_COMPETIDORES.get("Remitly", "https://www.remitly.com/"))
 
-    def _clean_amount(self, value_str):
-        """Limpia el monto considerando formato europeo (1.000,00) o americano."""
-        if not value_str: return 0.0
-        clean = re.sub(r'[^\d\.,]', '', str(value_str))
-        
-        if ',' in clean and '.' in clean:
-            if clean.rindex(',') > clean.rindex('.'): # 1.000,50
-                clean = clean.replace('.', '').replace(',', '.')
-            else: # 1,000.50
-                clean = clean.replace(',', '')
-        elif ',' in clean:
-            # Asumimos coma decimal para Remitly España
-            clean = clean.replace(',', '.')
-        
-        try: return float(clean)
-        except: return 0.0
-
     def get_tasa_por_ruta(self, ruta):
         print(f"  > Procesando {self.nombre} para ruta {ruta}")
         
@@ -47,54 +33,63 @@ class RemitlyScraper(BaseScraper):
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
         
         try:
-            self.driver.get(url)
+            self._iniciar_fase("navigate")
+            self.driver.get(self._url(url))
             wait = WebDriverWait(self.driver, 15)
-            time.sleep(4) # Espera carga
+            self._esperar_red_inactiva(timeout=4) # Espera carga
 
+            self._iniciar_fase("consent")
             # 1. COOKIES (Botón "Aceptar cookies" o similar)
-            try:
-                btn_cookie = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Aceptar') or contains(text(), 'Accept')]")
-                btn_cookie.click()
-                time.sleep(1)
-            except: pass
+            if not self._consentimiento_vigente():
+                try:
+                    btn_cookie = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Aceptar') or contains(text(), 'Accept')]")
+                    btn_cookie.click()
+                    WebDriverWait(self.driver, 1).until(EC.invisibility_of_element(btn_cookie))
+                except: pass
 
+            self._iniciar_fase("input_amount")
             # 2. INGRESAR MONTO
             # Buscamos el input que contiene "env" o "send" en su ID dinámico
             # O el primer input numérico visible
             try:
                 input_envio = wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[id*='flag-input'][id*='env']")))
+                locator_recibo = (By.CSS_SELECTOR, "input[id*='flag-input'][id*='recibe']")
+                try: previo = self.driver.find_element(*locator_recibo).get_attribute("value")
+                except: previo = None
                 
                 # Borrado humano
                 input_envio.click()
                 actions = ActionChains(self.driver)
                 actions.key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
-                time.sleep(0.1)
                 actions.send_keys(Keys.BACK_SPACE).perform()
                 
+                self._preparar_captura()
                 input_envio.send_keys(monto_a_cotizar)
                 self.driver.find_element(By.TAG_NAME, "body").click()
-                time.sleep(3) # Esperar cálculo
+                # Esperar cálculo: JSON de la API de la página o cambio del input de recibo
+                tasa_red, _ = self._esperar_cotizacion(moneda_destino, locator_recibo, previo, timeout=3)
             except Exception as e:
+                tasa_red = 0.0
                 print(f"    ⚠️ Error ingresando monto: {e}")
 
+            self._iniciar_fase("extract")
             # 3. EXTRAER TASA
-            tasa_final = 0.0
-            
+            tasa_final = tasa_red
+
             # Estrategia A: Texto "1 EUR = X.XX USD"
             # En tus capturas se ve un div que dice "1 EUR = 1,1386 USD"
-            try:
-                # Buscamos texto que tenga formato de tasa
-                elementos_tasa = self.driver.find_elements(By.XPATH, "//*[contains(text(), '1 EUR =')]")
-                for el in elementos_tasa:
-                    texto = el.text.strip()
-                    match = re.search(r'=\s*([\d\.,]+)', texto)
-                    if match:
-                        val = self._clean_amount(match.group(1))
+            if tasa_final == 0:
+                try:
+                    # Buscamos texto que tenga formato de tasa
+                    elementos_tasa = self.driver.find_elements(By.XPATH, "//*[contains(text(), '1 EUR =')]")
+                    for el in elementos_tasa:
+                        texto = el.text.strip()
+                        val = buscar_numero(texto, self.LOCALE_NUMEROS)
                         if val > 0:
                             tasa_final = val
                             print(f"    ✅ Tasa encontrada (Texto): {tasa_final}")
                             break
-            except: pass
+                except: pass
 
             # Estrategia B: Cálculo por Inputs
             if tasa_final == 0:
@@ -104,7 +99,7 @@ class RemitlyScraper(BaseScraper):
                     val_recibo = input_recibo.get_attribute("value")
                     
                     if val_recibo:
-                        n_out = self._clean_amount(val_recibo)
+                        n_out = parsear_numero(val_recibo, self.LOCALE_NUMEROS)
                         n_in = float(monto_a_cotizar)
                         
                         if n_out > 0:
@@ -1,14 +1,19 @@
 from .base_scraper import BaseScraper
+from .numeros import parsear_numero, buscar_numero, PATRON_PRIMER_NUMERO
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-import re
-import time
 from data_config import URLS_COMPETIDORES
 
 class RiaScraper(BaseScraper):
+    PATRONES_API_COTIZACION = ("/Calculator", "/calculator", "/quote")
+    # RIA España: 1.000,00
+    LOCALE_NUMEROS = "es-ES"
+    # Una sola calculadora para todos los destinos desde EUR (ver cotizar_destinos)
+    REUTILIZA_PAGINA = True
+
     def __init__(self, driver):
         super().__init__(driver, "RIA", URLS_COMPETIDORES.get("RIA", "https://www.riamoneytransfer.com/es-es/"))
         
@@ -23,46 +28,13 @@ class RiaScraper(BaseScraper):
             "CLP": "Chile"
         }
 
-    def _clean_amount(self, value_str):
-        """Limpia el string detectando si es formato 1,000.00 (US) o 1.000,00 (EU)."""
-        if not value_str: return 0.0
-        # Eliminar símbolos de moneda y espacios
-        clean = re.sub(r'[^\d\.,]', '', str(value_str))
-        if not clean: return 0.0
-
-        # Lógica de detección por posición del último separador
-        if ',' in clean and '.' in clean:
-            last_dot = clean.rfind('.')
-            last_comma = clean.rfind(',')
-            
-            if last_dot > last_comma: 
-                # Formato US: 82,300.30 (El punto está al final)
-                clean = clean.replace(',', '') # Quitar comas de miles
-            else: 
-                # Formato EU: 82.300,30 (La coma está al final)
-                clean = clean.replace('.', '').replace(',', '.')
-                
-        elif ',' in clean:
-            # Solo comas (ej: 50,00 o 1,000).
-            # En RIA España, coma suele ser decimal.
-            clean = clean.replace(',', '.')
-            
-        elif '.' in clean:
-            # Solo puntos (ej: 50.00 o 1.000).
-            # Si tiene 3 decimales exactos, asumimos que es un separador de miles (ej: 82.300)
-            parts = clean.split('.')
-            if len(parts) > 1 and len(parts[-1]) == 3:
-                clean = clean.replace('.', '') # Es miles
-            # Si no, asumimos es punto decimal estándar
-        
-        try: return float(clean)
-        except: return 0.0
-
     def _cerrar_cookies(self):
+        if self._consentimiento_vigente():
+            return
         try:
             btn = self.driver.find_element(By.ID, "onetrust-accept-btn-handler")
             btn.click()
-            time.sleep(1)
+            WebDriverWait(self.driver, 1).until(EC.invisibility_of_element(btn))
         except: pass
 
     def _seleccionar_destino(self, moneda_destino):
@@ -78,13 +50,13 @@ class RiaScraper(BaseScraper):
             except:
                 dropdown = wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "dropdown-container")))
                 dropdown.click()
-                time.sleep(0.5)
-                search_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='text']")
+                search_input = self._esperar_presencia((By.CSS_SELECTOR, "input[type='text']"), timeout=1, visible=True)
 
             search_input.click()
             search_input.clear()
             search_input.send_keys(pais_nombre)
-            time.sleep(1.5)
+            # Esperar a que la lista filtre el país
+            self._esperar_presencia((By.XPATH, f"//li[contains(., '{pais_nombre}')]"), timeout=1.5, visible=True)
             search_input.send_keys(Keys.ENTER)
             
             try:
@@ -93,7 +65,8 @@ class RiaScraper(BaseScraper):
                     opcion.click()
             except: pass
 
-            time.sleep(3)
+            # Esperar a que la calculadora se recargue con el nuevo destino
+            self._esperar_red_inactiva(timeout=3)
             return True
 
         except Exception as e:
@@ -113,63 +86,90 @@ class RiaScraper(BaseScraper):
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
         
         try:
-            self.driver.get(self.url_base)
-            wait = WebDriverWait(self.driver, 20)
-            time.sleep(5) 
-            self._cerrar_cookies()
-
+            self._iniciar_fase("navigate")
+            # La página se carga una vez; las rutas siguientes solo cambian destino (y monto si difiere)
+            if self._abrir_sesion(self.url_base, (By.ID, "sending-amount")):
+                self._esperar_presencia((By.ID, "sending-amount"), timeout=5)
+                self._iniciar_fase("consent")
+                self._cerrar_cookies()
+
+            # Valor previo antes de tocar nada: el cambio de destino ya recalcula
+            try: previo = self.driver.find_element(By.ID, "receiving-amount").get_attribute("value")
+            except: previo = None
+            self._preparar_captura()
+
+            self._iniciar_fase("select_destination")
+            # Si cambia el destino o el monto, el valor previo ya no sirve: hay que esperar el nuevo
+            recalcula = (self._sesion.get("destino") != moneda_destino
+                         or self._sesion.get("monto") != monto_a_cotizar)
             # 1. SELECCIONAR DESTINO
-            if not self._seleccionar_destino(moneda_destino):
-                return 0.0, monto_a_cotizar
-
-            # 2. INGRESAR MONTO
+            if self._sesion.get("destino") != moneda_destino:
+                if not self._seleccionar_destino(moneda_destino):
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
+                self._sesion["destino"] = moneda_destino
+
+            self._iniciar_fase("input_amount")
+            # 2. INGRESAR MONTO (solo si cambió)
+            tasa_red, cambio = 0.0, False
             try:
-                input_envio = self.driver.find_element(By.ID, "sending-amount")
-                actions = ActionChains(self.driver)
-                actions.click(input_envio)
-                actions.key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL)
-                actions.send_keys(Keys.BACK_SPACE)
-                actions.perform()
-                time.sleep(0.5)
-                input_envio.send_keys(monto_a_cotizar)
-                self.driver.find_element(By.TAG_NAME, "body").click()
-                time.sleep(4)
+                if self._sesion.get("monto") != monto_a_cotizar:
+                    input_envio = self.driver.find_element(By.ID, "sending-amount")
+                    actions = ActionChains(self.driver)
+                    actions.click(input_envio)
+                    actions.key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL)
+                    actions.send_keys(Keys.BACK_SPACE)
+                    actions.perform()
+                    input_envio.send_keys(monto_a_cotizar)
+                    self.driver.find_element(By.TAG_NAME, "body").click()
+                    self._sesion["monto"] = monto_a_cotizar
+                tasa_red, cambio = self._esperar_cotizacion(moneda_destino, (By.ID, "receiving-amount"), previo, timeout=4)
             except: pass
 
+            if recalcula and not cambio:
+                # El recálculo no llegó: 'receiving-amount' sigue con la ruta anterior
+                print(f"    ⛔ {self.nombre} no recalculó {ruta} a tiempo. Saltando ruta.")
+                self._invalidar_sesion()
+                return 0.0, monto_a_cotizar
+
+            self._iniciar_fase("extract")
             # 3. EXTRAER TASA
-            tasa_final = 0.0
-            
-            # A) Cálculo por Inputs (Prioridad)
-            try:
-                input_recibo = self.driver.find_element(By.ID, "receiving-amount")
-                val_recibo = input_recibo.get_attribute("value")
+            # A) JSON de la API de la página (si se capturó)
+            tasa_final = tasa_red
+
+            # B) Cálculo por Inputs
+            if tasa_final == 0:
+                try:
+                    input_recibo = self.driver.find_element(By.ID, "receiving-amount")
+                    val_recibo = input_recibo.get_attribute("value")
                 
-                if val_recibo:
-                    n_out = self._clean_amount(val_recibo)
-                    n_in = float(monto_a_cotizar)
+                    if val_recibo:
+                        n_out = parsear_numero(val_recibo, self.LOCALE_NUMEROS)
+                        n_in = float(monto_a_cotizar)
                     
-                    if n_out > 0:
-                        tasa_final = n_out / n_in
-                        print(f"    🧮 Tasa calculada ({n_out} / {n_in}): {tasa_final:.6f}")
-            except Exception as e:
-                print(f"    ⚠️ Falló cálculo inputs: {e}")
+                        if n_out > 0:
+                            tasa_final = n_out / n_in
+                            print(f"    🧮 Tasa calculada ({n_out} / {n_in}): {tasa_final:.6f}")
+                except Exception as e:
+                    print(f"    ⚠️ Falló cálculo inputs: {e}")
 
-            # B) Texto (Fallback)
+            # C) Texto (Fallback)
             if tasa_final == 0:
                 try:
                     elementos = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Tasa')]")
                     for el in elementos:
-                        match = re.search(r'([\d\.,]+)', el.text.replace('Tasa', ''))
-                        if match:
-                            val = self._clean_amount(match.group(1))
-                            if val > 0:
-                                tasa_final = val
-                                print(f"    ✅ Tasa leída de texto: {tasa_final}")
-                                break
+                        val = buscar_numero(el.text.replace('Tasa', ''), self.LOCALE_NUMEROS, PATRON_PRIMER_NUMERO)
+                        if val > 0:
+                            tasa_final = val
+                            print(f"    ✅ Tasa leída de texto: {tasa_final}")
+                            break
                 except: pass
 
+            if tasa_final == 0:
+                self._invalidar_sesion()
             return tasa_final, monto_a_cotizar
 
         except Exception as e:
             print(f"    ❌ Error crítico en RIA: {e}")
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
\ No newline at end of file
@@ -1,13 +1,17 @@
 from .base_scraper import BaseScraper
+from .numeros import parsear_numeros, buscar_numero, PATRON_PRIMER_NUMERO
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-import re
-import time
 from data_config import URLS_COMPETIDORES
 
 class TuCambioScraper(BaseScraper):
+    # Versión en inglés de la web: 1,020.50
+    LOCALE_NUMEROS = "en-US"
+    # Calculadora con sesión: rutas seguidas solo cambian lo necesario
+    REUTILIZA_PAGINA = True
+
     def __init__(self, driver):
         super().__init__(driver, "TuCambio CL", "https://www.tucambio.app/en")
         self.country_map = {
@@ -94,14 +98,14 @@ class TuCambioScraper(BaseScraper):
 
             # 2. Abrir Menú
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", target_btn)
-            time.sleep(0.5)
             self.driver.execute_script("arguments[0].click();", target_btn)
-            time.sleep(1) 
 
             # 3. Buscar Opción
             xpath_opcion = f"//div[contains(@role, 'menu')]//button[contains(., '{pais_nombre}')] | //li[contains(., '{pais_nombre}')] | //div[contains(text(), '{pais_nombre}')]"
             
             try:
+                # Esperar a que el menú se despliegue
+                self._esperar_presencia((By.XPATH, "//div[contains(@role, 'menu')]"), timeout=1, visible=True)
                 opciones = self.driver.find_elements(By.XPATH, xpath_opcion)
                 visible_opt = next((o for o in opciones if o.is_displayed()), None)
                 
@@ -118,7 +122,9 @@ class TuCambioScraper(BaseScraper):
                 return False
 
             self.driver.find_element(By.TAG_NAME, "body").click()
-            time.sleep(1.5)
+            # Esperar a que el menú se cierre
+            try: WebDriverWait(self.driver, 1.5).until(EC.invisibility_of_element_located((By.XPATH, "//div[contains(@role, 'menu')]")))
+            except: pass
             
             # 4. Verificación
             nuevo_actual = self._get_selected_country(section_keyword)
@@ -126,8 +132,9 @@ class TuCambioScraper(BaseScraper):
                 print(f"      ✅ Cambio exitoso. Ahora muestra: {nuevo_actual}")
                 return True
             else:
+                # La calculadora no muestra la moneda pedida: cotizar daría la tasa de otra
                 print(f"      ⚠️ Advertencia visual: Dice '{nuevo_actual}' (Esperado: {pais_nombre})")
-                return True
+                return False
 
         except Exception as e:
             print(f"      ⚠️ Excepción selección: {e}")
@@ -141,63 +148,88 @@ class TuCambioScraper(BaseScraper):
         if moneda_destino == "USD": moneda_destino = "US"
         
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
+        xpath_input = "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'send')]/following::input[@type='text'][1]"
+        xpath_recibo = "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'receive')]/following::input[@type='text'][1]"
         
         try:
-            self.driver.get(self.url_base)
-            # ELIMINADO: self.driver.refresh() -> Causaba el timeout "aborted by navigation"
-            
-            # Espera explicita a que cargue la calculadora
+            self._iniciar_fase("navigate")
+            # Sesión con estado: la calculadora se carga una vez y se reutiliza entre rutas
             wait = WebDriverWait(self.driver, 20)
+            if self._abrir_sesion(self.url_base, (By.XPATH, xpath_input)):
+                # Espera explicita a que cargue la calculadora
+                try:
+                    wait.until(EC.presence_of_element_located((By.TAG_NAME, "input")))
+                except:
+                    print("    ⚠️ Timeout esperando carga inicial.")
+                self._esperar_red_inactiva(timeout=3) # Estabilización
+
+            # Valor recibido antes de tocar nada (para detectar el recálculo)
+            try: previo = self.driver.find_element(By.XPATH, xpath_recibo).get_attribute("value")
+            except: previo = None
+            cambio = False
+
+            self._iniciar_fase("select_origin")
+            # 1. Selecciones (solo las que difieren de la ruta anterior)
+            if self._sesion.get("origen") != moneda_origen:
+                if not self._seleccionar_moneda_smart("send", moneda_origen):
+                    # La calculadora sigue con el origen anterior: no se extrae de ella
+                    print("    ⛔ Falló selección de origen. Saltando ruta.")
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
+                self._sesion["origen"] = moneda_origen
+                cambio = True
+
+            self._iniciar_fase("select_destination")
+            if self._sesion.get("destino") != moneda_destino:
+                if not self._seleccionar_moneda_smart("receive", moneda_destino):
+                    print("    ⛔ Falló selección de destino. Saltando ruta.")
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
+                self._sesion["destino"] = moneda_destino
+                cambio = True
+
+            self._iniciar_fase("input_amount")
+            # 2. Ingresar Monto (solo si cambió)
+            input_monto = None
             try:
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "input")))
-            except:
-                print("    ⚠️ Timeout esperando carga inicial.")
-                
-            time.sleep(3) # Estabilización
-
-            # 1. Selecciones
-            if not self._seleccionar_moneda_smart("send", moneda_origen):
-                print("    ⚠️ Problema seleccionando origen")
-            
-            time.sleep(1)
-
-            if not self._seleccionar_moneda_smart("receive", moneda_destino):
-                 print("    ⚠️ Problema seleccionando destino")
-
-            # 2. Ingresar Monto
-            try:
-                xpath_input = "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'send')]/following::input[@type='text'][1]"
                 input_monto = wait.until(EC.element_to_be_clickable((By.XPATH, xpath_input)))
-                
-                self.driver.execute_script("arguments[0].value = '';", input_monto)
-                input_monto.send_keys(monto_a_cotizar)
-                self.driver.execute_script("arguments[0].dispatchEvent(new Event('input', { bubbles: true }));", input_monto)
-                self.driver.find_element(By.TAG_NAME, "body").click()
+                if self._sesion.get("monto") != monto_a_cotizar:
+                    self.driver.execute_script("arguments[0].value = '';", input_monto)
+                    input_monto.send_keys(monto_a_cotizar)
+                    self.driver.execute_script("arguments[0].dispatchEvent(new Event('input', { bubbles: true }));", input_monto)
+                    self.driver.find_element(By.TAG_NAME, "body").click()
+                    self._sesion["monto"] = monto_a_cotizar
+                    cambio = True
             except Exception as e:
                 print(f"    ⚠️ Error ingresando monto: {e}")
 
-            print("    -> Esperando cálculo...")
-            time.sleep(5)
+            self._iniciar_fase("calculate")
+            if cambio:
+                print("    -> Esperando cálculo...")
+                if self._esperar_cambio_valor((By.XPATH, xpath_recibo), previo, timeout=5) is None:
+                    # Sin recálculo la página sigue mostrando la ruta anterior
+                    print("    ⛔ La calculadora no recalculó a tiempo. Saltando ruta.")
+                    self._invalidar_sesion()
+                    return 0.0, monto_a_cotizar
 
+            self._iniciar_fase("extract")
             # 3. Extraer Tasa
             tasa_final = 0.0
             try:
                 xpath_exacto = "//p[contains(., 'Exchange rate')]/following-sibling::p"
                 elemento_tasa = self.driver.find_element(By.XPATH, xpath_exacto)
-                match = re.search(r'([\d\.]+)', elemento_tasa.text.strip())
-                if match:
-                    tasa_final = float(match.group(1))
+                tasa_final = buscar_numero(elemento_tasa.text, self.LOCALE_NUMEROS, PATRON_PRIMER_NUMERO)
+                if tasa_final > 0:
                     print(f"    ✅ Tasa leída del texto: {tasa_final}")
             except: pass
 
             # Estrategia B: Cálculo
             if tasa_final == 0:
                 try:
-                    xpath_recibo = "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'receive')]/following::input[@type='text'][1]"
                     input_recibo = self.driver.find_element(By.XPATH, xpath_recibo)
                     
-                    val_orig = float(re.sub(r'[^\d\.]', '', str(input_monto.get_attribute("value")).replace(',','.')))
-                    val_dest = float(re.sub(r'[^\d\.]', '', str(input_recibo.get_attribute("value")).replace(',','.')))
+                    val_orig, val_dest = parsear_numeros(
+                        [input_monto.get_attribute("value"), input_recibo.get_attribute("value")], self.LOCALE_NUMEROS)
                     
                     if val_orig > 0:
                         tasa_final = val_dest / val_orig
@@ -207,8 +239,11 @@ class TuCambioScraper(BaseScraper):
             if tasa_final > 0:
                 return tasa_final, monto_a_cotizar
 
+            # Sin tasa: la próxima ruta parte de una página recién cargada
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
 
         except Exception as e:
             print(f"    ❌ Error crítico en TuCambio: {e}")
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
\ No newline at end of file
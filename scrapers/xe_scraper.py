@@ -1,12 +1,12 @@
 from .base_scraper import BaseScraper
+from .numeros import buscar_numero
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import re
-import time
 from data_config import URLS_COMPETIDORES
 
 class XeScraper(BaseScraper):
+    # XE suele usar formato inglés (1,000.00) por defecto en URL internacional
+    LOCALE_NUMEROS = "en-US"
+
     def __init__(self, driver):
         # La URL base es solo referencia, usaremos dinámicas
         super().__init__(driver, "XE", "https://www.xe.com/")
@@ -23,19 +23,22 @@ class XeScraper(BaseScraper):
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
         
         try:
-            self.driver.get(url_directa)
-            # Espera un poco más larga para que cargue el react/hidratación
-            time.sleep(5) 
+            self._iniciar_fase("navigate")
+            self.driver.get(self._url(url_directa))
+            # Espera a que termine la hidratación de React (tope 5s)
+            self._esperar_red_inactiva(timeout=5)
 
+            self._iniciar_fase("consent")
             # 1. MANEJO DE COOKIES (Si aparecen, aceptar para limpiar pantalla)
-            try:
-                # Botón "Accept" o "Consent"
-                btns = self.driver.find_elements(By.XPATH, "//button[contains(text(), 'Accept')]")
-                if btns:
-                    btns[0].click()
-                    time.sleep(0.5)
-            except: pass
+            if not self._consentimiento_vigente():
+                try:
+                    # Botón "Accept" o "Consent"
+                    btns = self.driver.find_elements(By.XPATH, "//button[contains(text(), 'Accept')]")
+                    if btns:
+                        btns[0].click()
+                except: pass
 
+            self._iniciar_fase("extract")
             # 2. EXTRAER TASA
             tasa_final = 0.0
             
@@ -48,23 +51,16 @@ class XeScraper(BaseScraper):
                 selector_css = "p[class*='text-lg'][class*='font-semibold'][class*='text-xe-neutral-900']"
                 
                 # Esperamos que aparezca
-                elemento_tasa = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector_css))
-                )
+                elemento_tasa = self._esperar_presencia((By.CSS_SELECTOR, selector_css), timeout=10)
+                if elemento_tasa is None:
+                    raise TimeoutError("no apareció el párrafo de la tasa")
                 
                 texto_completo = elemento_tasa.text.strip() # Ej: "1.00 EUR = 1.15942393 USD"
                 print(f"    -> Texto detectado: '{texto_completo}'")
                 
-                # Regex para sacar el número después del "="
-                # Busca: = (espacio opcional) (número con puntos y comas)
-                match = re.search(r'=\s*([\d\.,]+)', texto_completo)
-                
-                if match:
-                    val_str = match.group(1)
-                    # XE suele usar formato inglés (1,000.00) por defecto en URL internacional
-                    val_clean = val_str.replace(',', '') # Quitar comas de miles
-                    
-                    tasa_final = float(val_clean)
+                # El número después del "="
+                tasa_final = buscar_numero(texto_completo, self.LOCALE_NUMEROS)
+                if tasa_final > 0:
                     print(f"    ✅ Tasa encontrada: {tasa_final}")
 
             except Exception as e:
@@ -75,9 +71,8 @@ class XeScraper(BaseScraper):
                     xpath_texto = f"//*[contains(text(), '1.00 {moneda_origen}') and contains(text(), '=')]"
                     el = self.driver.find_element(By.XPATH, xpath_texto)
                     txt = el.text
-                    match = re.search(r'=\s*([\d\.,]+)', txt)
-                    if match:
-                        tasa_final = float(match.group(1).replace(',', ''))
+                    tasa_final = buscar_numero(txt, self.LOCALE_NUMEROS)
+                    if tasa_final > 0:
                         print(f"    ✅ Tasa encontrada (Fallback Texto): {tasa_final}")
                 except: pass
 
@@ -1,14 +1,17 @@
 from .base_scraper import BaseScraper
+from .numeros import buscar_numero
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-import re
-import time
 from data_config import URLS_COMPETIDORES
 
 class XoomScraper(BaseScraper):
+    PATRONES_API_COTIZACION = ("/quote", "/pricing")
+    # Xoom usa formato US (1,000.00) en la versión internacional
+    LOCALE_NUMEROS = "en-US"
+
     def __init__(self, driver):
         super().__init__(driver, "XOOM", "https://www.xoom.com/")
         
@@ -22,21 +25,14 @@ class XoomScraper(BaseScraper):
             "VES": "venezuela"
         }
 
-    def _clean_amount(self, value_str):
-        if not value_str: return 0.0
-        clean = re.sub(r'[^\d\.,]', '', str(value_str))
-        try:
-            # Xoom usa formato US (1,000.00) en la versión internacional
-            return float(clean.replace(',', ''))
-        except:
-            return 0.0
-
     def _cerrar_cookies(self):
+        if self._consentimiento_vigente():
+            return
         try:
             xpath = "//button[contains(text(), 'Accept') or contains(text(), 'Aceptar')]"
             btn = self.driver.find_element(By.XPATH, xpath)
             btn.click()
-            time.sleep(1)
+            WebDriverWait(self.driver, 1).until(EC.invisibility_of_element(btn))
         except: pass
 
     def _cambiar_origen_a_eur(self):
@@ -54,14 +50,16 @@ class XoomScraper(BaseScraper):
             
             print(f"      -> Cambiando de {picker_btn.text} a EUR...")
             picker_btn.click()
-            time.sleep(1)
             
             # Seleccionar EUR
             xpath_eur = "//li[contains(., 'EUR')] | //button[contains(., 'EUR')] | //div[contains(text(), 'EUR')]"
             opcion_eur = wait.until(EC.element_to_be_clickable((By.XPATH, xpath_eur)))
             opcion_eur.click()
             
-            time.sleep(4) # Esperar recarga
+            # Esperar recarga: el picker debe mostrar EUR
+            try: wait.until(EC.text_to_be_present_in_element((By.XPATH, xpath_picker), "EUR"))
+            except: pass
+            self._esperar_red_inactiva(timeout=4)
             print("      ✅ Origen cambiado a EUR.")
             return True
 
@@ -69,6 +67,22 @@ class XoomScraper(BaseScraper):
             print(f"      ⚠️ No se pudo cambiar origen a EUR: {e}")
             return False
 
+    def _origen_vigente(self, moneda):
+        """
+        True si el origen ya quedó fijado en una ruta anterior. Xoom lo recuerda
+        entre páginas de destino, así que basta una mirada al selector, sin esperas.
+        Sin selector visible (con carga 'eager' puede no estar aún) no se da por
+        vigente: la página podría seguir en USD.
+        """
+        if self._sesion.get("origen") != moneda:
+            return False
+        picker = self.driver.find_elements(By.XPATH, "//button[contains(@id, 'source-currency-picker')]")
+        if not picker or moneda not in picker[0].text:
+            self._sesion.pop("origen", None)
+            return False
+        print(f"      ✅ Origen {moneda} ya fijado.")
+        return True
+
     def _ingresar_monto_robusto(self, monto):
         """Ingresa el monto forzando el valor con JS."""
         print(f"    -> Ingresando monto: {monto}...")
@@ -86,8 +100,6 @@ class XoomScraper(BaseScraper):
             self.driver.execute_script("arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", input_envio)
             self.driver.execute_script("arguments[0].dispatchEvent(new Event('blur', { bubbles: true }));", input_envio)
             
-            time.sleep(1)
-            
             # Clic fuera para asegurar
             self.driver.find_element(By.TAG_NAME, "body").click()
             return True
@@ -110,43 +122,53 @@ class XoomScraper(BaseScraper):
         monto_a_cotizar = self._get_monto_a_cotizar(moneda_origen)
         
         try:
-            self.driver.get(url)
-            time.sleep(4)
+            self._iniciar_fase("navigate")
+            self.driver.get(self._url(url))
+            self._esperar_presencia((By.ID, "text-input-send-input"), timeout=4)
+            self._iniciar_fase("consent")
             self._cerrar_cookies()
 
-            if moneda_origen == "EUR":
-                self._cambiar_origen_a_eur()
+            self._iniciar_fase("select_origin")
+            if moneda_origen == "EUR" and not self._origen_vigente("EUR"):
+                if not self._cambiar_origen_a_eur():
+                    # La página seguiría cotizando desde USD: la tasa no sería de EUR
+                    print("    ⛔ Falló selección de origen. Saltando ruta.")
+                    return 0.0, monto_a_cotizar
+                self._sesion["origen"] = "EUR"
 
+            self._iniciar_fase("input_amount")
             # Usar la función robusta con JS
+            locator_tasa = (By.CSS_SELECTOR, "[data-testid='fx-rate-comparison-string']")
+            try: previo = self.driver.find_element(*locator_tasa).text
+            except: previo = None
+            self._preparar_captura()
             self._ingresar_monto_robusto(monto_a_cotizar)
 
+            self._iniciar_fase("calculate")
             print("    -> Esperando cálculo...")
-            time.sleep(4)
-
-            tasa_final = 0.0
-            try:
-                # Buscar el elemento con data-testid
-                elemento_tasa = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='fx-rate-comparison-string']")
-                texto = elemento_tasa.text
+            tasa_red, _ = self._esperar_cotizacion(moneda_destino, locator_tasa, previo, timeout=4, atributo=None)
+
+            self._iniciar_fase("extract")
+            tasa_final = tasa_red
+            if tasa_final == 0:
+                try:
+                    # Buscar el elemento con data-testid
+                    elemento_tasa = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='fx-rate-comparison-string']")
+                    texto = elemento_tasa.text
                 
-                match = re.search(r'=\s*([\d\.,]+)', texto)
-                if match:
-                    val_str = match.group(1)
-                    val_clean = val_str.replace(',', '')
-                    try:
-                        tasa_final = float(val_clean)
-                    except:
-                        tasa_final = float(val_str.replace('.', '').replace(',', '.'))
-
-                    print(f"    ✅ Tasa encontrada: {tasa_final} (Raw: {texto})")
-            except Exception as e:
-                print(f"    ⚠️ Error extrayendo tasa: {e}")
+                    tasa_final = buscar_numero(texto, self.LOCALE_NUMEROS)
+                    if tasa_final > 0:
+                        print(f"    ✅ Tasa encontrada: {tasa_final} (Raw: {texto})")
+                except Exception as e:
+                    print(f"    ⚠️ Error extrayendo tasa: {e}")
 
             if tasa_final > 0:
                 return tasa_final, monto_a_cotizar
 
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
 
         except Exception as e:
             print(f"    ❌ Error crítico en XOOM: {e}")
+            self._invalidar_sesion()
             return 0.0, monto_a_cotizar
\ No newline at end of file
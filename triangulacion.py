@@ -0,0 +1,94 @@
+"""
+Motor de triangulación de tasas de referencia.
+
+Para proveedores de tasa de mercado (XE) las rutas cruzadas no necesitan su
+propia página: COP->ARS es (EUR->ARS) / (EUR->COP). El plan separa las rutas
+de un competidor en patas a scrapear (desde la moneda pivote) y rutas
+derivables, y derivar_tasas() calcula estas últimas a partir de las patas,
+indicando de qué patas sale cada valor.
+"""
+from data_config import PIVOTE_POR_COMPETIDOR_REFERENCIA
+
+# Algunas rutas de data_config usan "US" en lugar de "USD"
+ALIAS_MONEDAS = {"US": "USD"}
+
+
+def _moneda(codigo):
+    return ALIAS_MONEDAS.get(codigo, codigo)
+
+
+def pivote_de(competidor):
+    """Moneda pivote del competidor, o None si no es de referencia (no se triangula)."""
+    return PIVOTE_POR_COMPETIDOR_REFERENCIA.get(competidor)
+
+
+def patas_de(ruta, pivote):
+    """
+    Patas (rutas desde el pivote) de las que sale la ruta:
+      PIV->X : ella misma (se scrapea)
+      X->PIV : inversa de PIV->X
+      A->B   : PIV->B / PIV->A
+    """
+    origen, destino = _moneda(ruta[:3]), _moneda(ruta[3:])
+    if origen == pivote:
+        return [pivote + destino]
+    if destino == pivote:
+        return [pivote + origen]
+    return [pivote + origen, pivote + destino]
+
+
+def planificar_rutas(competidor, rutas):
+    """
+    Devuelve (a_scrapear, derivadas). Para un competidor sin pivote todo se
+    scrapea. Para uno de referencia se scrapean solo las patas PIV->X que
+    hacen falta (en el orden en que aparecen) y el resto se deriva.
+    """
+    pivote = pivote_de(competidor)
+    if not pivote:
+        return list(rutas), []
+
+    a_scrapear = []
+    derivadas = []
+    for ruta in rutas:
+        patas = patas_de(ruta, pivote)
+        for pata in patas:
+            if pata not in a_scrapear:
+                a_scrapear.append(pata)
+        # Se deriva todo lo que no sea exactamente una pata (incluye "EURUS" <- EURUSD)
+        if patas != [ruta]:
+            derivadas.append(ruta)
+    return a_scrapear, derivadas
+
+
+def derivar_tasa(ruta, pivote, tasas_patas):
+    """
+    Tasa implícita de 'ruta' a partir de tasas_patas {ruta_pata: tasa}.
+    Devuelve (tasa, patas_usadas); tasa 0.0 si falta o falló alguna pata.
+    """
+    patas = patas_de(ruta, pivote)
+    valores = [tasas_patas.get(pata, 0.0) for pata in patas]
+    if any(v <= 0 for v in valores):
+        return 0.0, patas
+
+    origen = _moneda(ruta[:3])
+    if len(patas) == 2:
+        return valores[1] / valores[0], patas
+    if origen == pivote:
+        return valores[0], patas
+    return 1 / valores[0], patas
+
+
+def derivar_tasas(competidor, rutas_derivadas, tasas_patas):
+    """
+    Deriva todas las rutas cruzadas de un competidor de referencia.
+    Devuelve una lista de (ruta, tasa, etiqueta) donde la etiqueta
+    nombra las patas de origen (ej. "EURARS/EURCOP").
+    """
+    pivote = pivote_de(competidor)
+    if not pivote:
+        return []
+    derivadas = []
+    for ruta in rutas_derivadas:
+        tasa, patas = derivar_tasa(ruta, pivote, tasas_patas)
+        derivadas.append((ruta, tasa, "/".join(patas)))
+    return derivadas